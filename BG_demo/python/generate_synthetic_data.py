@@ -6,10 +6,32 @@ Unified script that generates all realistic unstructured documents for the compl
 
 import snowflake.snowpark as snowpark
 from snowflake.snowpark.functions import col, lit
-from snowflake.cortex import complete
 import json
 import os
+import re
+import time
 from datetime import datetime
+import verification
+
+# Where prompts are rendered: 'client' (Python) or 'warehouse' (SQL REPLACE chains, no client round trip)
+PROMPT_RENDER_MODE = os.getenv("SAM_PROMPT_RENDER_MODE", "client")
+
+# 'incremental' generates only prompts without a document or whose prompt changed; 'full' regenerates everything
+DOCUMENT_GENERATION_MODE = os.getenv("SAM_DOCUMENT_GENERATION_MODE", "incremental")
+
+# Fingerprint of a rendered prompt (and its model), stored on DOCUMENTS to detect changed prompts
+PROMPT_HASH_SQL = "SHA2(rp.MODEL_NAME || '|' || rp.FULL_PROMPT, 256)"
+
+# Document chunking for search (chunk sizes in tokens, converted to characters for the splitter)
+CHUNK_SIZE_TOKENS = 512         # Upper bound on chunk length
+CHUNK_OVERLAP_TOKENS = 64       # Text shared by consecutive chunks
+CHARS_PER_TOKEN = 4             # Approximate characters per token for English prose
+
+# Row-level fallback generation when the bulk AI_COMPLETE insert fails
+FALLBACK_MAX_WORKERS = 8        # Concurrent async COMPLETE queries on the session
+FALLBACK_BATCH_SIZE = 50        # Prompts per batch (results are inserted after each batch)
+FALLBACK_MAX_RETRIES = 3        # Retries per prompt before it is marked failed
+FALLBACK_BACKOFF_SECONDS = 2    # First retry delay, doubled on each further retry
 
 def create_snowpark_session():
     """Create Snowpark session using connections.toml"""
@@ -28,12 +50,52 @@ def create_snowpark_session():
         }
         return snowpark.Session.builder.configs(connection_parameters).create()
 
+PLACEHOLDER_PATTERN = re.compile(r'\{([A-Za-z_][A-Za-z0-9_]*)\}')
+
+def compile_prompt_template(template_text):
+    """Parse a template once into literal segments and placeholder names"""
+    parts = PLACEHOLDER_PATTERN.split(template_text or '')
+    # parts alternates literal, name, literal, ... and always starts and ends with a literal
+    return parts[0::2], parts[1::2]
+
+def render_compiled_template(compiled_template, context):
+    """Render a compiled template; placeholders missing from context are left as-is"""
+    literals, names = compiled_template
+    pieces = [literals[0]]
+    for name, literal in zip(names, literals[1:]):
+        pieces.append(str(context[name]) if name in context else "{" + name + "}")
+        pieces.append(literal)
+    return ''.join(pieces)
+
 def render_prompt_template(template_text, context):
     """Replace placeholders in template with context values"""
-    for key, value in context.items():
-        placeholder = "{" + str(key) + "}"
-        template_text = template_text.replace(placeholder, str(value))
-    return template_text
+    return render_compiled_template(compile_prompt_template(template_text), context)
+
+def build_prompt_context(row, business_contexts):
+    """Build the placeholder values for one PROMPT_INPUTS row"""
+    year = row.DOC_DATE.strftime('%Y') if row.DOC_DATE else '2024'
+    business_key = (row.COMPANY_NAME, year)
+    if business_key not in business_contexts:
+        business_contexts[business_key] = get_business_context(row.COMPANY_NAME, row.DOC_DATE)
+    
+    return {
+        'COMPANY_NAME': row.COMPANY_NAME or '',
+        'DOC_DATE': row.DOC_DATE.strftime('%B %d, %Y') if row.DOC_DATE else '',
+        'QUARTER': row.QUARTER or '',
+        'ATTENDEES': row.ATTENDEES or '',
+        'TOPICS': row.TOPICS or '',
+        'EVENT_ANCHOR': row.EVENT_ANCHOR or '',
+        'DOC_VARIANT': row.DOC_VARIANT or '',
+        'CLIENT_NAME': row.COMPANY_NAME if row.TARGET_COLLECTION == 'CLIENT_MEETING_ARCHIVE' else '',
+        'MEETING_CONTEXT': row.DOC_VARIANT or '',
+        'PORTFOLIO_FOCUS': row.TOPICS or '',
+        'TOP_HOLDINGS': row.TOPICS or '',
+        'MEETING_TYPE': row.DOC_VARIANT or '',
+        'FOCUS_AREAS': row.TOPICS or '',
+        'YEAR': year,
+        'COMPETITOR': 'Amazon' if 'Arkadia' in str(row.COMPANY_NAME) else 'established players',
+        'BUSINESS_CONTEXT': business_contexts[business_key]
+    }
 
 def render_all_prompts(session):
     """Render all prompts and store in RENDERED_PROMPTS table for bulk generation"""
@@ -68,84 +130,148 @@ def render_all_prompts(session):
     """).collect()
     
     print(f"📝 Found {len(prompt_data)} prompts to render...")
+    start_time = time.perf_counter()
     
-    rendered_prompts = []
-    
+    # Group rows by template so each TEMPLATE_TEXT is parsed once
+    rows_by_template = {}
     for i, row in enumerate(prompt_data):
-        print(f"   📝 Rendering {row.PROMPT_TYPE} for {row.COMPANY_NAME or 'Client'} ({i+1}/{len(prompt_data)})...")
-        
-        # Build context for template rendering
-        year = row.DOC_DATE.strftime('%Y') if row.DOC_DATE else '2024'
-        context = {
-            'COMPANY_NAME': row.COMPANY_NAME or '',
-            'DOC_DATE': row.DOC_DATE.strftime('%B %d, %Y') if row.DOC_DATE else '',
-            'QUARTER': row.QUARTER or '',
-            'ATTENDEES': row.ATTENDEES or '',
-            'TOPICS': row.TOPICS or '',
-            'EVENT_ANCHOR': row.EVENT_ANCHOR or '',
-            'DOC_VARIANT': row.DOC_VARIANT or '',
-            'CLIENT_NAME': row.COMPANY_NAME if row.TARGET_COLLECTION == 'CLIENT_MEETING_ARCHIVE' else '',
-            'MEETING_CONTEXT': row.DOC_VARIANT or '',
-            'PORTFOLIO_FOCUS': row.TOPICS or '',
-            'TOP_HOLDINGS': row.TOPICS or '',
-            'MEETING_TYPE': row.DOC_VARIANT or '',
-            'FOCUS_AREAS': row.TOPICS or '',
-            'YEAR': year,
-            'COMPETITOR': 'Amazon' if 'Arkadia' in str(row.COMPANY_NAME) else 'established players',
-            'BUSINESS_CONTEXT': get_business_context(row.COMPANY_NAME, row.DOC_DATE)
-        }
-        
-        # Render the prompt template
-        rendered_prompt = render_prompt_template(row.TEMPLATE_TEXT, context)
-        
-        # Create file metadata
-        company_part = row.COMPANY_NAME.lower().replace(' ', '_') if row.COMPANY_NAME else 'client'
-        doc_id = f"{company_part}_{row.PROMPT_TYPE.lower()}_{row.DOC_DATE.strftime('%Y%m%d')}"
-        if row.RUN_ID:
-            doc_id += f"_{row.RUN_ID.split('_')[-1]}"
-        filename = f"{doc_id}.txt"
+        rows_by_template.setdefault(row.PROMPT_ID, []).append((i, row))
+    
+    rendered_prompts = [None] * len(prompt_data)
+    business_contexts = {}
+    tags_cache = {}
+    
+    for prompt_id, indexed_rows in rows_by_template.items():
+        first_row = indexed_rows[0][1]
+        compiled_template = compile_prompt_template(first_row.TEMPLATE_TEXT)
         
-        # Determine document classification
-        doc_type = classify_document_type(row.PROMPT_TYPE, row.TARGET_COLLECTION)
+        # Lookups that depend only on the template, resolved once per batch
+        prompt_type = first_row.PROMPT_TYPE
+        author = get_author_for_type(prompt_type)
+        doc_types = {}
         
-        # Create rendered prompt record
-        prompt_record = {
-            'prompt_render_id': f"render_{doc_id}",
-            'doc_id': doc_id,
-            'filename': filename,
-            'company_name': row.COMPANY_NAME or '',
-            'document_type': doc_type,
-            'doc_date': row.DOC_DATE,
-            'quarter': row.QUARTER or '',
-            'author': get_author_for_type(row.PROMPT_TYPE),
-            'tags': get_tags_for_document(row.PROMPT_TYPE, row.TOPICS),
-            'source_prompt_id': row.PROMPT_ID,
-            'model_name': row.MODEL_NAME,
-            'full_prompt': rendered_prompt,
-            'file_url': f"@SAM_DOCS_STAGE/{filename}"
-        }
-        
-        rendered_prompts.append(prompt_record)
+        for i, row in indexed_rows:
+            rendered_prompt = render_compiled_template(compiled_template, build_prompt_context(row, business_contexts))
+            
+            # Create file metadata
+            company_part = row.COMPANY_NAME.lower().replace(' ', '_') if row.COMPANY_NAME else 'client'
+            doc_id = f"{company_part}_{prompt_type.lower()}_{row.DOC_DATE.strftime('%Y%m%d')}"
+            if row.RUN_ID:
+                doc_id += f"_{row.RUN_ID.split('_')[-1]}"
+            filename = f"{doc_id}.txt"
+            
+            if row.TARGET_COLLECTION not in doc_types:
+                doc_types[row.TARGET_COLLECTION] = classify_document_type(prompt_type, row.TARGET_COLLECTION)
+            tags_key = (prompt_type, row.TOPICS)
+            if tags_key not in tags_cache:
+                tags_cache[tags_key] = get_tags_for_document(prompt_type, row.TOPICS)
+            
+            # Create rendered prompt record (kept in the original RUN_ID order)
+            rendered_prompts[i] = {
+                'prompt_render_id': f"render_{doc_id}",
+                'doc_id': doc_id,
+                'filename': filename,
+                'company_name': row.COMPANY_NAME or '',
+                'document_type': doc_types[row.TARGET_COLLECTION],
+                'doc_date': row.DOC_DATE,
+                'quarter': row.QUARTER or '',
+                'author': author,
+                'tags': list(tags_cache[tags_key]),
+                'source_prompt_id': row.PROMPT_ID,
+                'model_name': row.MODEL_NAME,
+                'full_prompt': rendered_prompt,
+                'file_url': f"@SAM_DOCS_STAGE/{filename}"
+            }
+        
+        print(f"   📝 {prompt_type} ({prompt_id}): {len(indexed_rows)} prompts")
     
-    print(f"\\n🎉 Rendered {len(rendered_prompts)} prompts successfully!")
+    elapsed = time.perf_counter() - start_time
+    print(f"\\n🎉 Rendered {len(rendered_prompts)} prompts from {len(rows_by_template)} templates in {elapsed:.2f}s!")
     return rendered_prompts
 
+# Business context per company, used by the {BUSINESS_CONTEXT} placeholder
+COMPANY_CONTEXTS = {
+    'Tempus AI': 'pioneering medical AI with proprietary genomics datasets',
+    'NorthernCell Energy': 'developing next-generation solid-state battery technology', 
+    'Arkadia Commerce': 'building a comprehensive e-commerce platform to challenge Amazon',
+    'Voltaic Dynamics': 'providing critical supply chain components for the EV revolution',
+    'Helios Semiconductors': 'designing specialized AI chips for machine learning workloads',
+    'TerraLink Logistics': 'optimizing global supply chain operations through technology'
+}
+
+# Standardized document types for search services
+DOCUMENT_TYPE_MAPPING = {
+    # Research service document types
+    'ResearchNote': 'ResearchNote',
+    'EarningsTranscript': 'EarningsTranscript', 
+    'FrameworkScaffold': 'FrameworkAnalysis',
+    'ExpertNetworkInterview': 'ExpertNetworkInterview',
+    'PatentAnalysis': 'PatentAnalysis',
+    
+    # Corporate memory service document types
+    'HistoricalThesis': 'HistoricalThesis',
+    'MeetingNotes': 'MeetingNotes',
+    'InternalDebateSummary': 'InternalDebateSummary',
+    
+    # Client service document types  
+    'ClientMeetingNotes': 'ClientMeetingNotes',
+    
+    # Marketing content service document types
+    'MarketingContent': 'MarketingContent'
+}
+
+AUTHOR_MAPPING = {
+    # Research team documents
+    'ResearchNote': 'SAM Research Team',
+    'FrameworkScaffold': 'SAM Research Team',
+    'ExpertNetworkInterview': 'External Expert Network',
+    'PatentAnalysis': 'SAM Research Team',
+    
+    # Company documents
+    'EarningsTranscript': 'Company Management',
+    
+    # Investment committee documents
+    'HistoricalThesis': 'SAM Investment Committee',
+    'InternalDebateSummary': 'SAM Investment Committee',
+    
+    # Portfolio management documents  
+    'MeetingNotes': 'SAM Portfolio Management',
+    
+    # Client relations documents
+    'ClientMeetingNotes': 'SAM Client Relations',
+    
+    # Marketing documents
+    'MarketingContent': 'SAM Marketing Team'
+}
+
+BASE_TAGS_MAPPING = {
+    'ResearchNote': ['Investment Thesis', 'Research', 'Analysis'],
+    'FrameworkScaffold': ['10-Question Framework', 'Research', 'Analysis'],
+    'ExpertNetworkInterview': ['Expert Interview', 'External Research', 'Industry Insights'],
+    'PatentAnalysis': ['Patent Analysis', 'Technology', 'Competitive Moat'],
+    'EarningsTranscript': ['Earnings', 'Management Commentary', 'Q&A'],
+    'HistoricalThesis': ['Historical', 'Thesis Evolution', 'Corporate Memory'],
+    'MeetingNotes': ['Management Meeting', 'Internal Notes'],
+    'InternalDebateSummary': ['Internal Debate', 'Investment Committee', 'Decision Making'],
+    'ClientMeetingNotes': ['Client Relations', 'Meeting Minutes'],
+    'MarketingContent': ['Marketing', 'SAM Philosophy', 'Communications']
+}
+
+# Topic keywords (matched case-insensitively) and the tag they add, in tag order
+TOPIC_TAG_RULES = [
+    (['risk'], 'Risk Analysis'),
+    (['competition', 'amazon'], 'Competitive Analysis'),
+    (['technology', 'ai'], 'Technology'),
+    (['supply chain'], 'Supply Chain')
+]
+
 def get_business_context(company_name, doc_date):
     """Generate business context based on company and time period"""
     if not company_name:
         return "in a dynamic market environment"
-        
-    contexts = {
-        'Tempus AI': 'pioneering medical AI with proprietary genomics datasets',
-        'NorthernCell Energy': 'developing next-generation solid-state battery technology', 
-        'Arkadia Commerce': 'building a comprehensive e-commerce platform to challenge Amazon',
-        'Voltaic Dynamics': 'providing critical supply chain components for the EV revolution',
-        'Helios Semiconductors': 'designing specialized AI chips for machine learning workloads',
-        'TerraLink Logistics': 'optimizing global supply chain operations through technology'
-    }
     
     year = doc_date.year if doc_date else 2024
-    base_context = contexts.get(company_name, 'operating in a competitive technology market')
+    base_context = COMPANY_CONTEXTS.get(company_name, 'operating in a competitive technology market')
     
     if year <= 2020:
         return f"{base_context} during the early growth phase"
@@ -156,152 +282,269 @@ def get_business_context(company_name, doc_date):
 
 def classify_document_type(prompt_type, target_collection):
     """Classify documents into standardized types for search services"""
-    type_mapping = {
-        # Research service document types
-        'ResearchNote': 'ResearchNote',
-        'EarningsTranscript': 'EarningsTranscript', 
-        'FrameworkScaffold': 'FrameworkAnalysis',
-        'ExpertNetworkInterview': 'ExpertNetworkInterview',
-        'PatentAnalysis': 'PatentAnalysis',
-        
-        # Corporate memory service document types
-        'HistoricalThesis': 'HistoricalThesis',
-        'MeetingNotes': 'MeetingNotes',
-        'InternalDebateSummary': 'InternalDebateSummary',
-        
-        # Client service document types  
-        'ClientMeetingNotes': 'ClientMeetingNotes',
-        
-        # Marketing content service document types
-        'MarketingContent': 'MarketingContent'
-    }
-    return type_mapping.get(prompt_type, 'Document')
+    return DOCUMENT_TYPE_MAPPING.get(prompt_type, 'Document')
 
 def get_author_for_type(prompt_type):
     """Get appropriate author based on document type"""
-    authors = {
-        # Research team documents
-        'ResearchNote': 'SAM Research Team',
-        'FrameworkScaffold': 'SAM Research Team',
-        'ExpertNetworkInterview': 'External Expert Network',
-        'PatentAnalysis': 'SAM Research Team',
-        
-        # Company documents
-        'EarningsTranscript': 'Company Management',
-        
-        # Investment committee documents
-        'HistoricalThesis': 'SAM Investment Committee',
-        'InternalDebateSummary': 'SAM Investment Committee',
-        
-        # Portfolio management documents  
-        'MeetingNotes': 'SAM Portfolio Management',
-        
-        # Client relations documents
-        'ClientMeetingNotes': 'SAM Client Relations',
-        
-        # Marketing documents
-        'MarketingContent': 'SAM Marketing Team'
-    }
-    return authors.get(prompt_type, 'SAM Team')
+    return AUTHOR_MAPPING.get(prompt_type, 'SAM Team')
 
 def get_tags_for_document(prompt_type, topics):
     """Generate relevant tags for document categorization"""
-    base_tags = []
-    
-    if prompt_type == 'ResearchNote':
-        base_tags = ['Investment Thesis', 'Research', 'Analysis']
-    elif prompt_type == 'FrameworkScaffold':
-        base_tags = ['10-Question Framework', 'Research', 'Analysis']
-    elif prompt_type == 'ExpertNetworkInterview':
-        base_tags = ['Expert Interview', 'External Research', 'Industry Insights']
-    elif prompt_type == 'PatentAnalysis':
-        base_tags = ['Patent Analysis', 'Technology', 'Competitive Moat']
-    elif prompt_type == 'EarningsTranscript':
-        base_tags = ['Earnings', 'Management Commentary', 'Q&A']
-    elif prompt_type == 'HistoricalThesis':
-        base_tags = ['Historical', 'Thesis Evolution', 'Corporate Memory']
-    elif prompt_type == 'MeetingNotes':
-        base_tags = ['Management Meeting', 'Internal Notes']
-    elif prompt_type == 'InternalDebateSummary':
-        base_tags = ['Internal Debate', 'Investment Committee', 'Decision Making']
-    elif prompt_type == 'ClientMeetingNotes':
-        base_tags = ['Client Relations', 'Meeting Minutes']
-    elif prompt_type == 'MarketingContent':
-        base_tags = ['Marketing', 'SAM Philosophy', 'Communications']
+    base_tags = list(BASE_TAGS_MAPPING.get(prompt_type, []))
     
     # Add topic-based tags
     if topics:
-        if 'risk' in topics.lower():
-            base_tags.append('Risk Analysis')
-        if 'competition' in topics.lower() or 'amazon' in topics.lower():
-            base_tags.append('Competitive Analysis')
-        if 'technology' in topics.lower() or 'ai' in topics.lower():
-            base_tags.append('Technology')
-        if 'supply chain' in topics.lower():
-            base_tags.append('Supply Chain')
+        for keywords, tag in TOPIC_TAG_RULES:
+            if any(keyword in topics.lower() for keyword in keywords):
+                base_tags.append(tag)
     
     return base_tags
 
 def store_rendered_prompts_to_table(session, prompts):
-    """Store rendered prompts in RENDERED_PROMPTS table for bulk generation"""
+    """Store rendered prompts in RENDERED_PROMPTS table with one bulk load"""
     
     print(f"\\n💾 Storing {len(prompts)} rendered prompts to RENDERED_PROMPTS table...")
     
-    for i, prompt in enumerate(prompts):
-        try:
-            # Escape single quotes in content for SQL
-            safe_prompt = prompt['full_prompt'].replace("'", "''")
-            
-            # Handle NULL dates properly
-            doc_date_value = f"'{prompt['doc_date'].strftime('%Y-%m-%d')}'" if prompt['doc_date'] else 'NULL'
-            
-            # Use SELECT with ARRAY_CONSTRUCT for tags
-            if prompt['tags']:
-                # Build ARRAY_CONSTRUCT parameters with proper quoting
-                tag_params = ', '.join([f"'{tag}'" for tag in prompt['tags']])
-                tags_construct = f"ARRAY_CONSTRUCT({tag_params})"
-            else:
-                tags_construct = "ARRAY_CONSTRUCT()"
-            
-            insert_sql = f"""
-            INSERT INTO RENDERED_PROMPTS (
-                PROMPT_RENDER_ID, DOC_ID, FILE_URL, COMPANY_NAME, DOCUMENT_TYPE, 
-                DOC_DATE, QUARTER, AUTHOR, TAGS, SOURCE_PROMPT_ID, MODEL_NAME, FULL_PROMPT
-            ) 
+    if not prompts:
+        print("   ⚠️ No prompts to store")
+        return 0
+    
+    import pandas as pd
+    
+    # One columnar frame for all prompts - tags travel as JSON and become a native ARRAY below
+    prompts_df = pd.DataFrame({
+        'PROMPT_RENDER_ID': [p['prompt_render_id'] for p in prompts],
+        'DOC_ID': [p['doc_id'] for p in prompts],
+        'FILE_URL': [p['file_url'] for p in prompts],
+        'COMPANY_NAME': [p['company_name'] for p in prompts],
+        'DOCUMENT_TYPE': [p['document_type'] for p in prompts],
+        'DOC_DATE': [p['doc_date'].strftime('%Y-%m-%d') if p['doc_date'] else None for p in prompts],
+        'QUARTER': [p['quarter'] for p in prompts],
+        'AUTHOR': [p['author'] for p in prompts],
+        'TAGS_JSON': [json.dumps(p['tags']) for p in prompts],
+        'SOURCE_PROMPT_ID': [p['source_prompt_id'] for p in prompts],
+        'MODEL_NAME': [p['model_name'] for p in prompts],
+        'FULL_PROMPT': [p['full_prompt'] for p in prompts]
+    })
+    
+    # Single staged Parquet load into a temporary table (one PUT + COPY)
+    session.write_pandas(
+        prompts_df,
+        "RENDERED_PROMPTS_STAGING",
+        auto_create_table=True,
+        overwrite=True,
+        table_type="temporary"
+    )
+    
+    # Single set-based insert with TAGS converted to a native array
+    session.sql("""
+        INSERT INTO RENDERED_PROMPTS (
+            PROMPT_RENDER_ID, DOC_ID, FILE_URL, COMPANY_NAME, DOCUMENT_TYPE, 
+            DOC_DATE, QUARTER, AUTHOR, TAGS, SOURCE_PROMPT_ID, MODEL_NAME, FULL_PROMPT
+        )
+        SELECT 
+            PROMPT_RENDER_ID,
+            DOC_ID,
+            FILE_URL,
+            COMPANY_NAME,
+            DOCUMENT_TYPE,
+            TO_DATE(DOC_DATE) as DOC_DATE,
+            QUARTER,
+            AUTHOR,
+            PARSE_JSON(TAGS_JSON)::ARRAY as TAGS,
+            SOURCE_PROMPT_ID,
+            MODEL_NAME,
+            FULL_PROMPT
+        FROM RENDERED_PROMPTS_STAGING
+    """).collect()
+    
+    session.sql("DROP TABLE IF EXISTS RENDERED_PROMPTS_STAGING").collect()
+    
+    print(f"✅ Successfully stored {len(prompts)} rendered prompts to table!")
+    return len(prompts)
+
+# SQL equivalents of build_prompt_context over PROMPT_INPUTS (i) for in-warehouse rendering;
+# every value is non-NULL because REPLACE with a NULL replacement returns NULL
+PROMPT_CONTEXT_SQL = [
+    ('COMPANY_NAME', "COALESCE(i.COMPANY_NAME, '')"),
+    ('DOC_DATE', "COALESCE(TO_CHAR(i.DOC_DATE, 'MMMM DD, YYYY'), '')"),
+    ('QUARTER', "COALESCE(i.QUARTER, '')"),
+    ('ATTENDEES', "COALESCE(i.ATTENDEES, '')"),
+    ('TOPICS', "COALESCE(i.TOPICS, '')"),
+    ('EVENT_ANCHOR', "COALESCE(i.EVENT_ANCHOR, '')"),
+    ('DOC_VARIANT', "COALESCE(i.DOC_VARIANT, '')"),
+    ('CLIENT_NAME', "IFF(i.TARGET_COLLECTION = 'CLIENT_MEETING_ARCHIVE', COALESCE(i.COMPANY_NAME, ''), '')"),
+    ('MEETING_CONTEXT', "COALESCE(i.DOC_VARIANT, '')"),
+    ('PORTFOLIO_FOCUS', "COALESCE(i.TOPICS, '')"),
+    ('TOP_HOLDINGS', "COALESCE(i.TOPICS, '')"),
+    ('MEETING_TYPE', "COALESCE(i.DOC_VARIANT, '')"),
+    ('FOCUS_AREAS', "COALESCE(i.TOPICS, '')"),
+    ('YEAR', "COALESCE(TO_CHAR(i.DOC_DATE, 'YYYY'), '2024')"),
+    ('COMPETITOR', "IFF(CONTAINS(COALESCE(i.COMPANY_NAME, ''), 'Arkadia'), 'Amazon', 'established players')"),
+    ('BUSINESS_CONTEXT', "i.BUSINESS_CONTEXT")
+]
+
+def create_prompt_mapping_tables(session):
+    """Load the prompt type, company context and topic tag lookups as temporary mapping tables"""
+    import pandas as pd
+    
+    prompt_types = sorted(set(DOCUMENT_TYPE_MAPPING) | set(AUTHOR_MAPPING) | set(BASE_TAGS_MAPPING))
+    mapping_frames = {
+        'PROMPT_TYPE_MAPPING': pd.DataFrame({
+            'PROMPT_TYPE': prompt_types,
+            'DOCUMENT_TYPE': [classify_document_type(t, None) for t in prompt_types],
+            'AUTHOR': [get_author_for_type(t) for t in prompt_types],
+            'BASE_TAGS_JSON': [json.dumps(BASE_TAGS_MAPPING.get(t, [])) for t in prompt_types]
+        }),
+        'COMPANY_CONTEXT_MAPPING': pd.DataFrame({
+            'COMPANY_NAME': list(COMPANY_CONTEXTS.keys()),
+            'BUSINESS_CONTEXT': list(COMPANY_CONTEXTS.values())
+        }),
+        'TOPIC_TAG_MAPPING': pd.DataFrame(
+            [
+                {'RULE_ORDER': rule_order, 'KEYWORD': keyword, 'TAG': tag}
+                for rule_order, (keywords, tag) in enumerate(TOPIC_TAG_RULES)
+                for keyword in keywords
+            ]
+        )
+    }
+    
+    for table_name, frame in mapping_frames.items():
+        session.write_pandas(frame, table_name, auto_create_table=True, overwrite=True, table_type="temporary")
+
+def render_prompts_in_warehouse(session):
+    """Render all prompts server-side and write RENDERED_PROMPTS with one INSERT ... SELECT"""
+    
+    print("🏭 Rendering prompts in the warehouse...")
+    start_time = time.perf_counter()
+    
+    create_prompt_mapping_tables(session)
+    
+    # Nested REPLACE calls apply the placeholders in the same order as render_prompt_template
+    rendered_sql = "i.TEMPLATE_TEXT"
+    for placeholder, value_sql in PROMPT_CONTEXT_SQL:
+        rendered_sql = f"REPLACE({rendered_sql}, '{{{placeholder}}}', {value_sql})"
+    
+    session.sql(f"""
+        INSERT INTO RENDERED_PROMPTS (
+            PROMPT_RENDER_ID, DOC_ID, FILE_URL, COMPANY_NAME, DOCUMENT_TYPE, 
+            DOC_DATE, QUARTER, AUTHOR, TAGS, SOURCE_PROMPT_ID, MODEL_NAME, FULL_PROMPT
+        )
+        WITH inputs AS (
             SELECT 
-                '{prompt['prompt_render_id']}' as PROMPT_RENDER_ID,
-                '{prompt['doc_id']}' as DOC_ID,
-                '{prompt['file_url']}' as FILE_URL, 
-                '{prompt['company_name']}' as COMPANY_NAME,
-                '{prompt['document_type']}' as DOCUMENT_TYPE,
-                {doc_date_value} as DOC_DATE,
-                '{prompt['quarter']}' as QUARTER,
-                '{prompt['author']}' as AUTHOR,
-                {tags_construct} as TAGS,
-                '{prompt['source_prompt_id']}' as SOURCE_PROMPT_ID,
-                '{prompt['model_name']}' as MODEL_NAME,
-                '{safe_prompt}' as FULL_PROMPT
-            """
-            
-            session.sql(insert_sql).collect()
-            
-            if (i + 1) % 5 == 0:
-                print(f"   ✅ Stored {i + 1}/{len(prompts)} prompts...")
-                
-        except Exception as e:
-            print(f"   ❌ Error storing prompt {prompt['prompt_render_id']}: {str(e)}")
-            continue
+                ROW_NUMBER() OVER (ORDER BY pi.RUN_ID) as INPUT_NUM,
+                pi.*,
+                pl.PROMPT_TYPE,
+                pl.TEMPLATE_TEXT,
+                IFF(COALESCE(pi.COMPANY_NAME, '') = '', 'client', REPLACE(LOWER(pi.COMPANY_NAME), ' ', '_'))
+                    || '_' || LOWER(pl.PROMPT_TYPE) || '_' || TO_CHAR(pi.DOC_DATE, 'YYYYMMDD')
+                    || IFF(COALESCE(pi.RUN_ID, '') = '', '', '_' || SPLIT_PART(pi.RUN_ID, '_', -1)) as DOC_ID,
+                IFF(COALESCE(pi.COMPANY_NAME, '') = '', 'in a dynamic market environment',
+                    COALESCE(cc.BUSINESS_CONTEXT, 'operating in a competitive technology market') ||
+                    CASE 
+                        WHEN COALESCE(YEAR(pi.DOC_DATE), 2024) <= 2020 THEN ' during the early growth phase'
+                        WHEN COALESCE(YEAR(pi.DOC_DATE), 2024) <= 2022 THEN ' amid pandemic-driven market changes'
+                        ELSE ' in an increasingly competitive landscape'
+                    END) as BUSINESS_CONTEXT
+            FROM PROMPT_INPUTS pi
+            JOIN PROMPT_LIBRARY pl ON pi.PROMPT_ID = pl.PROMPT_ID
+            LEFT JOIN COMPANY_CONTEXT_MAPPING cc ON pi.COMPANY_NAME = cc.COMPANY_NAME
+            WHERE pl.IS_ACTIVE = TRUE
+        ),
+        topic_tags AS (
+            -- One tag per matching rule, in rule order
+            SELECT INPUT_NUM, ARRAY_AGG(TAG) WITHIN GROUP (ORDER BY RULE_ORDER) as TOPIC_TAGS
+            FROM (
+                SELECT DISTINCT i.INPUT_NUM, t.RULE_ORDER, t.TAG
+                FROM inputs i
+                JOIN TOPIC_TAG_MAPPING t ON CONTAINS(LOWER(i.TOPICS), t.KEYWORD)
+            )
+            GROUP BY INPUT_NUM
+        )
+        SELECT 
+            'render_' || i.DOC_ID as PROMPT_RENDER_ID,
+            i.DOC_ID,
+            '@SAM_DOCS_STAGE/' || i.DOC_ID || '.txt' as FILE_URL,
+            COALESCE(i.COMPANY_NAME, '') as COMPANY_NAME,
+            COALESCE(m.DOCUMENT_TYPE, 'Document') as DOCUMENT_TYPE,
+            i.DOC_DATE,
+            COALESCE(i.QUARTER, '') as QUARTER,
+            COALESCE(m.AUTHOR, 'SAM Team') as AUTHOR,
+            ARRAY_CAT(COALESCE(PARSE_JSON(m.BASE_TAGS_JSON)::ARRAY, ARRAY_CONSTRUCT()), COALESCE(tt.TOPIC_TAGS, ARRAY_CONSTRUCT())) as TAGS,
+            i.PROMPT_ID as SOURCE_PROMPT_ID,
+            i.MODEL_NAME,
+            {rendered_sql} as FULL_PROMPT
+        FROM inputs i
+        LEFT JOIN PROMPT_TYPE_MAPPING m ON i.PROMPT_TYPE = m.PROMPT_TYPE
+        LEFT JOIN topic_tags tt ON i.INPUT_NUM = tt.INPUT_NUM
+        ORDER BY i.INPUT_NUM
+    """).collect()
+    
+    rendered_count = session.sql("SELECT COUNT(*) FROM RENDERED_PROMPTS").collect()[0][0]
+    elapsed = time.perf_counter() - start_time
+    print(f"🎉 Rendered {rendered_count} prompts in the warehouse in {elapsed:.2f}s!")
+    return rendered_count
+
+def prepare_rendered_prompts(session, render_mode=None):
+    """Fill RENDERED_PROMPTS using the client-side or in-warehouse renderer; returns the prompt count"""
+    render_mode = render_mode or PROMPT_RENDER_MODE
+    
+    # RENDERED_PROMPTS always reflects the current templates and inputs
+    session.sql("TRUNCATE TABLE RENDERED_PROMPTS").collect()
+    
+    if render_mode == 'warehouse':
+        return render_prompts_in_warehouse(session)
     
-    print(f"✅ Successfully stored rendered prompts to table!")
+    rendered_prompts = render_all_prompts(session)
+    if not rendered_prompts:
+        return 0
+    return store_rendered_prompts_to_table(session, rendered_prompts)
 
-def bulk_generate_documents_with_sql(session):
-    """Generate all documents using SQL bulk operation with AI_COMPLETE"""
+def bulk_generate_documents_with_sql(session, generation_mode=None):
+    """Generate documents using SQL bulk operation with AI_COMPLETE (only missing or changed ones in incremental mode)"""
+    generation_mode = generation_mode or DOCUMENT_GENERATION_MODE
     
-    print("\\n🚀 Starting bulk document generation with AI_COMPLETE...")
+    print(f"\\n🚀 Starting bulk document generation with AI_COMPLETE ({generation_mode} mode)...")
     
     try:
-        # Get distinct models to work around string literal requirement
-        models = session.sql("SELECT DISTINCT MODEL_NAME FROM RENDERED_PROMPTS").collect()
+        if generation_mode == 'full':
+            session.sql("TRUNCATE TABLE DOCUMENTS").collect()
+        else:
+            # Documents from before PROMPT_HASH existed have a NULL hash; adopt the current prompt's hash
+            # so they are kept rather than all regenerated on the first incremental run
+            backfilled = session.sql(f"""
+                UPDATE DOCUMENTS d
+                SET PROMPT_HASH = {PROMPT_HASH_SQL}
+                FROM RENDERED_PROMPTS rp
+                WHERE d.DOC_ID = rp.DOC_ID
+                  AND d.PROMPT_HASH IS NULL
+            """).collect()
+            if backfilled and backfilled[0][0]:
+                print(f"   🏷️ Backfilled PROMPT_HASH for {backfilled[0][0]} existing documents")
+            
+            # Drop documents that no longer have a rendered prompt (removed input, changed prompt type or date)
+            orphaned = session.sql("""
+                DELETE FROM DOCUMENTS d
+                WHERE NOT EXISTS (SELECT 1 FROM RENDERED_PROMPTS rp WHERE rp.DOC_ID = d.DOC_ID)
+            """).collect()
+            print(f"   🗑️ {orphaned[0][0] if orphaned else 0} documents no longer have a prompt and were removed")
+            
+            # Drop documents whose prompt (or model) changed since they were generated so they are regenerated below
+            stale = session.sql(f"""
+                DELETE FROM DOCUMENTS d
+                USING RENDERED_PROMPTS rp
+                WHERE d.DOC_ID = rp.DOC_ID
+                  AND d.PROMPT_HASH IS DISTINCT FROM {PROMPT_HASH_SQL}
+            """).collect()
+            print(f"   🔄 {stale[0][0] if stale else 0} documents have changed prompts and will be regenerated")
+        
+        # Get distinct models with prompts still to generate (model name must be a string literal)
+        models = session.sql("""
+            SELECT DISTINCT rp.MODEL_NAME
+            FROM RENDERED_PROMPTS rp
+            LEFT JOIN DOCUMENTS d ON d.DOC_ID = rp.DOC_ID
+            WHERE d.DOC_ID IS NULL
+        """).collect()
         
         print(f"   📝 Found {len(models)} distinct models to process...")
         total_generated = 0
@@ -310,31 +553,34 @@ def bulk_generate_documents_with_sql(session):
             model_name = model_row[0]
             print(f"   🤖 Processing model: {model_name}")
             
-            # Bulk insert for this specific model (string literal)
+            # Bulk insert for this specific model, anti-joined so existing documents are not regenerated
             bulk_sql = f"""
             INSERT INTO DOCUMENTS (
                 DOC_ID, FILE_URL, COMPANY_NAME, DOCUMENT_TYPE, DOC_DATE, 
-                QUARTER, AUTHOR, TAGS, SOURCE_PROMPT_ID, MODEL_NAME, CONTENT
+                QUARTER, AUTHOR, TAGS, SOURCE_PROMPT_ID, MODEL_NAME, CONTENT, PROMPT_HASH
             )
             SELECT 
-                DOC_ID,
-                FILE_URL,
-                COMPANY_NAME,
-                DOCUMENT_TYPE,
-                DOC_DATE,
-                QUARTER,
-                AUTHOR,
-                TAGS,
-                SOURCE_PROMPT_ID,
-                MODEL_NAME,
-                SNOWFLAKE.CORTEX.COMPLETE('{model_name}', FULL_PROMPT) AS CONTENT
-            FROM RENDERED_PROMPTS
-            WHERE MODEL_NAME = '{model_name}'
-            ORDER BY PROMPT_RENDER_ID
+                rp.DOC_ID,
+                rp.FILE_URL,
+                rp.COMPANY_NAME,
+                rp.DOCUMENT_TYPE,
+                rp.DOC_DATE,
+                rp.QUARTER,
+                rp.AUTHOR,
+                rp.TAGS,
+                rp.SOURCE_PROMPT_ID,
+                rp.MODEL_NAME,
+                SNOWFLAKE.CORTEX.COMPLETE('{model_name}', rp.FULL_PROMPT) AS CONTENT,
+                {PROMPT_HASH_SQL} AS PROMPT_HASH
+            FROM RENDERED_PROMPTS rp
+            LEFT JOIN DOCUMENTS d ON d.DOC_ID = rp.DOC_ID
+            WHERE rp.MODEL_NAME = '{model_name}'
+              AND d.DOC_ID IS NULL
+            ORDER BY rp.PROMPT_RENDER_ID
             """
             
             result = session.sql(bulk_sql).collect()
-            model_count = len(result) if result else 0
+            model_count = result[0][0] if result else 0
             total_generated += model_count
             print(f"   ✅ Generated {model_count} documents for {model_name}")
         
@@ -343,73 +589,191 @@ def bulk_generate_documents_with_sql(session):
         
     except Exception as e:
         print(f"   ❌ Error in bulk generation: {str(e)}")
-        print("   🔄 Falling back to individual generation...")
-        
-        # Fallback: Generate documents one by one using SQL to avoid array issues
-        prompts = session.sql("SELECT PROMPT_RENDER_ID, MODEL_NAME, FULL_PROMPT FROM RENDERED_PROMPTS ORDER BY PROMPT_RENDER_ID").collect()
-        
-        success_count = 0
-        for i, prompt in enumerate(prompts):
-            try:
-                print(f"   📝 Generating document {i+1}/{len(prompts)}...")
-                
-                # Generate content
-                from snowflake.cortex import complete
-                content = complete(model=prompt.MODEL_NAME, prompt=prompt.FULL_PROMPT)
-                
-                # Escape single quotes in content
-                safe_content = content.replace("'", "''")
-                
-                # Use SQL to copy from RENDERED_PROMPTS and add content, letting SQL handle arrays
-                insert_sql = f"""
-                INSERT INTO DOCUMENTS (
-                    DOC_ID, FILE_URL, COMPANY_NAME, DOCUMENT_TYPE, DOC_DATE, 
-                    QUARTER, AUTHOR, TAGS, SOURCE_PROMPT_ID, MODEL_NAME, CONTENT
-                ) 
-                SELECT 
-                    DOC_ID, FILE_URL, COMPANY_NAME, DOCUMENT_TYPE, DOC_DATE,
-                    QUARTER, AUTHOR, TAGS, SOURCE_PROMPT_ID, MODEL_NAME,
-                    '{safe_content}' as CONTENT
-                FROM RENDERED_PROMPTS
-                WHERE PROMPT_RENDER_ID = '{prompt.PROMPT_RENDER_ID}'
-                """
-                
-                session.sql(insert_sql).collect()
-                success_count += 1
-                
-            except Exception as e:
-                print(f"   ❌ Error generating document {i+1}: {str(e)}")
-                continue
-        
-        print(f"   ✅ Fallback generation completed: {success_count} documents")
-        return success_count
+        print("   🔄 Falling back to row-level generation for missing documents...")
+        return generate_missing_documents(session)
+
+def get_missing_prompts(session):
+    """Rendered prompts that have no document yet"""
+    return session.sql("""
+        SELECT rp.PROMPT_RENDER_ID, rp.MODEL_NAME
+        FROM RENDERED_PROMPTS rp
+        LEFT JOIN DOCUMENTS d ON d.DOC_ID = rp.DOC_ID
+        WHERE d.DOC_ID IS NULL
+        ORDER BY rp.PROMPT_RENDER_ID
+    """).collect()
+
+def submit_completion(session, job):
+    """Start one COMPLETE as an async query; the session is never shared across threads"""
+    job['attempts'] += 1
+    model_name = job['model_name'].replace("'", "''")
+    prompt_render_id = job['prompt_render_id'].replace("'", "''")
+    return session.sql(f"""
+        SELECT SNOWFLAKE.CORTEX.COMPLETE('{model_name}', FULL_PROMPT)
+        FROM RENDERED_PROMPTS
+        WHERE PROMPT_RENDER_ID = '{prompt_render_id}'
+    """).collect_nowait()
+
+def complete_batch_with_backoff(session, batch):
+    """Generate a batch of documents as async queries, retrying failures with exponential backoff; updates job status in place"""
+    pending = list(batch)
+    attempt = 0
+    while pending:
+        attempt += 1
+        if attempt > 1:
+            time.sleep(FALLBACK_BACKOFF_SECONDS * 2 ** (attempt - 2))
+        
+        retry = []
+        # At most FALLBACK_MAX_WORKERS queries are in flight at once
+        for wave_start in range(0, len(pending), FALLBACK_MAX_WORKERS):
+            wave = pending[wave_start:wave_start + FALLBACK_MAX_WORKERS]
+            async_jobs = []
+            for job in wave:
+                try:
+                    async_jobs.append((job, submit_completion(session, job)))
+                except Exception as e:
+                    async_jobs.append((job, e))
+            
+            for job, async_job in async_jobs:
+                try:
+                    if isinstance(async_job, Exception):
+                        raise async_job
+                    job['content'] = async_job.result()[0][0]
+                    job['status'] = 'succeeded'
+                except Exception as e:
+                    job['error'] = str(e)
+                    if job['attempts'] > FALLBACK_MAX_RETRIES:
+                        job['status'] = 'failed'
+                    else:
+                        retry.append(job)
+        pending = retry
+
+def insert_generated_documents(session, jobs):
+    """Insert generated content for succeeded jobs into DOCUMENTS with one bulk load"""
+    import pandas as pd
+    
+    contents_df = pd.DataFrame({
+        'PROMPT_RENDER_ID': [job['prompt_render_id'] for job in jobs],
+        'CONTENT': [job['content'] for job in jobs]
+    })
+    session.write_pandas(contents_df, "GENERATED_CONTENT_STAGING", auto_create_table=True, overwrite=True, table_type="temporary")
+    
+    # Copy metadata from RENDERED_PROMPTS so TAGS stays a native array
+    session.sql(f"""
+        INSERT INTO DOCUMENTS (
+            DOC_ID, FILE_URL, COMPANY_NAME, DOCUMENT_TYPE, DOC_DATE, 
+            QUARTER, AUTHOR, TAGS, SOURCE_PROMPT_ID, MODEL_NAME, CONTENT, PROMPT_HASH
+        )
+        SELECT 
+            rp.DOC_ID, rp.FILE_URL, rp.COMPANY_NAME, rp.DOCUMENT_TYPE, rp.DOC_DATE,
+            rp.QUARTER, rp.AUTHOR, rp.TAGS, rp.SOURCE_PROMPT_ID, rp.MODEL_NAME,
+            gc.CONTENT, {PROMPT_HASH_SQL}
+        FROM GENERATED_CONTENT_STAGING gc
+        JOIN RENDERED_PROMPTS rp ON rp.PROMPT_RENDER_ID = gc.PROMPT_RENDER_ID
+    """).collect()
+
+def generate_missing_documents(session):
+    """Generate documents for rendered prompts without one, in bounded concurrent batches"""
+    # Only prompts without a document are submitted, so rows from a partly successful bulk run are kept
+    jobs = [
+        {
+            'prompt_render_id': prompt.PROMPT_RENDER_ID,
+            'model_name': prompt.MODEL_NAME,
+            'status': 'pending',
+            'attempts': 0,
+            'content': None,
+            'error': None
+        }
+        for prompt in get_missing_prompts(session)
+    ]
+    
+    print(f"   📝 {len(jobs)} prompts are missing documents")
+    
+    for batch_start in range(0, len(jobs), FALLBACK_BATCH_SIZE):
+        batch = jobs[batch_start:batch_start + FALLBACK_BATCH_SIZE]
+        complete_batch_with_backoff(session, batch)
+        
+        # Insert each finished batch so completed work survives a later failure
+        succeeded = [job for job in batch if job['status'] == 'succeeded']
+        if succeeded:
+            insert_generated_documents(session, succeeded)
+        print(f"   ⏳ Processed {batch_start + len(batch)}/{len(jobs)} prompts ({len(succeeded)}/{len(batch)} succeeded in this batch)")
+    
+    success_count = sum(1 for job in jobs if job['status'] == 'succeeded')
+    failed_jobs = [job for job in jobs if job['status'] == 'failed']
+    for job in failed_jobs:
+        print(f"   ❌ {job['prompt_render_id']} failed after {job['attempts']} attempts: {job['error']}")
+    
+    print(f"   ✅ Fallback generation completed: {success_count} documents, {len(failed_jobs)} failed")
+    return success_count
+
+def chunk_documents(session):
+    """Split documents into overlapping, token-bounded chunks in DOCUMENT_CHUNKS (only new or changed documents)"""
+    
+    print("\\n✂️ Chunking documents for search...")
+    
+    chunk_size = CHUNK_SIZE_TOKENS * CHARS_PER_TOKEN
+    chunk_overlap = CHUNK_OVERLAP_TOKENS * CHARS_PER_TOKEN
+    
+    # Drop chunks of documents that were removed or whose content changed
+    removed = session.sql("""
+        DELETE FROM DOCUMENT_CHUNKS c
+        WHERE NOT EXISTS (
+            SELECT 1 FROM DOCUMENTS d
+            WHERE d.DOC_ID = c.DOC_ID AND SHA2(d.CONTENT, 256) = c.CONTENT_HASH
+        )
+    """).collect()
+    
+    # Chunk every document that has no chunks yet
+    result = session.sql(f"""
+        INSERT INTO DOCUMENT_CHUNKS (
+            CHUNK_ID, DOC_ID, CHUNK_INDEX, CHUNK_TEXT, FILE_URL, COMPANY_NAME,
+            DOCUMENT_TYPE, DOC_DATE, AUTHOR, CONTENT_HASH
+        )
+        SELECT 
+            d.DOC_ID || '_chunk_' || c.INDEX as CHUNK_ID,  -- Unpadded: LPAD would truncate indexes past its width
+            d.DOC_ID,
+            c.INDEX as CHUNK_INDEX,
+            c.VALUE::STRING as CHUNK_TEXT,
+            d.FILE_URL,
+            d.COMPANY_NAME,
+            d.DOCUMENT_TYPE,
+            d.DOC_DATE,
+            d.AUTHOR,
+            SHA2(d.CONTENT, 256) as CONTENT_HASH
+        FROM DOCUMENTS d,
+            LATERAL FLATTEN(input => SNOWFLAKE.CORTEX.SPLIT_TEXT_RECURSIVE_CHARACTER(
+                d.CONTENT, 'none', {chunk_size}, {chunk_overlap}
+            )) c
+        WHERE d.CONTENT IS NOT NULL
+          AND NOT EXISTS (SELECT 1 FROM DOCUMENT_CHUNKS x WHERE x.DOC_ID = d.DOC_ID)
+    """).collect()
+    
+    chunk_count = result[0][0] if result else 0
+    print(f"   ✅ Created {chunk_count} chunks ({removed[0][0] if removed else 0} outdated chunks removed)")
+    return chunk_count
 
 def verify_complete_setup(session):
     """Verify all components are properly set up"""
     
     print("\\n🔍 Verifying complete setup...")
     
-    verification_queries = [
+    count_checks = [
         ("Companies in financial data", "SELECT COUNT(DISTINCT COMPANY_NAME) FROM COMPANY_FINANCIALS"),
         ("Client records", "SELECT COUNT(*) FROM CLIENT_CRM"),
         ("Portfolio holdings", "SELECT COUNT(*) FROM PORTFOLIO_HOLDINGS_HISTORY"), 
         ("Generated documents", "SELECT COUNT(*) FROM DOCUMENTS"),
         ("Document types", "SELECT COUNT(DISTINCT DOCUMENT_TYPE) FROM DOCUMENTS"),
         ("Prompt templates", "SELECT COUNT(*) FROM PROMPT_LIBRARY WHERE IS_ACTIVE = TRUE"),
+        ("Document chunks", "SELECT COUNT(*) FROM DOCUMENT_CHUNKS")
+    ]
+    show_checks = [
         ("Semantic views", "SHOW SEMANTIC VIEWS")
     ]
     
-    for description, query in verification_queries:
-        try:
-            if query.startswith("SHOW"):
-                result = session.sql(query).collect()
-                count = len(result)
-            else:
-                result = session.sql(query).collect()
-                count = result[0][0] if result else 0
-            print(f"   ✅ {description}: {count}")
-        except Exception as e:
-            print(f"   ❌ {description}: Error - {str(e)}")
+    # All counts in one query, SHOW checks concurrently
+    result = verification.run_verification(session, count_checks, show_checks)
+    verification.print_verification(result)
+    verification.write_verification_json(result)
     
     # Show document distribution
     print("\\n📊 Document distribution by company:")
@@ -442,19 +806,19 @@ def main():
         session.sql("USE SCHEMA SAM_DEMO").collect()
         print("✅ Using FSI_DEMOS.SAM_DEMO")
         
-        # Render prompts (fast - no AI calls)
-        rendered_prompts = render_all_prompts(session)
+        # Render prompts and store them to RENDERED_PROMPTS (fast - no AI calls)
+        prompt_count = prepare_rendered_prompts(session)
         
-        if not rendered_prompts:
+        if not prompt_count:
             print("❌ No prompts were rendered!")
             return
         
-        # Store rendered prompts to table
-        store_rendered_prompts_to_table(session, rendered_prompts)
-        
         # Bulk generate documents using SQL AI_COMPLETE
         doc_count = bulk_generate_documents_with_sql(session)
         
+        # Split documents into search chunks
+        chunk_documents(session)
+        
         # Verify setup
         verify_complete_setup(session)
         
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+SAM Demo - Verification Engine
+Runs every count check in a single query and the SHOW checks concurrently,
+returning a machine-readable result with per-check timings
+"""
+
+import json
+import os
+import time
+
+# Write the verification result as JSON to this path (for CI); unset = console output only
+VERIFY_JSON_PATH = os.getenv("SAM_VERIFY_JSON")
+POLL_INTERVAL_SECONDS = 0.1  # How often running async checks are checked for completion
+
+def run_verification(session, count_checks, show_checks=()):
+    """
+    Run verification checks and return the result as a dict.
+    
+    count_checks: (name, scalar query[, minimum]) tuples; all run as one batched SELECT.
+                  A value below minimum is reported as a warning.
+    show_checks:  (name, SHOW statement) tuples; submitted together as async queries.
+    
+    Each check's seconds runs from its own submission to its own completion; batched
+    count checks share the batch's time.
+    """
+    start_time = time.perf_counter()
+    checks = build_count_checks(count_checks)
+    
+    # SHOW statements can't be batched into a SELECT, so they run concurrently with the count query
+    jobs = [submit_check(session, query) for name, query in show_checks]
+    if checks:
+        jobs.append(submit_check(session, build_batch_query(checks)))
+    results = wait_for_checks(jobs)
+    if checks:
+        finish_count_checks(session, checks, *results.pop())
+    
+    for (name, query), (rows, seconds) in zip(show_checks, results):
+        check = {'name': name, 'type': 'show', 'query': query, 'value': None, 'items': [], 'status': 'ok', 'error': None, 'seconds': seconds}
+        if isinstance(rows, Exception):
+            check['status'] = 'error'
+            check['error'] = str(rows)
+        else:
+            check['value'] = len(rows)
+            check['items'] = [str(row[1]) for row in rows]  # SHOW output column 1 is the object name
+        checks.append(check)
+    
+    return {
+        'passed': all(check['status'] != 'error' for check in checks),
+        'total_seconds': round(time.perf_counter() - start_time, 3),
+        'checks': checks
+    }
+
+def submit_check(session, query):
+    """Submit a check query asynchronously; returns (job or submission error, submit time)"""
+    check_start = time.perf_counter()
+    try:
+        return session.sql(query).collect_nowait(), check_start
+    except Exception as e:
+        return e, check_start
+
+def wait_for_checks(jobs):
+    """Poll submitted checks until all finish; returns (rows or error, seconds) per job, in order"""
+    results = [None] * len(jobs)
+    pending = list(range(len(jobs)))
+    
+    # Poll so each check is timed to its own completion
+    while pending:
+        still_running = []
+        for index in pending:
+            job, check_start = jobs[index]
+            if not isinstance(job, Exception) and not job.is_done():
+                still_running.append(index)
+                continue
+            try:
+                if isinstance(job, Exception):
+                    raise job
+                outcome = job.result()
+            except Exception as e:
+                outcome = e
+            results[index] = (outcome, round(time.perf_counter() - check_start, 3))
+        pending = still_running
+        if pending:
+            time.sleep(POLL_INTERVAL_SECONDS)
+    
+    return results
+
+def build_count_checks(count_checks):
+    """Result entries for the count checks, before they have run"""
+    return [
+        {
+            'name': count_check[0],
+            'type': 'count',
+            'query': count_check[1],
+            'minimum': count_check[2] if len(count_check) > 2 else None,
+            'value': None,
+            'status': 'ok',
+            'error': None
+        }
+        for count_check in count_checks
+    ]
+
+def build_batch_query(checks):
+    """One SELECT returning every scalar check as a column"""
+    return "SELECT " + ",\n       ".join(f"({check['query']}) AS CHECK_{i}" for i, check in enumerate(checks))
+
+def finish_count_checks(session, checks, batch_rows, batch_seconds):
+    """Fill in count checks from the batch; if it failed, rerun them individually to isolate the error"""
+    if isinstance(batch_rows, Exception):
+        # A missing table fails the whole batch; run the checks concurrently one by one to find it
+        results = wait_for_checks([submit_check(session, check['query']) for check in checks])
+        for check, (rows, seconds) in zip(checks, results):
+            if isinstance(rows, Exception):
+                check['status'] = 'error'
+                check['error'] = str(rows)
+            else:
+                check['value'] = rows[0][0]
+            check['seconds'] = seconds
+    else:
+        for i, check in enumerate(checks):
+            check['value'] = batch_rows[0][i]
+            check['seconds'] = batch_seconds
+    
+    for check in checks:
+        if check['status'] == 'ok' and check['minimum'] is not None and (check['value'] or 0) < check['minimum']:
+            check['status'] = 'warning'
+
+def print_verification(result):
+    """Print a verification result in the console format used by the setup scripts"""
+    for check in result['checks']:
+        if check['status'] == 'error':
+            print(f"   ❌ {check['name']}: Error - {check['error']}")
+        elif check['status'] == 'warning':
+            print(f"   ⚠️ {check['name']}: {check['value']} (may need attention)")
+        else:
+            print(f"   ✅ {check['name']}: {check['value']}")
+    print(f"   ⏱️ {len(result['checks'])} checks in {result['total_seconds']:.2f}s")
+
+def write_verification_json(result, path=None):
+    """Write the result as JSON when a path is given or SAM_VERIFY_JSON is set"""
+    path = path or VERIFY_JSON_PATH
+    if not path:
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=2, default=str)
+    print(f"   📄 Verification result written to {path}")
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+SAM Snowsight Intelligence Demo - Seed Data Loader
+Loads COMPANY_FINANCIALS, CLIENT_CRM, CLIENT_PORTFOLIOS and PORTFOLIO_HOLDINGS_HISTORY
+from the CSV fixtures in data/seed, optionally extrapolated to more quarters, companies and clients
+"""
+
+import csv
+import os
+import random
+import tempfile
+from datetime import date, timedelta
+
+SEED_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'seed')
+SEED_STAGE = "SAM_SEED_STAGE"
+
+# Seed tables in load order (fixture file is data/seed/<table>.csv, columns in table order)
+SEED_TABLES = ['COMPANY_FINANCIALS', 'CLIENT_CRM', 'CLIENT_PORTFOLIOS', 'PORTFOLIO_HOLDINGS_HISTORY']
+
+# Extrapolation beyond the fixtures (0 keeps the fixture data as-is)
+SEED_EXTRA_QUARTERS = int(os.getenv("SAM_SEED_EXTRA_QUARTERS", "0"))    # Quarters added after each company's last report
+SEED_COMPANY_COUNT = int(os.getenv("SAM_SEED_COMPANY_COUNT", "0"))      # Total companies (fixture companies + generated)
+SEED_CLIENT_COUNT = int(os.getenv("SAM_SEED_CLIENT_COUNT", "0"))        # Total clients (fixture clients + generated)
+SEED_RANDOM_SEED = 42                                                   # Generated rows are identical on every run
+
+# Name parts for generated companies and clients
+COMPANY_NAME_PREFIXES = ['Aurora', 'Boreal', 'Cobalt', 'Meridian', 'Quantum', 'Sable', 'Vantage', 'Zephyr', 'Orion', 'Atlas']
+COMPANY_NAME_SUFFIXES = ['Analytics', 'Robotics', 'Therapeutics', 'Materials', 'Networks', 'Mobility', 'Foods', 'Energy']
+CLIENT_LOCATIONS = ['Aberdeen', 'Glasgow', 'Dundee', 'Inverness', 'Perth', 'Stirling', 'Fife', 'Lothian', 'Borders', 'Orkney']
+CLIENT_TYPES = [
+    ('Pension Fund', 'Pension Trust'),
+    ('Endowment', 'University Endowment'),
+    ('Family Office', 'Family Office'),
+    ('Foundation', 'Charitable Foundation'),
+    ('Insurance', 'Insurance Fund')
+]
+
+def read_fixture(table_name):
+    """Read a seed fixture as a list of dicts keyed by column name"""
+    with open(os.path.join(SEED_DATA_DIR, f"{table_name.lower()}.csv"), newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        return reader.fieldnames, list(reader)
+
+def next_quarter_end(report_date):
+    """Last day of the quarter after report_date"""
+    month = report_date.month + 3
+    year = report_date.year + (month - 1) // 12
+    month = (month - 1) % 12 + 1
+    # Day before the first day of the following month
+    following = date(year + month // 12, month % 12 + 1, 1)
+    return following - timedelta(days=1)
+
+def extrapolate_quarters(financials, extra_quarters, rng):
+    """Append extra_quarters per company, continuing each metric's average quarterly trend"""
+    companies = {}
+    for row in financials:
+        companies.setdefault(row['COMPANY_ID'], []).append(row)
+    
+    extended = list(financials)
+    for rows in companies.values():
+        rows = sorted(rows, key=lambda r: r['REPORT_DATE'])
+        periods = max(len(rows) - 1, 1)
+        first, last = rows[0], rows[-1]
+        
+        # Compound growth for positive series, average step for net income (which crosses zero)
+        growth = {
+            column: (float(last[column]) / float(first[column])) ** (1 / periods) if float(first[column]) > 0 else 1.0
+            for column in ['REVENUE_USD_M', 'RD_SPEND_USD_M', 'CASH_ON_HAND_USD_M']
+        }
+        income_step = (float(last['NET_INCOME_USD_M']) - float(first['NET_INCOME_USD_M'])) / periods
+        
+        previous = last
+        for _ in range(extra_quarters):
+            report_date = next_quarter_end(date.fromisoformat(previous['REPORT_DATE']))
+            row = dict(previous)
+            row['REPORT_DATE'] = report_date.isoformat()
+            row['QUARTER'] = f"{report_date.year}Q{(report_date.month - 1) // 3 + 1}"
+            for column, rate in growth.items():
+                row[column] = f"{float(previous[column]) * rate * rng.uniform(0.98, 1.02):.1f}"
+            row['NET_INCOME_USD_M'] = f"{float(previous['NET_INCOME_USD_M']) + income_step * rng.uniform(0.8, 1.2):.1f}"
+            extended.append(row)
+            previous = row
+    
+    return extended
+
+def extrapolate_companies(financials, company_count, rng):
+    """Add generated companies modelled on the fixture companies' reporting histories, up to company_count"""
+    templates = {}
+    for row in financials:
+        templates.setdefault(row['COMPANY_ID'], []).append(row)
+    template_rows = list(templates.values())
+    
+    extended = list(financials)
+    for company_id in range(len(templates) + 1, company_count + 1):
+        name_index = company_id - len(templates) - 1
+        company_name = (f"{COMPANY_NAME_PREFIXES[name_index % len(COMPANY_NAME_PREFIXES)]} "
+                        f"{COMPANY_NAME_SUFFIXES[(name_index // len(COMPANY_NAME_PREFIXES)) % len(COMPANY_NAME_SUFFIXES)]}")
+        if name_index >= len(COMPANY_NAME_PREFIXES) * len(COMPANY_NAME_SUFFIXES):
+            company_name += f" {name_index // (len(COMPANY_NAME_PREFIXES) * len(COMPANY_NAME_SUFFIXES)) + 1}"
+        
+        scale = rng.uniform(0.3, 3.0)
+        for template in template_rows[(company_id - 1) % len(template_rows)]:
+            row = dict(template)
+            row['COMPANY_ID'] = str(company_id)
+            row['TICKER'] = f"S{company_id:03d}"
+            row['COMPANY_NAME'] = company_name
+            for column in ['REVENUE_USD_M', 'NET_INCOME_USD_M', 'RD_SPEND_USD_M', 'CASH_ON_HAND_USD_M']:
+                row[column] = f"{float(template[column]) * scale:.1f}"
+            extended.append(row)
+    
+    return extended
+
+def extrapolate_clients(clients, portfolios, holdings, client_count, tickers, rng):
+    """Add generated clients, each with one portfolio and three holdings, up to client_count"""
+    clients, portfolios, holdings = list(clients), list(portfolios), list(holdings)
+    interests = [client['STATED_INTERESTS'] for client in clients]
+    fixture_clients = len(clients)
+    transaction_number = len(holdings)
+    
+    for client_number in range(len(clients) + 1, client_count + 1):
+        name_index = client_number - fixture_clients - 1
+        client_type, type_name = CLIENT_TYPES[name_index % len(CLIENT_TYPES)]
+        location = CLIENT_LOCATIONS[(name_index // len(CLIENT_TYPES)) % len(CLIENT_LOCATIONS)]
+        client_name = f"{location} {type_name}"
+        if name_index >= len(CLIENT_TYPES) * len(CLIENT_LOCATIONS):
+            client_name += f" {name_index // (len(CLIENT_TYPES) * len(CLIENT_LOCATIONS)) + 1}"
+        
+        client_id = f"CL{client_number:04d}"
+        portfolio_id = f"PF_{client_id}_001"
+        contact_date = date(2024, 1, 1) + timedelta(days=rng.randrange(366))
+        clients.append({
+            'CLIENT_ID': client_id,
+            'CLIENT_NAME': client_name,
+            'CLIENT_TYPE': client_type,
+            'AUM_USD_M': f"{rng.uniform(100, 5000):.1f}",
+            'LAST_CONTACT_DATE': contact_date.isoformat(),
+            'STATED_INTERESTS': rng.choice(interests),
+            'MEETING_LOGS': f"{contact_date.strftime('%b %Y')}: Quarterly review. Discussed portfolio positioning and long-term growth themes."
+        })
+        portfolios.append({
+            'PORTFOLIO_ID': portfolio_id,
+            'CLIENT_ID': client_id,
+            'PERFORMANCE_YTD_PCT': f"{rng.uniform(-5, 20):.1f}",
+            'INCEPTION_DATE': (date(2018, 1, 1) + timedelta(days=rng.randrange(6 * 365))).isoformat()
+        })
+        for ticker in rng.sample(tickers, min(3, len(tickers))):
+            transaction_number += 1
+            holdings.append({
+                'TRANSACTION_ID': f"TXN_{transaction_number:03d}",
+                'PORTFOLIO_ID': portfolio_id,
+                'TRADE_DATE': (date(2023, 1, 1) + timedelta(days=rng.randrange(2 * 365))).isoformat(),
+                'TICKER': ticker,
+                'ACTION': 'BUY',
+                'SHARES': str(rng.randrange(20000, 250000, 1000)),
+                'PRICE_PER_SHARE': f"{rng.uniform(20, 200):.2f}",
+                'RESULTING_WEIGHT_PCT': f"{rng.uniform(3, 20):.1f}"
+            })
+    
+    return clients, portfolios, holdings
+
+def build_seed_rows(extra_quarters=None, company_count=None, client_count=None):
+    """Fixture rows per seed table, extrapolated as configured; returns {table: (columns, rows)}"""
+    extra_quarters = SEED_EXTRA_QUARTERS if extra_quarters is None else extra_quarters
+    company_count = SEED_COMPANY_COUNT if company_count is None else company_count
+    client_count = SEED_CLIENT_COUNT if client_count is None else client_count
+    rng = random.Random(SEED_RANDOM_SEED)
+    
+    fixtures = {table_name: read_fixture(table_name) for table_name in SEED_TABLES}
+    financials = fixtures['COMPANY_FINANCIALS'][1]
+    
+    if company_count:
+        financials = extrapolate_companies(financials, company_count, rng)
+    if extra_quarters:
+        financials = extrapolate_quarters(financials, extra_quarters, rng)
+    
+    clients = fixtures['CLIENT_CRM'][1]
+    portfolios = fixtures['CLIENT_PORTFOLIOS'][1]
+    holdings = fixtures['PORTFOLIO_HOLDINGS_HISTORY'][1]
+    if client_count:
+        tickers = sorted({row['TICKER'] for row in financials})
+        clients, portfolios, holdings = extrapolate_clients(clients, portfolios, holdings, client_count, tickers, rng)
+    
+    rows = {
+        'COMPANY_FINANCIALS': financials,
+        'CLIENT_CRM': clients,
+        'CLIENT_PORTFOLIOS': portfolios,
+        'PORTFOLIO_HOLDINGS_HISTORY': holdings
+    }
+    return {table_name: (fixtures[table_name][0], rows[table_name]) for table_name in SEED_TABLES}
+
+def load_seed_data(session):
+    """Load the seed tables with one PUT and one COPY INTO per table"""
+    print("🌱 Loading seed data from fixtures...")
+    
+    try:
+        seed_rows = build_seed_rows()
+        session.sql(f"CREATE STAGE IF NOT EXISTS {SEED_STAGE}").collect()
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for table_name, (columns, rows) in seed_rows.items():
+                file_name = f"{table_name.lower()}.csv"
+                with open(os.path.join(temp_dir, file_name), 'w', newline='', encoding='utf-8') as f:
+                    writer = csv.DictWriter(f, fieldnames=columns, lineterminator='\n')
+                    writer.writeheader()
+                    writer.writerows(rows)
+                
+                session.file.put(os.path.join(temp_dir, file_name), f"@{SEED_STAGE}", auto_compress=True, overwrite=True)
+                session.sql(f"""
+                    COPY INTO {table_name}
+                    FROM @{SEED_STAGE}/{file_name}.gz
+                    FILE_FORMAT = (TYPE = CSV SKIP_HEADER = 1 FIELD_OPTIONALLY_ENCLOSED_BY = '"')
+                    FORCE = TRUE
+                """).collect()
+                print(f"   ✅ {table_name}: {len(rows)} rows")
+        
+        return True
+    
+    except Exception as e:
+        print(f"   ❌ Error loading seed data: {str(e)}")
+        return False
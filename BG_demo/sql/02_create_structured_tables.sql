@@ -116,7 +116,8 @@ CREATE OR REPLACE TABLE PROMPT_INPUTS (
 CREATE OR REPLACE STAGE SAM_DOCS_STAGE;
 
 -- Documents table for storing generated content (required for Cortex Search)
-CREATE OR REPLACE TABLE DOCUMENTS (
+-- Kept across setup runs so only new or changed prompts are regenerated (incremental generation)
+CREATE TABLE IF NOT EXISTS DOCUMENTS (
     DOC_ID VARCHAR(64) PRIMARY KEY,
     FILE_URL STRING,
     COMPANY_NAME VARCHAR(255),
@@ -128,12 +129,33 @@ CREATE OR REPLACE TABLE DOCUMENTS (
     SOURCE_PROMPT_ID VARCHAR(64),
     MODEL_NAME VARCHAR(100),
     CONTENT VARCHAR(16777216),  -- Max VARCHAR for large documents
+    PROMPT_HASH VARCHAR(64),    -- SHA2 of model + rendered prompt the content was generated from
     LAST_MODIFIED TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()
 );
 
+-- Documents tables created before incremental generation lack the prompt hash
+ALTER TABLE DOCUMENTS ADD COLUMN IF NOT EXISTS PROMPT_HASH VARCHAR(64);
+
 -- Enable change tracking for Cortex Search compatibility
 ALTER TABLE DOCUMENTS SET CHANGE_TRACKING = TRUE;
 
+-- Overlapping, token-bounded chunks of each document; the Cortex Search services index these
+CREATE TABLE IF NOT EXISTS DOCUMENT_CHUNKS (
+    CHUNK_ID VARCHAR(80) PRIMARY KEY,
+    DOC_ID VARCHAR(64),         -- Back-reference to DOCUMENTS
+    CHUNK_INDEX INTEGER,        -- Position of the chunk within the document
+    CHUNK_TEXT VARCHAR(16777216),
+    FILE_URL STRING,
+    COMPANY_NAME VARCHAR(255),
+    DOCUMENT_TYPE VARCHAR(50),
+    DOC_DATE DATE,
+    AUTHOR VARCHAR(255),
+    CONTENT_HASH VARCHAR(64),   -- SHA2 of the document content the chunk was cut from
+    FOREIGN KEY (DOC_ID) REFERENCES DOCUMENTS(DOC_ID)
+);
+
+ALTER TABLE DOCUMENT_CHUNKS SET CHANGE_TRACKING = TRUE;
+
 -- Rendered prompts table for bulk document generation optimization
 CREATE OR REPLACE TABLE RENDERED_PROMPTS (
     PROMPT_RENDER_ID VARCHAR(64) PRIMARY KEY,
@@ -7,57 +7,12 @@ USE DATABASE FSI_DEMOS;
 USE SCHEMA SAM_DEMO;
 
 -- ===================================================================
--- COMPANY FINANCIAL DATA (6 companies across different sectors)
+-- COMPANY FINANCIALS, CLIENT CRM, CLIENT PORTFOLIOS, PORTFOLIO HOLDINGS
+-- Loaded from the CSV fixtures in data/seed by setup/seed_data.py
+-- (one staged COPY per table, optionally extrapolated to more quarters,
+-- companies and clients)
 -- ===================================================================
 
-INSERT INTO COMPANY_FINANCIALS VALUES
--- Tempus AI (Private medical AI company) - 8 quarters
-(1, 'TMPS', 'Tempus AI', '2023-03-31', '2023Q1', 145.2, -23.1, 38.5, 892.3),
-(1, 'TMPS', 'Tempus AI', '2023-06-30', '2023Q2', 167.8, -19.4, 42.1, 873.8),
-(1, 'TMPS', 'Tempus AI', '2023-09-30', '2023Q3', 189.3, -15.2, 46.3, 901.2),
-(1, 'TMPS', 'Tempus AI', '2023-12-31', '2023Q4', 212.7, -8.9, 51.8, 934.5),
-(1, 'TMPS', 'Tempus AI', '2024-03-31', '2024Q1', 238.4, -4.2, 56.2, 978.9),
-(1, 'TMPS', 'Tempus AI', '2024-06-30', '2024Q2', 267.9, 2.1, 61.7, 1023.4),
-(1, 'TMPS', 'Tempus AI', '2024-09-30', '2024Q3', 294.5, 8.7, 67.3, 1089.2),
-(1, 'TMPS', 'Tempus AI', '2024-12-31', '2024Q4', 321.8, 15.4, 73.9, 1156.7),
-
--- NorthernCell Energy (Private solid-state battery company) - 6 quarters  
-(2, 'NCLL', 'NorthernCell Energy', '2023-06-30', '2023Q2', 89.4, -45.7, 67.2, 456.8),
-(2, 'NCLL', 'NorthernCell Energy', '2023-09-30', '2023Q3', 102.1, -41.3, 72.8, 478.9),
-(2, 'NCLL', 'NorthernCell Energy', '2023-12-31', '2023Q4', 118.7, -35.9, 79.1, 523.4),
-(2, 'NCLL', 'NorthernCell Energy', '2024-03-31', '2024Q1', 134.2, -29.8, 85.6, 567.2),
-(2, 'NCLL', 'NorthernCell Energy', '2024-06-30', '2024Q2', 151.9, -22.4, 92.3, 612.8),
-(2, 'NCLL', 'NorthernCell Energy', '2024-09-30', '2024Q3', 168.5, -16.1, 98.7, 659.3),
-
--- Arkadia Commerce (Platform retail - key company for PM thesis evolution demo) - 6 quarters
-(3, 'ARKD', 'Arkadia Commerce', '2023-03-31', '2023Q1', 2847.3, 312.8, 145.6, 1834.2),
-(3, 'ARKD', 'Arkadia Commerce', '2023-06-30', '2023Q2', 3102.7, 389.1, 167.3, 2156.8),
-(3, 'ARKD', 'Arkadia Commerce', '2023-09-30', '2023Q3', 3456.9, 478.2, 189.7, 2398.4),
-(3, 'ARKD', 'Arkadia Commerce', '2023-12-31', '2023Q4', 3821.5, 567.9, 213.8, 2672.1),
-(3, 'ARKD', 'Arkadia Commerce', '2024-03-31', '2024Q1', 4234.8, 645.3, 241.2, 2945.7),
-(3, 'ARKD', 'Arkadia Commerce', '2024-06-30', '2024Q2', 4678.2, 734.6, 272.5, 3287.9),
-
--- Voltaic Dynamics (EV supply chain - for PM pre-mortem scenario) - 6 quarters
-(4, 'VOLT', 'Voltaic Dynamics', '2023-06-30', '2023Q2', 456.7, -67.3, 89.4, 578.9),
-(4, 'VOLT', 'Voltaic Dynamics', '2023-09-30', '2023Q3', 523.8, -58.2, 102.7, 634.5),
-(4, 'VOLT', 'Voltaic Dynamics', '2023-12-31', '2023Q4', 598.4, -45.1, 118.3, 698.2),
-(4, 'VOLT', 'Voltaic Dynamics', '2024-03-31', '2024Q1', 672.9, -31.8, 134.8, 756.7),
-(4, 'VOLT', 'Voltaic Dynamics', '2024-06-30', '2024Q2', 751.3, -18.4, 152.9, 823.4),
-(4, 'VOLT', 'Voltaic Dynamics', '2024-09-30', '2024Q3', 834.7, -8.2, 173.6, 891.8),
-
--- Helios Semiconductors (AI chips) - 5 quarters
-(5, 'HLIO', 'Helios Semiconductors', '2023-09-30', '2023Q3', 1234.6, 189.7, 567.8, 2341.2),
-(5, 'HLIO', 'Helios Semiconductors', '2023-12-31', '2023Q4', 1456.8, 234.9, 645.3, 2567.8),
-(5, 'HLIO', 'Helios Semiconductors', '2024-03-31', '2024Q1', 1687.9, 287.4, 732.1, 2834.5),
-(5, 'HLIO', 'Helios Semiconductors', '2024-06-30', '2024Q2', 1923.4, 345.8, 823.7, 3123.9),
-(5, 'HLIO', 'Helios Semiconductors', '2024-09-30', '2024Q3', 2178.5, 412.3, 921.8, 3456.2),
-
--- TerraLink Logistics (Global supply chain) - 4 quarters
-(6, 'TLNK', 'TerraLink Logistics', '2024-03-31', '2024Q1', 890.4, 78.9, 34.5, 456.7),
-(6, 'TLNK', 'TerraLink Logistics', '2024-06-30', '2024Q2', 967.8, 89.2, 38.9, 498.3),
-(6, 'TLNK', 'TerraLink Logistics', '2024-09-30', '2024Q3', 1052.6, 102.4, 43.7, 543.8),
-(6, 'TLNK', 'TerraLink Logistics', '2024-12-31', '2024Q4', 1143.9, 117.8, 49.2, 592.1);
-
 -- ===================================================================
 -- MARKET DATA (supporting data for context)
 -- ===================================================================
@@ -71,52 +26,6 @@ INSERT INTO MARKET_DATA VALUES
 ('HLIO', '2024-12-20', 0.00, 0.00, 0.00, 0.00, 0),  -- Private company placeholder
 ('TLNK', '2024-12-20', 0.00, 0.00, 0.00, 0.00, 0);  -- Private company placeholder
 
--- ===================================================================
--- CLIENT DATA FOR CRM SCENARIOS
--- ===================================================================
-
-INSERT INTO CLIENT_CRM VALUES
-('SPT001', 'Scottish Pension Trust', 'Pension Fund', 2450.5, '2024-11-15', 
- 'Sustainable investing, long-term growth, energy transition, ESG integration', 
- 'Nov 2024: Discussed Q3 performance and energy transition portfolio alignment. Positive on Voltaic Dynamics despite short-term headwinds.'),
-
-('EUE001', 'Edinburgh University Endowment', 'Endowment', 890.2, '2024-10-28',
- 'Long-term capital preservation, growth equity, innovation exposure, tech disruption',
- 'Oct 2024: Annual review meeting. Strong interest in AI and semiconductor themes. Pleased with Helios Semiconductors performance.'),
-
-('HFO001', 'Highland Family Office', 'Family Office', 325.8, '2024-12-01',
- 'Wealth preservation, next-generation focus, sustainable technology, private market access',
- 'Dec 2024: Quarterly check-in. Interested in increasing allocation to private companies like Tempus AI and NorthernCell Energy.');
-
--- ===================================================================
--- CLIENT PORTFOLIO DATA
--- ===================================================================
-
-INSERT INTO CLIENT_PORTFOLIOS VALUES
-('PF_SPT_001', 'SPT001', 8.7, '2019-03-15'),
-('PF_EUE_001', 'EUE001', 12.3, '2020-01-08'), 
-('PF_HFO_001', 'HFO001', 15.8, '2021-06-22');
-
--- ===================================================================
--- PORTFOLIO HOLDINGS HISTORY
--- ===================================================================
-
-INSERT INTO PORTFOLIO_HOLDINGS_HISTORY VALUES
--- Scottish Pension Trust holdings (focus on energy transition)
-('TXN_001', 'PF_SPT_001', '2023-06-15', 'VOLT', 'BUY', 125000, 45.80, 8.5),
-('TXN_002', 'PF_SPT_001', '2024-01-22', 'NCLL', 'BUY', 89000, 67.20, 6.2),
-('TXN_003', 'PF_SPT_001', '2024-03-10', 'ARKD', 'BUY', 45000, 156.90, 12.3),
-
--- Edinburgh University Endowment holdings (focus on tech/innovation)
-('TXN_004', 'PF_EUE_001', '2023-09-08', 'HLIO', 'BUY', 78000, 89.40, 15.4),
-('TXN_005', 'PF_EUE_001', '2024-02-14', 'TMPS', 'BUY', 156000, 98.70, 11.8),
-('TXN_006', 'PF_EUE_001', '2024-05-20', 'TLNK', 'BUY', 234000, 32.50, 9.2),
-
--- Highland Family Office holdings (focus on private/emerging companies)
-('TXN_007', 'PF_HFO_001', '2023-11-30', 'TMPS', 'BUY', 89000, 78.60, 18.9),
-('TXN_008', 'PF_HFO_001', '2024-04-18', 'NCLL', 'BUY', 67000, 71.30, 14.6),
-('TXN_009', 'PF_HFO_001', '2024-08-25', 'VOLT', 'BUY', 123000, 52.40, 16.7);
-
 -- ===================================================================
 -- PROMPT TEMPLATES FOR SYNTHETIC DATA GENERATION
 -- ===================================================================
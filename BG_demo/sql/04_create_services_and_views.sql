@@ -227,7 +227,8 @@ SELECT '□ Configure Personalization & Narrative Suite agent (CRM)'
 UNION ALL
 SELECT '□ Test demo scenarios with scripted prompts';
 
--- Note: The following services are created automatically by unified_setup.py:
+-- Note: The following services are created automatically by unified_setup.py
+-- over DOCUMENT_CHUNKS (overlapping, token-bounded chunks of DOCUMENTS):
 -- 
 -- CREATE CORTEX SEARCH SERVICE research_service 
 -- ON CONTENT
@@ -235,8 +236,8 @@ SELECT '□ Test demo scenarios with scripted prompts';
 -- WAREHOUSE = COMPUTE_WH
 -- TARGET_LAG = '1 hour'
 -- AS (
---   SELECT CONTENT, DOC_ID, FILE_URL, COMPANY_NAME, DOCUMENT_TYPE, DOC_DATE, AUTHOR
---   FROM DOCUMENTS 
+--   SELECT CHUNK_TEXT AS CONTENT, DOC_ID, FILE_URL, COMPANY_NAME, DOCUMENT_TYPE, DOC_DATE, AUTHOR
+--   FROM DOCUMENT_CHUNKS 
 --   WHERE DOCUMENT_TYPE IN ('ResearchNote', 'EarningsTranscript', 'FrameworkAnalysis', 'ExpertNetworkInterview', 'PatentAnalysis')
 -- );
 --
@@ -246,8 +247,8 @@ SELECT '□ Test demo scenarios with scripted prompts';
 -- WAREHOUSE = COMPUTE_WH  
 -- TARGET_LAG = '1 hour'
 -- AS (
---   SELECT CONTENT, DOC_ID, FILE_URL, COMPANY_NAME, DOCUMENT_TYPE, DOC_DATE, AUTHOR
---   FROM DOCUMENTS
+--   SELECT CHUNK_TEXT AS CONTENT, DOC_ID, FILE_URL, COMPANY_NAME, DOCUMENT_TYPE, DOC_DATE, AUTHOR
+--   FROM DOCUMENT_CHUNKS
 --   WHERE DOCUMENT_TYPE IN ('HistoricalThesis', 'MeetingNotes', 'InternalDebateSummary')
 -- );
 --
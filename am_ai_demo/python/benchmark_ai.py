@@ -0,0 +1,244 @@
+"""
+Semantic View Benchmark for SAM Demo
+
+This module benchmarks SAM_ANALYST_VIEW with the kind of questions the
+Portfolio Copilot agent asks:
+- Runs a catalogue of metric/dimension combinations through SEMANTIC_VIEW()
+- Captures compile and execution time from query history
+- Stores every run and flags regressions against a baseline per data scale
+"""
+
+from snowflake.snowpark import Session
+from typing import List, Dict, Optional
+from datetime import datetime
+import statistics
+import uuid
+import config
+from build_cache import create_cache_table
+
+# Representative agent questions as SAM_ANALYST_VIEW metric/dimension combinations
+SEMANTIC_BENCHMARK_QUERIES = [
+    {
+        'name': 'aum_by_portfolio',
+        'question': 'What is the total AUM of each portfolio?',
+        'metrics': ['TOTAL_MARKET_VALUE'],
+        'dimensions': ['PORTFOLIONAME']
+    },
+    {
+        'name': 'portfolio_value_history',
+        'question': 'How has the value of each portfolio changed over time?',
+        'metrics': ['TOTAL_MARKET_VALUE'],
+        'dimensions': ['PORTFOLIONAME', 'HOLDINGDATE']
+    },
+    {
+        'name': 'top_holdings',
+        'question': 'What are the top holdings in each portfolio?',
+        'metrics': ['TOTAL_MARKET_VALUE', 'PORTFOLIO_WEIGHT_PCT'],
+        'dimensions': ['PORTFOLIONAME', 'PRIMARYTICKER', 'DESCRIPTION']
+    },
+    {
+        'name': 'sector_exposure',
+        'question': 'What is the sector allocation of each portfolio?',
+        'metrics': ['PORTFOLIO_WEIGHT_PCT'],
+        'dimensions': ['PORTFOLIONAME', 'GICS_SECTOR']
+    },
+    {
+        'name': 'country_exposure',
+        'question': 'What is the country exposure of each portfolio?',
+        'metrics': ['PORTFOLIO_WEIGHT_PCT'],
+        'dimensions': ['PORTFOLIONAME', 'COUNTRYOFINCORPORATION']
+    },
+    {
+        'name': 'issuer_exposure',
+        'question': 'What is our total exposure to each issuer?',
+        'metrics': ['ISSUER_EXPOSURE'],
+        'dimensions': ['LEGALNAME']
+    },
+    {
+        'name': 'concentration_history',
+        'question': 'What is the largest position weight and number of holdings per portfolio over time?',
+        'metrics': ['MAX_POSITION_WEIGHT', 'HOLDING_COUNT'],
+        'dimensions': ['PORTFOLIONAME', 'HOLDINGDATE']
+    },
+    {
+        'name': 'asset_class_mix',
+        'question': 'What is the asset class mix by strategy?',
+        'metrics': ['TOTAL_MARKET_VALUE', 'HOLDING_COUNT'],
+        'dimensions': ['STRATEGY', 'ASSETCLASS']
+    },
+    {
+        'name': 'sector_value_history',
+        'question': 'How has our exposure to each sector changed over time?',
+        'metrics': ['TOTAL_MARKET_VALUE'],
+        'dimensions': ['GICS_SECTOR', 'HOLDINGDATE']
+    },
+    # Same questions answered from the pre-aggregated rollups
+    {
+        'name': 'rollup_top_holdings',
+        'question': 'What are the current top holdings in each portfolio?',
+        'metrics': ['LATEST_MARKET_VALUE', 'LATEST_WEIGHT_PCT'],
+        'dimensions': ['PORTFOLIONAME', 'PRIMARYTICKER', 'DESCRIPTION']
+    },
+    {
+        'name': 'rollup_sector_exposure',
+        'question': 'What is the sector allocation of each portfolio over time?',
+        'metrics': ['SECTOR_WEIGHT_PCT'],
+        'dimensions': ['PORTFOLIONAME', 'EXPOSURE_SECTOR', 'SECTOR_EXPOSURE_DATE']
+    },
+    {
+        'name': 'rollup_country_exposure',
+        'question': 'What is the country exposure of each portfolio over time?',
+        'metrics': ['COUNTRY_WEIGHT_PCT'],
+        'dimensions': ['PORTFOLIONAME', 'EXPOSURE_COUNTRY', 'COUNTRY_EXPOSURE_DATE']
+    },
+    {
+        'name': 'rollup_concentration_breaches',
+        'question': 'Which portfolios have concentration breaches or warnings?',
+        'metrics': ['BREACH_COUNT', 'WARNING_COUNT'],
+        'dimensions': ['PORTFOLIONAME']
+    }
+]
+
+def run_semantic_benchmark(session: Session, scale_label: str, update_baseline: bool = False) -> List[str]:
+    """
+    Benchmark SAM_ANALYST_VIEW and compare against the stored baseline.
+    
+    Args:
+        session: Active Snowpark session
+        scale_label: Data scale the build used (baselines are kept per scale)
+        update_baseline: If True, store this run as the new baseline
+    
+    Returns:
+        List[str]: Names of queries that regressed against the baseline
+    """
+    print(f"⏱️  Benchmarking SAM_ANALYST_VIEW ({len(SEMANTIC_BENCHMARK_QUERIES)} queries x {config.SEMANTIC_BENCHMARK_RUNS} runs, scale: {scale_label})...")
+    
+    create_benchmark_table(session)
+    position_rows = session.sql(f"SELECT COUNT(*) FROM {config.DATABASE_NAME}.CURATED.FACT_POSITION_DAILY_ABOR").collect()[0][0]
+    
+    # Time the queries, not the result cache
+    session.sql("ALTER SESSION SET USE_CACHED_RESULT = FALSE").collect()
+    try:
+        query_ids = {}
+        for query in SEMANTIC_BENCHMARK_QUERIES:
+            query_ids[query['name']] = []
+            for _ in range(config.SEMANTIC_BENCHMARK_RUNS):
+                session.sql(build_benchmark_query(query)).collect()
+                query_ids[query['name']].append(session.sql("SELECT LAST_QUERY_ID()").collect()[0][0])
+    finally:
+        session.sql("ALTER SESSION UNSET USE_CACHED_RESULT").collect()
+    
+    timings = get_query_timings(session, [qid for ids in query_ids.values() for qid in ids])
+    baseline = get_baseline(session, scale_label)
+    
+    run_id = str(uuid.uuid4())
+    run_timestamp = datetime.now()
+    results = []
+    regressions = []
+    
+    print(f"   {'Query':<26}{'Compile ms':>12}{'Exec ms':>10}{'Total ms':>10}{'Baseline':>10}{'Change':>9}")
+    for query in SEMANTIC_BENCHMARK_QUERIES:
+        name = query['name']
+        runs = [timings[qid] for qid in query_ids[name] if qid in timings]
+        if not runs:
+            print(f"   {name:<26}{'no query history':>51}")
+            continue
+        
+        compilation_ms = statistics.median(run['COMPILATION_TIME'] for run in runs)
+        execution_ms = statistics.median(run['EXECUTION_TIME'] for run in runs)
+        total_ms = statistics.median(run['TOTAL_ELAPSED_TIME'] for run in runs)
+        baseline_ms = baseline.get(name)
+        
+        change = ''
+        flag = ''
+        if baseline_ms:
+            change = f"{(total_ms - baseline_ms) / baseline_ms:+.0%}"
+            if is_regression(total_ms, baseline_ms):
+                regressions.append(name)
+                flag = ' ⚠️'
+        
+        baseline_text = f"{baseline_ms:.0f}" if baseline_ms else '-'
+        print(f"   {name:<26}{compilation_ms:>12.0f}{execution_ms:>10.0f}{total_ms:>10.0f}"
+              f"{baseline_text:>10}{change:>9}{flag}")
+        
+        results.append({
+            'RUN_ID': run_id,
+            'RUN_TIMESTAMP': run_timestamp,
+            'SCALE_LABEL': scale_label,
+            'POSITION_ROWS': position_rows,
+            'QUERY_NAME': name,
+            'RUNS': len(runs),
+            'COMPILATION_MS': compilation_ms,
+            'EXECUTION_MS': execution_ms,
+            'TOTAL_MS': total_ms,
+            # First run at a scale becomes the baseline for that scale
+            'IS_BASELINE': update_baseline or baseline_ms is None
+        })
+    
+    if results:
+        session.create_dataframe(results).write.mode("append").save_as_table(config.SEMANTIC_BENCHMARK_TABLE)
+    
+    if regressions:
+        print(f"⚠️  Semantic view regressions vs baseline: {', '.join(regressions)}")
+    else:
+        print("✅ No semantic view regressions vs baseline")
+    if update_baseline:
+        print(f"📌 Stored run {run_id} as the {scale_label} baseline")
+    
+    return regressions
+
+def build_benchmark_query(query: Dict) -> str:
+    """Build the SEMANTIC_VIEW() statement for a catalogue entry (rows are counted server-side)."""
+    return f"""
+        SELECT COUNT(*) FROM SEMANTIC_VIEW(
+            {config.DATABASE_NAME}.AI.SAM_ANALYST_VIEW
+            METRICS {', '.join(query['metrics'])}
+            DIMENSIONS {', '.join(query['dimensions'])}
+        )
+    """
+
+def is_regression(total_ms: float, baseline_ms: float) -> bool:
+    """A query regressed if it is slower than baseline by both the relative and absolute thresholds."""
+    slowdown_ms = total_ms - baseline_ms
+    return (slowdown_ms > baseline_ms * config.SEMANTIC_BENCHMARK_REGRESSION_THRESHOLD and
+            slowdown_ms > config.SEMANTIC_BENCHMARK_MIN_REGRESSION_MS)
+
+def get_query_timings(session: Session, query_ids: List[str]) -> Dict[str, Dict]:
+    """Read compile/execution times for this session's benchmark queries from query history."""
+    if not query_ids:
+        return {}
+    
+    id_list = ', '.join(f"'{qid}'" for qid in query_ids)
+    rows = session.sql(f"""
+        SELECT QUERY_ID, COMPILATION_TIME, EXECUTION_TIME, TOTAL_ELAPSED_TIME
+        FROM TABLE({config.DATABASE_NAME}.INFORMATION_SCHEMA.QUERY_HISTORY_BY_SESSION(RESULT_LIMIT => 10000))
+        WHERE QUERY_ID IN ({id_list})
+    """).collect()
+    return {row['QUERY_ID']: row.as_dict() for row in rows}
+
+def get_baseline(session: Session, scale_label: str) -> Dict[str, Optional[float]]:
+    """Latest baseline total time per query for a data scale."""
+    rows = session.sql(f"""
+        SELECT QUERY_NAME, TOTAL_MS
+        FROM {config.SEMANTIC_BENCHMARK_TABLE}
+        WHERE SCALE_LABEL = '{scale_label}' AND IS_BASELINE
+        QUALIFY ROW_NUMBER() OVER (PARTITION BY QUERY_NAME ORDER BY RUN_TIMESTAMP DESC) = 1
+    """).collect()
+    return {row['QUERY_NAME']: row['TOTAL_MS'] for row in rows}
+
+def create_benchmark_table(session: Session):
+    """Create the benchmark results table (in the cache database so baselines survive rebuilds)."""
+    create_cache_table(session, f"""
+        CREATE TABLE IF NOT EXISTS {config.SEMANTIC_BENCHMARK_TABLE} (
+            RUN_ID VARCHAR NOT NULL,
+            RUN_TIMESTAMP TIMESTAMP_NTZ NOT NULL,
+            SCALE_LABEL VARCHAR NOT NULL,
+            POSITION_ROWS NUMBER,
+            QUERY_NAME VARCHAR NOT NULL,
+            RUNS NUMBER,
+            COMPILATION_MS FLOAT,
+            EXECUTION_MS FLOAT,
+            TOTAL_MS FLOAT,
+            IS_BASELINE BOOLEAN
+        )
+    """)
@@ -11,7 +11,7 @@ from snowflake.snowpark import Session
 from typing import List
 import config
 
-def build_all(session: Session, scenarios: List[str], build_semantic: bool = True, build_search: bool = True):
+def build_all(session: Session, scenarios: List[str], build_semantic: bool = True, build_search: bool = True, incremental: bool = False):
     """
     Build AI components for the specified scenarios.
     
@@ -20,6 +20,7 @@ def build_all(session: Session, scenarios: List[str], build_semantic: bool = Tru
         scenarios: List of scenario names
         build_semantic: Whether to build semantic views
         build_search: Whether to build search services
+        incremental: Whether to keep existing search services (refreshed within TARGET_LAG)
     """
     print("🤖 Starting AI components build...")
     
@@ -29,7 +30,7 @@ def build_all(session: Session, scenarios: List[str], build_semantic: bool = Tru
     
     if build_search:
         print("🔍 Building Cortex Search services...")
-        create_search_services(session, scenarios)
+        create_search_services(session, scenarios, incremental)
     
     # Validate components
     print("✅ Validating AI components...")
@@ -60,12 +61,34 @@ CREATE OR REPLACE SEMANTIC VIEW {config.DATABASE_NAME}.AI.SAM_ANALYST_VIEW
 		ISSUERS AS {config.DATABASE_NAME}.CURATED.DIM_ISSUER
 			PRIMARY KEY (ISSUERID) 
 			WITH SYNONYMS=('issuers','entities','corporates') 
-			COMMENT='Issuer and corporate hierarchy data'
+			COMMENT='Issuer and corporate hierarchy data',
+		LATEST_HOLDINGS AS {config.DATABASE_NAME}.CURATED.POSITION_LATEST
+			PRIMARY KEY (PORTFOLIOID, SECURITYID) 
+			WITH SYNONYMS=('current_holdings','latest_positions','current_positions','top_holdings') 
+			COMMENT='Pre-aggregated positions as of the most recent holding date. Prefer this table for current or top holdings questions.',
+		SECTOR_EXPOSURE AS {config.DATABASE_NAME}.CURATED.PORTFOLIO_SECTOR_EXPOSURE
+			PRIMARY KEY (HOLDINGDATE, PORTFOLIOID, GICS_SECTOR) 
+			WITH SYNONYMS=('sector_allocation','sector_weights','sector_breakdown') 
+			COMMENT='Pre-aggregated sector exposure per portfolio and holding date. Prefer this table for sector weight questions.',
+		COUNTRY_EXPOSURE AS {config.DATABASE_NAME}.CURATED.PORTFOLIO_COUNTRY_EXPOSURE
+			PRIMARY KEY (HOLDINGDATE, PORTFOLIOID, COUNTRYOFINCORPORATION) 
+			WITH SYNONYMS=('country_allocation','country_weights','geographic_exposure') 
+			COMMENT='Pre-aggregated country exposure per portfolio and holding date. Prefer this table for country or regional weight questions.',
+		ISSUER_CONCENTRATION AS {config.DATABASE_NAME}.CURATED.PORTFOLIO_CONCENTRATION
+			PRIMARY KEY (PORTFOLIOID, ISSUERID) 
+			WITH SYNONYMS=('concentration','concentration_breaches','issuer_limits') 
+			COMMENT='Issuer weights on the latest holding date flagged against the 7% limit and 6.5% warning threshold. Prefer this table for concentration and breach questions.'
 	)
 	RELATIONSHIPS (
 		HOLDINGS_TO_PORTFOLIOS AS HOLDINGS(PORTFOLIOID) REFERENCES PORTFOLIOS(PORTFOLIOID),
 		HOLDINGS_TO_SECURITIES AS HOLDINGS(SECURITYID) REFERENCES SECURITIES(SECURITYID),
-		SECURITIES_TO_ISSUERS AS SECURITIES(ISSUERID) REFERENCES ISSUERS(ISSUERID)
+		SECURITIES_TO_ISSUERS AS SECURITIES(ISSUERID) REFERENCES ISSUERS(ISSUERID),
+		LATEST_HOLDINGS_TO_PORTFOLIOS AS LATEST_HOLDINGS(PORTFOLIOID) REFERENCES PORTFOLIOS(PORTFOLIOID),
+		LATEST_HOLDINGS_TO_SECURITIES AS LATEST_HOLDINGS(SECURITYID) REFERENCES SECURITIES(SECURITYID),
+		SECTOR_EXPOSURE_TO_PORTFOLIOS AS SECTOR_EXPOSURE(PORTFOLIOID) REFERENCES PORTFOLIOS(PORTFOLIOID),
+		COUNTRY_EXPOSURE_TO_PORTFOLIOS AS COUNTRY_EXPOSURE(PORTFOLIOID) REFERENCES PORTFOLIOS(PORTFOLIOID),
+		ISSUER_CONCENTRATION_TO_PORTFOLIOS AS ISSUER_CONCENTRATION(PORTFOLIOID) REFERENCES PORTFOLIOS(PORTFOLIOID),
+		ISSUER_CONCENTRATION_TO_ISSUERS AS ISSUER_CONCENTRATION(ISSUERID) REFERENCES ISSUERS(ISSUERID)
 	)
 	DIMENSIONS (
 		-- Portfolio dimensions
@@ -83,7 +106,15 @@ CREATE OR REPLACE SEMANTIC VIEW {config.DATABASE_NAME}.AI.SAM_ANALYST_VIEW
 		ISSUERS.COUNTRYOFINCORPORATION AS CountryOfIncorporation WITH SYNONYMS=('domicile','country_of_risk','country') COMMENT='Country of incorporation',
 		
 		-- Time dimensions
-		HOLDINGS.HOLDINGDATE AS HoldingDate WITH SYNONYMS=('position_date','as_of_date','date') COMMENT='Holdings as-of date'
+		HOLDINGS.HOLDINGDATE AS HoldingDate WITH SYNONYMS=('position_date','as_of_date','date') COMMENT='Holdings as-of date',
+		
+		-- Rollup dimensions (pre-aggregated tables)
+		LATEST_HOLDINGS.LATEST_HOLDING_DATE AS HoldingDate WITH SYNONYMS=('current_date','latest_date') COMMENT='Most recent holding date of each portfolio',
+		SECTOR_EXPOSURE.SECTOR_EXPOSURE_DATE AS HoldingDate COMMENT='Holding date of the sector exposure',
+		SECTOR_EXPOSURE.EXPOSURE_SECTOR AS GICS_Sector WITH SYNONYMS=('exposure_sector','allocation_sector') COMMENT='GICS sector of the exposure',
+		COUNTRY_EXPOSURE.COUNTRY_EXPOSURE_DATE AS HoldingDate COMMENT='Holding date of the country exposure',
+		COUNTRY_EXPOSURE.EXPOSURE_COUNTRY AS CountryOfIncorporation WITH SYNONYMS=('exposure_country','allocation_country') COMMENT='Country of incorporation of the exposure',
+		ISSUER_CONCENTRATION.CONCENTRATION_STATUS AS ConcentrationStatus WITH SYNONYMS=('breach_status','compliance_status') COMMENT='BREACH above 7%, WARNING above 6.5%, otherwise OK'
 	)
 	METRICS (
 		-- Core position metrics
@@ -98,7 +129,19 @@ CREATE OR REPLACE SEMANTIC VIEW {config.DATABASE_NAME}.AI.SAM_ANALYST_VIEW
 		HOLDINGS.ISSUER_EXPOSURE AS SUM(MarketValue_Base) WITH SYNONYMS=('issuer_total','issuer_value','issuer_exposure') COMMENT='Total exposure to issuer across all securities',
 		
 		-- Concentration metrics
-		HOLDINGS.MAX_POSITION_WEIGHT AS MAX(PortfolioWeight) WITH SYNONYMS=('largest_position','max_weight','concentration') COMMENT='Largest single position weight'
+		HOLDINGS.MAX_POSITION_WEIGHT AS MAX(PortfolioWeight) WITH SYNONYMS=('largest_position','max_weight','concentration') COMMENT='Largest single position weight',
+		
+		-- Rollup metrics (pre-aggregated tables)
+		LATEST_HOLDINGS.LATEST_MARKET_VALUE AS SUM(MarketValue_Base) WITH SYNONYMS=('current_market_value','current_aum') COMMENT='Market value on the latest holding date',
+		LATEST_HOLDINGS.LATEST_WEIGHT_PCT AS SUM(PortfolioWeight) * 100 WITH SYNONYMS=('current_weight','current_weight_percent') COMMENT='Portfolio weight on the latest holding date as percentage',
+		LATEST_HOLDINGS.LATEST_HOLDING_COUNT AS COUNT(SecurityID) WITH SYNONYMS=('current_position_count') COMMENT='Number of positions on the latest holding date',
+		SECTOR_EXPOSURE.SECTOR_WEIGHT_PCT AS SUM(PortfolioWeight) * 100 WITH SYNONYMS=('sector_weight','sector_allocation_percent') COMMENT='Sector weight as percentage',
+		SECTOR_EXPOSURE.SECTOR_MARKET_VALUE AS SUM(MarketValue_Base) WITH SYNONYMS=('sector_exposure_value') COMMENT='Sector market value in base currency',
+		COUNTRY_EXPOSURE.COUNTRY_WEIGHT_PCT AS SUM(PortfolioWeight) * 100 WITH SYNONYMS=('country_weight','country_allocation_percent') COMMENT='Country weight as percentage',
+		COUNTRY_EXPOSURE.COUNTRY_MARKET_VALUE AS SUM(MarketValue_Base) WITH SYNONYMS=('country_exposure_value') COMMENT='Country market value in base currency',
+		ISSUER_CONCENTRATION.ISSUER_WEIGHT_PCT AS SUM(IssuerWeight) * 100 WITH SYNONYMS=('issuer_weight','issuer_concentration') COMMENT='Issuer weight on the latest holding date as percentage',
+		ISSUER_CONCENTRATION.BREACH_COUNT AS SUM(IFF(ConcentrationStatus = 'BREACH', 1, 0)) WITH SYNONYMS=('breaches','number_of_breaches') COMMENT='Issuers above the 7% concentration limit',
+		ISSUER_CONCENTRATION.WARNING_COUNT AS SUM(IFF(ConcentrationStatus = 'WARNING', 1, 0)) WITH SYNONYMS=('warnings','number_of_warnings') COMMENT='Issuers above the 6.5% warning threshold'
 	)
 	COMMENT='Multi-asset semantic view for portfolio analytics with issuer hierarchy support';
         """).collect()
@@ -191,8 +234,15 @@ CREATE OR REPLACE SEMANTIC VIEW {config.DATABASE_NAME}.AI.SAM_RESEARCH_VIEW
     
     print("✅ Created semantic view: SAM_RESEARCH_VIEW")
 
-def create_search_services(session: Session, scenarios: List[str]):
-    """Create Cortex Search services for required document types."""
+def create_search_services(session: Session, scenarios: List[str], incremental: bool = False):
+    """
+    Create Cortex Search services for required document types.
+    
+    In incremental mode an existing service is left in place: its corpus is
+    only ever appended to or deleted from, so the service picks up changes
+    through change tracking within CORTEX_SEARCH_TARGET_LAG instead of
+    rebuilding its index from scratch.
+    """
     
     # Determine required document types from scenarios
     required_doc_types = set()
@@ -215,8 +265,9 @@ def create_search_services(session: Session, scenarios: List[str]):
                 
                 # Create enhanced Cortex Search service with SecurityID and IssuerID attributes
                 # Using configurable TARGET_LAG for demo environments to see changes quickly
+                create_clause = 'CREATE CORTEX SEARCH SERVICE IF NOT EXISTS' if incremental else 'CREATE OR REPLACE CORTEX SEARCH SERVICE'
                 session.sql(f"""
-                    CREATE OR REPLACE CORTEX SEARCH SERVICE {config.DATABASE_NAME}.AI.{service_name}
+                    {create_clause} {config.DATABASE_NAME}.AI.{service_name}
                         ON DOCUMENT_TEXT
                         ATTRIBUTES DOCUMENT_TITLE, SecurityID, IssuerID, DOCUMENT_TYPE, PUBLISH_DATE, LANGUAGE
                         WAREHOUSE = {search_warehouse}
@@ -234,7 +285,10 @@ def create_search_services(session: Session, scenarios: List[str]):
                         FROM {corpus_table}
                 """).collect()
                 
-                print(f"✅ Created search service: {service_name}")
+                if incremental:
+                    print(f"✅ Search service ready (refreshes within {CORTEX_SEARCH_TARGET_LAG}): {service_name}")
+                else:
+                    print(f"✅ Created search service: {service_name}")
                 
             except Exception as e:
                 print(f"❌ Failed to create search service {service_name}: {e}")
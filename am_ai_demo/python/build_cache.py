@@ -0,0 +1,29 @@
+"""
+Cache Database for SAM Demo
+
+Tables that must survive rebuilds and restores of SAM_DEMO (completion cache,
+semantic view benchmarks, snapshot manifests) live in CACHE_DATABASE_NAME.
+"""
+
+from snowflake.snowpark import Session
+import config
+
+def create_cache_table(session: Session, create_table_sql: str):
+    """
+    Create the cache database if needed and run a CREATE TABLE statement for it.
+
+    CREATE DATABASE switches the session's current database, so the current
+    database and schema are restored afterwards.
+
+    Args:
+        session: Active Snowpark session
+        create_table_sql: CREATE TABLE IF NOT EXISTS statement with a fully-qualified table name
+    """
+    current_database = session.get_current_database()
+    current_schema = session.get_current_schema()
+    session.sql(f"CREATE DATABASE IF NOT EXISTS {config.CACHE_DATABASE_NAME}").collect()
+    session.sql(create_table_sql).collect()
+    if current_database:
+        session.use_database(current_database)
+    if current_schema:
+        session.use_schema(current_schema)
@@ -0,0 +1,94 @@
+"""
+Query-Tagged Build Profiling for SAM Demo
+
+This module tags every build query and reports where the time goes:
+- Structured QUERY_TAG (run, step, scenarios, scale) for each builder
+- Hot-spot report of elapsed time, bytes scanned, spill and estimated
+  credits per step, read back from query history for the build's tags
+"""
+
+from snowflake.snowpark import Session
+from typing import List, Dict
+import json
+import uuid
+import config
+
+# Warehouse credits per hour by size (used to estimate per-query compute credits)
+WAREHOUSE_CREDITS_PER_HOUR = {
+    'X-Small': 1, 'Small': 2, 'Medium': 4, 'Large': 8, 'X-Large': 16,
+    '2X-Large': 32, '3X-Large': 64, '4X-Large': 128, '5X-Large': 256, '6X-Large': 512
+}
+
+# Run context shared by all query tags of this build
+_query_tag_context = {}
+
+def start_build_run(scenarios: List[str], scale: float) -> str:
+    """
+    Start a tagged build run.
+    
+    Args:
+        scenarios: Scenarios being built
+        scale: Build scale factor
+    
+    Returns:
+        str: Run ID carried in every query tag of this build
+    """
+    run_id = str(uuid.uuid4())
+    _query_tag_context.clear()
+    _query_tag_context.update({
+        'app': config.QUERY_TAG_APPLICATION,
+        'run': run_id,
+        'scenarios': scenarios,
+        'scale': scale
+    })
+    return run_id
+
+def get_query_tag(step: str) -> str:
+    """Structured QUERY_TAG (JSON) for a build step."""
+    return json.dumps({**_query_tag_context, 'step': step}, separators=(',', ':'))
+
+def get_statement_params(step: str) -> Dict[str, str]:
+    """Per-statement query tag, for steps that run concurrently on the shared session."""
+    return {'QUERY_TAG': get_query_tag(step)}
+
+def print_profile_report(session: Session, run_id: str):
+    """
+    Print a ranked hot-spot table of this build's tagged queries.
+    
+    Elapsed time, bytes scanned and spill come from query history; compute credits
+    are estimated from execution time and warehouse size.
+    """
+    
+    credits_case = "CASE WAREHOUSE_SIZE " + " ".join(
+        f"WHEN '{size}' THEN {credits}" for size, credits in WAREHOUSE_CREDITS_PER_HOUR.items()
+    ) + " ELSE 0 END"
+    
+    rows = session.sql(f"""
+        SELECT
+            TRY_PARSE_JSON(QUERY_TAG):step::VARCHAR as STEP,
+            COUNT(*) as QUERIES,
+            SUM(TOTAL_ELAPSED_TIME) / 1000 as ELAPSED_S,
+            MAX(TOTAL_ELAPSED_TIME) / 1000 as SLOWEST_QUERY_S,
+            SUM(BYTES_SCANNED) / POWER(1024, 3) as SCANNED_GB,
+            SUM(BYTES_SPILLED_TO_LOCAL_STORAGE + BYTES_SPILLED_TO_REMOTE_STORAGE) / POWER(1024, 3) as SPILLED_GB,
+            SUM(EXECUTION_TIME / 3600000 * {credits_case}) + SUM(CREDITS_USED_CLOUD_SERVICES) as EST_CREDITS
+        FROM TABLE({config.DATABASE_NAME}.INFORMATION_SCHEMA.QUERY_HISTORY_BY_SESSION(RESULT_LIMIT => 10000))
+        WHERE TRY_PARSE_JSON(QUERY_TAG):run::VARCHAR = '{run_id}'
+        GROUP BY STEP
+        ORDER BY ELAPSED_S DESC
+    """).collect()
+    
+    if not rows:
+        print("⚠️  No tagged queries found in query history for this build")
+        return
+    
+    total_elapsed = sum(row['ELAPSED_S'] for row in rows) or 1
+    print(f"🔥 Build hot spots (QUERY_TAG run {run_id}):")
+    print(f"   {'Step':<34}{'Queries':>8}{'Elapsed s':>11}{'Share':>7}{'Slowest s':>11}{'Scanned GB':>12}{'Spilled GB':>12}{'Est. credits':>14}")
+    for row in rows[:config.PROFILE_TOP_STEPS]:
+        spill_flag = ' ⚠️' if row['SPILLED_GB'] else ''
+        print(f"   {row['STEP'] or '(untagged step)':<34}{row['QUERIES']:>8}{row['ELAPSED_S']:>11.1f}"
+              f"{row['ELAPSED_S'] / total_elapsed:>7.0%}{row['SLOWEST_QUERY_S']:>11.1f}"
+              f"{row['SCANNED_GB']:>12.2f}{row['SPILLED_GB']:>12.2f}{row['EST_CREDITS']:>14.3f}{spill_flag}")
+    if len(rows) > config.PROFILE_TOP_STEPS:
+        print(f"   ... {len(rows) - config.PROFILE_TOP_STEPS} more steps")
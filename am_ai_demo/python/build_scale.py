@@ -0,0 +1,128 @@
+"""
+Build Scaling and Throughput Reporting for SAM Demo
+
+This module sizes a build from a single scale factor and reports throughput:
+- Scales securities, portfolios, years of history and document counts together
+- Times each builder and counts the rows it produced
+- Prints a rows / seconds / rows-per-second table at the end of the build
+"""
+
+from snowflake.snowpark import Session
+from contextlib import contextmanager
+from typing import List, Dict
+import time
+import config
+from build_profile import get_query_tag
+
+def get_scale_settings(scale: float) -> Dict:
+    """
+    Derive build volumes from a scale factor (1.0 = full demo volumes).
+    
+    Args:
+        scale: Multiplier applied to the full demo volumes
+    
+    Returns:
+        dict: securities_count, portfolios, years_of_history and unstructured_counts
+    """
+    if scale <= 0:
+        raise Exception(f"Scale must be positive, got {scale}")
+    
+    # Securities scale linearly (capped by the real assets available)
+    securities_count = {
+        asset_type: max(1, int(count * scale))
+        for asset_type, count in config.SECURITIES_COUNT.items()
+    }
+    
+    # Portfolios scale linearly, keeping the demo scenario portfolios; extra portfolios reuse the lineup
+    lineup = config.PORTFOLIO_LINEUP
+    portfolio_count = max(config.SCALE_MIN_PORTFOLIOS, round(len(lineup) * scale))
+    portfolios = []
+    for i in range(portfolio_count):
+        portfolio = dict(lineup[i % len(lineup)])
+        series = i // len(lineup) + 1
+        if series > 1:
+            portfolio['name'] = f"{portfolio['name']} {series}"
+        portfolios.append(portfolio)
+    
+    years_of_history = max(config.SCALE_MIN_YEARS_OF_HISTORY, round(config.YEARS_OF_HISTORY * scale))
+    
+    # Coverage (securities per document type) scales with the factor in generate_prompts;
+    # documents per security only shrink, so document volume stays linear in scale
+    unstructured_counts = {
+        doc_type: max(1, round(count * min(scale, 1.0)))
+        for doc_type, count in config.UNSTRUCTURED_COUNTS.items()
+    }
+    
+    return {
+        'scale': scale,
+        'securities_count': securities_count,
+        'portfolios': portfolios,
+        'years_of_history': years_of_history,
+        'unstructured_counts': unstructured_counts
+    }
+
+def print_scale_settings(scale_settings: Dict):
+    """Print the volumes a scale factor resolves to."""
+    securities = scale_settings['securities_count']
+    print(f"📐 Scale {scale_settings['scale']:g}: "
+          f"{securities['equities']:,} equities, {securities['bonds']:,} bonds, {securities['etfs']:,} ETFs, "
+          f"{len(scale_settings['portfolios'])} portfolios, {scale_settings['years_of_history']} years of history")
+
+@contextmanager
+def time_builder(session: Session, build_stats: List[Dict], builder: str, tables: List[str] = None):
+    """
+    Time a builder and record the rows in the tables it produced.
+    
+    Queries run inside the block carry the builder's QUERY_TAG.
+    
+    Args:
+        session: Active Snowpark session
+        build_stats: List the measurement is appended to
+        builder: Name shown in the throughput report
+        tables: Tables written by the builder (schema-qualified within DATABASE_NAME)
+    """
+    previous_tag = session.query_tag
+    session.query_tag = get_query_tag(builder)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        session.query_tag = previous_tag
+    record_builder(session, build_stats, builder, time.perf_counter() - start, tables)
+
+def record_builder(session: Session, build_stats: List[Dict], builder: str, seconds: float, tables: List[str] = None):
+    """Record a builder's elapsed time and the rows in the tables it produced."""
+    rows = None
+    if tables:
+        rows = 0
+        for table in tables:
+            rows += session.sql(f"SELECT COUNT(*) FROM {config.DATABASE_NAME}.{table}").collect()[0][0]
+    
+    build_stats.append({'builder': builder, 'rows': rows, 'seconds': seconds})
+
+def print_throughput_report(build_stats: List[Dict], total_seconds: float):
+    """
+    Print rows produced, seconds and rows/second per builder.
+    
+    Args:
+        build_stats: Measurements recorded by time_builder / record_builder
+        total_seconds: Wall-clock build time (document types run concurrently, so
+            per-builder seconds can add up to more than this)
+    """
+    if not build_stats:
+        return
+    
+    print("📈 Build throughput:")
+    print(f"   {'Builder':<34}{'Rows':>14}{'Seconds':>10}{'Rows/sec':>12}")
+    total_rows = 0
+    for stat in build_stats:
+        rows, seconds = stat['rows'], stat['seconds']
+        if rows is None:
+            print(f"   {stat['builder']:<34}{'-':>14}{seconds:>10.1f}{'-':>12}")
+            continue
+        total_rows += rows
+        rate = rows / seconds if seconds > 0 else 0
+        print(f"   {stat['builder']:<34}{rows:>14,}{seconds:>10.1f}{rate:>12,.0f}")
+    
+    total_rate = total_rows / total_seconds if total_seconds > 0 else 0
+    print(f"   {'Total':<34}{total_rows:>14,}{total_seconds:>10.1f}{total_rate:>12,.0f}")
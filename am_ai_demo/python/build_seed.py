@@ -0,0 +1,53 @@
+"""
+Deterministic Seeding for SAM Demo
+
+This module makes every generated table a pure function of config and RNG_SEED:
+- Derives a seed per table from RNG_SEED, so tables can be built in any order or in parallel
+- Replaces RANDOM() with a hash of the table seed, the draw name and the row's keys,
+  so a row gets the same draws however the warehouse partitions the query
+- Anchors generated history on DATA_AS_OF_DATE, resolved once per build when it is not pinned
+"""
+
+import hashlib
+from datetime import date
+import config
+
+def get_table_seed(table: str) -> int:
+    """Seed for a table, derived from RNG_SEED and the table name (stable across processes)."""
+    digest = hashlib.sha256(f"{config.RNG_SEED}:{table}".encode()).hexdigest()
+    return int(digest[:15], 16)  # 60 bits: fits a Snowflake NUMBER literal and a BIGINT
+
+def seeded_random(table: str, draw: str, *keys: str) -> str:
+    """
+    SQL expression replacing RANDOM() for one draw in a table.
+    
+    Use it as the generator argument of UNIFORM() or as a random sort key.
+    
+    Args:
+        table: Table the draw is generated for (selects the table seed)
+        draw: Name of the draw, so draws on the same row are independent
+        keys: SQL expressions that identify the row (e.g. 'SecurityID', 'PriceDate')
+    
+    Returns:
+        str: 64-bit integer SQL expression
+    """
+    return f"HASH({get_table_seed(table)}, '{draw}', {', '.join(keys)})"
+
+def resolve_as_of_date() -> str:
+    """
+    Date the generated history ends on, as an ISO string.
+    
+    An unpinned DATA_AS_OF_DATE is fixed to the build day on first use, so every
+    table, prompt and manifest in a build agrees on it even across midnight.
+    """
+    if not config.DATA_AS_OF_DATE:
+        config.DATA_AS_OF_DATE = date.today().isoformat()
+    return config.DATA_AS_OF_DATE
+
+def get_as_of_date_sql() -> str:
+    """SQL date the generated history ends on (see resolve_as_of_date)."""
+    return f"'{resolve_as_of_date()}'::DATE"
+
+def get_as_of_date() -> date:
+    """Python date the generated history ends on, for values built client-side (see resolve_as_of_date)."""
+    return date.fromisoformat(resolve_as_of_date())
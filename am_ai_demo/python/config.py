@@ -5,7 +5,8 @@ All configuration constants for the SAM AI demo using CAPS naming convention.
 
 # Connection and execution
 DEFAULT_CONNECTION_NAME = 'sfseeurope-mstellwall-aws-us-west3'
-RNG_SEED = 42
+RNG_SEED = 42  # Every random draw in generated tables derives from this seed (see build_seed.py)
+DATA_AS_OF_DATE = '2025-09-30'  # Anchor date for generated history (bump when refreshing the demo); None = the build day, resolved once per build
 
 # Warehouse configuration
 EXECUTION_WAREHOUSE = 'SAM_DEMO_EXECUTION_WH'  # For data generation and code execution
@@ -15,10 +16,23 @@ WAREHOUSE_SIZE = 'MEDIUM'  # Warehouse size for both
 # Cortex Search configuration
 CORTEX_SEARCH_TARGET_LAG = '5 minutes'  # How often search indexes refresh (use shorter for demos)
 
+# Holdings rollup dynamic tables (pre-aggregated for the SAM agent's hot queries)
+ROLLUP_TARGET_LAG = '1 hour'  # How far rollups may trail FACT_POSITION_DAILY_ABOR
+
+# Build profiling (every build query carries a JSON QUERY_TAG with run, step, scenarios and scale)
+QUERY_TAG_APPLICATION = 'SAM_DEMO_BUILD'
+PROFILE_TOP_STEPS = 20  # Steps shown in the --profile hot-spot report
+
 # Data generation parameters
 YEARS_OF_HISTORY = 5
 MODEL_NAME = 'llama3.1-70b'  # Configurable, single model for all generation
 
+# Cortex Complete generation settings
+GENERATION_CONCURRENCY = 4  # Document types generated concurrently
+COMPLETION_MAX_ATTEMPTS = 3  # Attempts per prompt before leaving it for the next run
+COMPLETION_RETRY_BACKOFF_SECONDS = 5  # Doubles on each retry
+COMPLETION_POLL_INTERVAL_SECONDS = 1  # How often running completion jobs are checked
+
 # Enhanced data model settings
 USE_TRANSACTION_BASED_MODEL = True
 GENERATE_CORPORATE_HIERARCHIES = True
@@ -36,14 +50,12 @@ PROVIDER_MIX = {'NSD': 0.5, 'PLM': 0.5}
 # Data volumes (real assets only) - based on available real data capacity
 SECURITIES_COUNT = {'equities': 10000, 'bonds': 3000, 'etfs': 1000}  # All real assets from OpenFIGI dataset
 
-# Test mode configuration (10% of full data for faster development testing)
+# Build scaling (--scale multiplies full volumes; --test-mode is --scale TEST_MODE_MULTIPLIER)
 TEST_MODE_MULTIPLIER = 0.1
-TEST_SECURITIES_COUNT = {
-    'equities': int(SECURITIES_COUNT['equities'] * TEST_MODE_MULTIPLIER),    # 1000
-    'bonds': int(SECURITIES_COUNT['bonds'] * TEST_MODE_MULTIPLIER),          # 300  
-    'etfs': int(SECURITIES_COUNT['etfs'] * TEST_MODE_MULTIPLIER)             # 100
-}
-UNSTRUCTURED_COUNTS = {
+SCALE_MIN_PORTFOLIOS = 3  # Keep the demo scenario portfolios (first in PORTFOLIO_LINEUP) at small scales
+SCALE_MIN_YEARS_OF_HISTORY = 1
+
+UNSTRUCTURED_COUNTS = {  # Reduced proportionally below scale 1
     'broker_research': 3,      # Per equity
     'earnings_transcripts': 2, # Per equity (summary + Q&A)
     'press_releases': 1,       # Per equity
@@ -54,16 +66,13 @@ UNSTRUCTURED_COUNTS = {
     'philosophy_docs': 3      # Fixed set
 }
 
-# Test mode unstructured counts (reduced for faster testing)
-TEST_UNSTRUCTURED_COUNTS = {
-    'broker_research': 1,      # 1 per equity (vs 3)
-    'earnings_transcripts': 1, # 1 per equity (vs 2)
-    'press_releases': 1,       # 1 per equity (same)
-    'ngo_reports': 1,         # 1 per issuer (vs 2)
-    'engagement_notes': 1,     # 1 per issuer (same)
-    'policy_docs': 3,         # 3 docs (vs 8)
-    'sales_templates': 1,     # 1 template (vs 2)
-    'philosophy_docs': 1      # 1 doc (vs 3)
+# Securities covered per document type (multiplied by the build scale)
+UNSTRUCTURED_COVERAGE = {
+    'broker_research': 400,
+    'earnings_transcripts': 400,
+    'press_releases': 800,
+    'ngo_reports': 250,
+    'engagement_notes': 150
 }
 
 # Portfolio configuration
@@ -160,6 +169,21 @@ SCHEMAS = {
     'AI': 'AI'
 }
 
+# Persistent completion cache (separate database so it survives CREATE OR REPLACE DATABASE)
+CACHE_DATABASE_NAME = 'SAM_DEMO_CACHE'
+COMPLETION_CACHE_TABLE = f'{CACHE_DATABASE_NAME}.PUBLIC.COMPLETION_CACHE'  # Keyed by prompt hash + MODEL_NAME
+
+# Semantic view benchmark (results and baselines are kept in the cache database)
+SEMANTIC_BENCHMARK_TABLE = f'{CACHE_DATABASE_NAME}.PUBLIC.SEMANTIC_BENCHMARK_RESULTS'
+SEMANTIC_BENCHMARK_RUNS = 3  # Timed runs per query (median is compared with the baseline)
+SEMANTIC_BENCHMARK_REGRESSION_THRESHOLD = 0.25  # Flag queries more than 25% slower than baseline
+SEMANTIC_BENCHMARK_MIN_REGRESSION_MS = 250  # Ignore slowdowns below this (warehouse noise)
+
+# Snapshots (zero-copy clones of DATABASE_NAME; manifests are kept in the cache database)
+SNAPSHOT_DATABASE_PREFIX = f'{DATABASE_NAME}_SNAPSHOT_'  # Snapshot NAME is cloned to SAM_DEMO_SNAPSHOT_<NAME>
+SNAPSHOT_MANIFEST_TABLE = f'{CACHE_DATABASE_NAME}.PUBLIC.SNAPSHOT_MANIFEST'
+BUILD_MANIFEST_TABLE = f'{DATABASE_NAME}.PUBLIC.BUILD_MANIFEST'  # Effective config of the last data build (cloned with the data)
+
 # Get the directory where this config.py file is located
 import os
 CONFIG_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -170,6 +194,14 @@ PROJECT_ROOT = os.path.dirname(CONFIG_DIR)
 EXTRACT_REAL_ASSETS = False  # Set to True to extract real assets from Snowflake Marketplace
 REAL_ASSETS_CSV_PATH = os.path.join(PROJECT_ROOT, 'data', 'real_assets.csv')  # Always in project/data/
 USE_REAL_ASSETS_CSV = True  # Set to True to use existing CSV instead of generating fake data
+REAL_ASSETS_PARQUET_PATH = os.path.join(PROJECT_ROOT, 'data', 'real_assets')  # Partitioned Parquet dataset (preferred over CSV)
+REAL_ASSETS_PARTITION_COLUMNS = ['MARKET_REGION', 'ASSET_CATEGORY']
+REAL_ASSETS_PARQUET_COMPRESSION = 'zstd'
+REAL_ASSETS_CACHE_PATH = os.path.join(PROJECT_ROOT, 'data', 'real_assets.arrow')  # Memory-mapped Arrow cache with lookup offsets (rebuilt when stale)
+
+# Local offline backend (python main.py --local): structured builders run on DuckDB and write Parquet
+LOCAL_DATABASE_PATH = os.path.join(PROJECT_ROOT, 'data', 'local', f'{DATABASE_NAME}.duckdb')  # File name sets the catalog name
+LOCAL_PARQUET_PATH = os.path.join(PROJECT_ROOT, 'data', 'local', 'parquet')  # One Parquet file per table
 
 # Market data settings (synthetic only - see bottom of file for final configuration)
 
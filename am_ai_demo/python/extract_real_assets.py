@@ -7,14 +7,47 @@ using the OpenFIGI standard to get authentic tickers for equities, corporate bon
 
 from snowflake.snowpark import Session
 import os
+import shutil
 import config
 
-def extract_real_assets_to_csv(session: Session):
+# Columns returned by the OpenFIGI extraction query (all VARCHAR in Snowflake)
+REAL_ASSETS_COLUMNS = [
+    'MARKET_REGION',
+    'ASSET_CATEGORY',
+    'ISSUER_NAME',
+    'INDUSTRY_SECTOR',
+    'TOP_LEVEL_OPENFIGI_ID',
+    'SECURITY_NAME',
+    'PRIMARY_TICKER',
+    'PRIMARY_EXCHANGE_CODE',
+    'PRIMARY_EXCHANGE_NAME',
+    'COUNTRY_OF_DOMICILE',
+    'EXCHANGE_CODES'
+]
+
+def get_real_assets_arrow_schema():
+    """Fixed Arrow schema so every streamed batch writes identical Parquet files."""
+    import pyarrow as pa
+    return pa.schema([(column, pa.string()) for column in REAL_ASSETS_COLUMNS])
+
+def get_real_assets_partitioning():
+    """Hive partitioning on MARKET_REGION/ASSET_CATEGORY (values are URI-encoded, e.g. APAC%2FEM)."""
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    return ds.partitioning(
+        pa.schema([(column, pa.string()) for column in config.REAL_ASSETS_PARTITION_COLUMNS]),
+        flavor='hive'
+    )
+
+def extract_real_assets_to_parquet(session: Session):
     """
-    Extract real asset data from Snowflake Marketplace and save to CSV.
+    Extract real asset data from Snowflake Marketplace into a partitioned Parquet dataset.
     
     Uses the comprehensive SQL query from asset_masterdata_guide.md to get
     real tickers for USA, EU, and APAC/EM markets across all asset classes.
+    Result batches are streamed with to_pandas_batches() and appended to a
+    compressed dataset partitioned by MARKET_REGION and ASSET_CATEGORY, so
+    memory stays bounded by one batch rather than the full universe.
     
     Args:
         session: Active Snowpark session with access to Marketplace data
@@ -146,35 +179,243 @@ ORDER BY
     """
     
     try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
         # Execute the query to get real asset data
         print("🔍 Querying Snowflake Marketplace for real asset data...")
         result_df = session.sql(real_assets_query)
         
-        # Convert to pandas for CSV export
-        pandas_df = result_df.to_pandas()
+        # Write into a sibling directory; the previous extract is only replaced once the write succeeds
+        dataset_path = config.REAL_ASSETS_PARQUET_PATH
+        staging_path = f"{dataset_path}.tmp"
+        if os.path.exists(staging_path):
+            shutil.rmtree(staging_path)
+        os.makedirs(staging_path)
         
-        # Create data directory if it doesn't exist
-        os.makedirs(os.path.dirname(config.REAL_ASSETS_CSV_PATH), exist_ok=True)
+        schema = get_real_assets_arrow_schema()
+        partitioning = get_real_assets_partitioning()
+        total_rows = 0
+        distribution = {}
         
-        # Save to CSV
-        pandas_df.to_csv(config.REAL_ASSETS_CSV_PATH, index=False)
+        # Stream result batches straight into the partitioned dataset
+        for batch_num, batch_df in enumerate(result_df.to_pandas_batches()):
+            batch_df = batch_df[REAL_ASSETS_COLUMNS].astype(object).where(batch_df[REAL_ASSETS_COLUMNS].notna(), None)
+            batch_table = pa.Table.from_pandas(batch_df, schema=schema, preserve_index=False)
+            
+            pq.write_to_dataset(
+                batch_table,
+                root_path=staging_path,
+                partitioning=partitioning,
+                basename_template=f"part-{batch_num:05d}-{{i}}.parquet",
+                existing_data_behavior='overwrite_or_ignore',
+                compression=config.REAL_ASSETS_PARQUET_COMPRESSION
+            )
+            
+            total_rows += len(batch_df)
+            for key, count in batch_df.groupby(['MARKET_REGION', 'ASSET_CATEGORY']).size().items():
+                distribution[key] = distribution.get(key, 0) + int(count)
+            print(f"  📦 Batch {batch_num + 1}: {len(batch_df):,} rows (total {total_rows:,})")
         
-        print(f"✅ Extracted {len(pandas_df)} real assets to {config.REAL_ASSETS_CSV_PATH}")
+        # Swap the new dataset in (directories can't be replaced atomically, so move the old one aside first)
+        previous_path = f"{dataset_path}.old"
+        if os.path.exists(previous_path):
+            shutil.rmtree(previous_path)
+        if os.path.exists(dataset_path):
+            os.rename(dataset_path, previous_path)
+        os.rename(staging_path, dataset_path)
+        if os.path.exists(previous_path):
+            shutil.rmtree(previous_path)
+        
+        print(f"✅ Extracted {total_rows} real assets to {dataset_path}")
         
         # Show distribution summary
-        distribution = pandas_df.groupby(['MARKET_REGION', 'ASSET_CATEGORY']).size().reset_index(name='COUNT')
         print("\n📊 Real Asset Distribution:")
-        for _, row in distribution.iterrows():
-            print(f"  {row['MARKET_REGION']} {row['ASSET_CATEGORY']}: {row['COUNT']:,}")
+        for (region, category), count in sorted(distribution.items()):
+            print(f"  {region} {category}: {count:,}")
             
         return True
         
     except Exception as e:
         print(f"❌ Failed to extract real assets: {e}")
         print("Note: This requires access to FINANCIALS_ECONOMICS_ENTERPRISE.CYBERSYN database")
-        print("Falling back to generated ticker symbols")
+        staging_path = f"{config.REAL_ASSETS_PARQUET_PATH}.tmp"
+        if os.path.exists(staging_path):
+            shutil.rmtree(staging_path, ignore_errors=True)
+        if real_assets_available():
+            print("Keeping the previous real asset extract")
         return False
 
+def real_assets_available() -> bool:
+    """Check whether a real asset extract exists (Parquet dataset or legacy CSV)."""
+    return os.path.isdir(config.REAL_ASSETS_PARQUET_PATH) or os.path.exists(config.REAL_ASSETS_CSV_PATH)
+
+def get_real_assets_source_mtime() -> float:
+    """Modification time of the current real asset extract (Parquet dataset or legacy CSV)."""
+    if os.path.isdir(config.REAL_ASSETS_PARQUET_PATH):
+        return os.path.getmtime(config.REAL_ASSETS_PARQUET_PATH)
+    return os.path.getmtime(config.REAL_ASSETS_CSV_PATH)
+
+def read_real_assets_table():
+    """
+    Read the full real asset extract as an Arrow table.
+    
+    Prefers the partitioned Parquet dataset and falls back to the legacy CSV
+    extract when no dataset has been written yet. Rows are returned in the
+    extraction query ordering, so each region/category group is contiguous
+    (subsets are served from the cache built on this table, see RealAssetsIndex.select).
+    
+    Returns:
+        pyarrow.Table: Real asset data
+    """
+    import pyarrow.dataset as ds
+    
+    if os.path.isdir(config.REAL_ASSETS_PARQUET_PATH):
+        dataset = ds.dataset(
+            config.REAL_ASSETS_PARQUET_PATH,
+            format='parquet',
+            partitioning=get_real_assets_partitioning()
+        )
+    else:
+        import pyarrow.csv as pa_csv
+        dataset = ds.dataset(pa_csv.read_csv(
+            config.REAL_ASSETS_CSV_PATH,
+            # Empty fields must load as NULL (as in the Parquet extract) so IFNULL/fillna defaults still apply
+            convert_options=pa_csv.ConvertOptions(column_types=get_real_assets_arrow_schema(), strings_can_be_null=True)
+        ))
+    
+    table = dataset.to_table(columns=REAL_ASSETS_COLUMNS)
+    
+    # Restore the extraction query ordering (file order is only preserved within a partition)
+    return table.sort_by([('MARKET_REGION', 'ascending'), ('ASSET_CATEGORY', 'ascending'),
+                          ('ISSUER_NAME', 'ascending'), ('SECURITY_NAME', 'ascending')])
+
+class RealAssetsIndex:
+    """
+    Memory-mapped real asset table with prebuilt region/category lookups.
+    
+    The backing Arrow IPC (Feather v2) file is sorted by MARKET_REGION and
+    ASSET_CATEGORY, and the offset of every region/category group is stored
+    in the file's schema metadata. Group lookups are therefore zero-copy
+    slices of the mapped file.
+    """
+    
+    GROUP_OFFSETS_METADATA_KEY = b'sam_group_offsets'
+    
+    def __init__(self, table, group_offsets: dict):
+        self.table = table
+        self.group_offsets = group_offsets  # {(region, category): (offset, length)}
+    
+    @classmethod
+    def open(cls, path: str):
+        """Memory-map an existing cache file."""
+        import json
+        import pyarrow.feather as feather
+        
+        table = feather.read_table(path, memory_map=True)
+        raw_offsets = json.loads(table.schema.metadata[cls.GROUP_OFFSETS_METADATA_KEY])
+        group_offsets = {(region, category): (offset, length) for region, category, offset, length in raw_offsets}
+        return cls(table, group_offsets)
+    
+    @classmethod
+    def write(cls, table, path: str):
+        """Write a group-sorted Arrow table to an uncompressed (mappable) cache file."""
+        import json
+        import pyarrow.feather as feather
+        
+        # Compute contiguous group ranges in one pass over the two key columns
+        raw_offsets = []
+        regions = table.column('MARKET_REGION').to_pylist()
+        categories = table.column('ASSET_CATEGORY').to_pylist()
+        for row, key in enumerate(zip(regions, categories)):
+            if raw_offsets and (raw_offsets[-1][0], raw_offsets[-1][1]) == key:
+                raw_offsets[-1][3] += 1
+            else:
+                raw_offsets.append([key[0], key[1], row, 1])
+        
+        metadata = dict(table.schema.metadata or {})
+        metadata[cls.GROUP_OFFSETS_METADATA_KEY] = json.dumps(raw_offsets).encode('utf-8')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        feather.write_feather(table.replace_schema_metadata(metadata), path, compression='uncompressed')
+    
+    def select(self, regions=None, asset_categories=None):
+        """Return the rows for the requested regions/categories as zero-copy slices."""
+        import pyarrow as pa
+        
+        if regions is None and asset_categories is None:
+            return self.table
+        
+        slices = [
+            self.table.slice(offset, length)
+            for (region, category), (offset, length) in sorted(self.group_offsets.items(), key=lambda item: item[1][0])
+            if (regions is None or region in regions) and (asset_categories is None or category in asset_categories)
+        ]
+        if not slices:
+            return self.table.slice(0, 0)
+        return pa.concat_tables(slices)
+    
+    def tickers(self, region: str, asset_category: str, limit: int = None) -> list:
+        """Non-null PRIMARY_TICKER values for one region/category group, in extraction order."""
+        offset, length = self.group_offsets.get((region, asset_category), (0, 0))
+        tickers = self.table.column('PRIMARY_TICKER').slice(offset, length).drop_null()
+        if limit is not None:
+            tickers = tickers.slice(0, limit)
+        return tickers.to_pylist()
+
+# Process-wide index, opened once on first use
+_REAL_ASSETS_INDEX = None
+
+def get_real_assets_index():
+    """
+    Open (building or refreshing if needed) the memory-mapped real assets cache.
+    
+    Returns:
+        RealAssetsIndex: Shared index for this process, or None if no extract exists
+    """
+    global _REAL_ASSETS_INDEX
+    
+    if _REAL_ASSETS_INDEX is not None:
+        return _REAL_ASSETS_INDEX
+    
+    if not real_assets_available():
+        print(f"❌ Real assets not found at {config.REAL_ASSETS_PARQUET_PATH}")
+        return None
+    
+    cache_path = config.REAL_ASSETS_CACHE_PATH
+    if not os.path.exists(cache_path) or os.path.getmtime(cache_path) < get_real_assets_source_mtime():
+        print(f"🗂️  Building real assets cache at {cache_path}...")
+        RealAssetsIndex.write(read_real_assets_table(), cache_path)
+    
+    _REAL_ASSETS_INDEX = RealAssetsIndex.open(cache_path)
+    print(f"✅ Opened real assets cache: {_REAL_ASSETS_INDEX.table.num_rows} assets, "
+          f"{len(_REAL_ASSETS_INDEX.group_offsets)} region/category groups")
+    return _REAL_ASSETS_INDEX
+
+def load_real_assets(regions=None, asset_categories=None):
+    """
+    Load real asset data for the requested regions/categories from the shared cache.
+    
+    Args:
+        regions: Optional list of MARKET_REGION values to read
+        asset_categories: Optional list of ASSET_CATEGORY values to read
+        
+    Returns:
+        pandas.DataFrame: Real asset data or None if no extract exists
+    """
+    
+    try:
+        index = get_real_assets_index()
+        if index is None:
+            return None
+        
+        df = index.select(regions, asset_categories).to_pandas()
+        print(f"✅ Loaded {len(df)} real assets from {config.REAL_ASSETS_CACHE_PATH}")
+        return df
+        
+    except Exception as e:
+        print(f"❌ Failed to load real assets: {e}")
+        return None
+
 def load_real_assets_from_csv():
     """
     Load real asset data from existing CSV file.
@@ -200,19 +441,26 @@ def load_real_assets_from_csv():
 
 def get_real_tickers_by_region_and_class(real_assets_df, target_counts):
     """
-    Extract real tickers from the CSV data according to target distributions.
+    Extract real tickers according to target distributions.
     
     Args:
-        real_assets_df: pandas DataFrame with real asset data
+        real_assets_df: pandas DataFrame with real asset data, or None to use the
+            shared memory-mapped index (group lookups instead of full-table scans)
         target_counts: dict with target counts per region/asset class
         
     Returns:
         dict: Organized real tickers by region and asset class
     """
     
-    if real_assets_df is None:
+    index = get_real_assets_index() if real_assets_df is None else None
+    if real_assets_df is None and index is None:
         return None
     
+    if real_assets_df is not None:
+        # Group once instead of building a boolean mask per combination
+        grouped = real_assets_df[real_assets_df['PRIMARY_TICKER'].notna()].groupby(['MARKET_REGION', 'ASSET_CATEGORY'], sort=False)
+        groups = grouped['PRIMARY_TICKER'].apply(list).to_dict()
+    
     organized_tickers = {
         'USA': {'Equity': [], 'Corporate Bond': [], 'ETF': []},
         'EU': {'Equity': [], 'Corporate Bond': [], 'ETF': []},
@@ -222,21 +470,17 @@ def get_real_tickers_by_region_and_class(real_assets_df, target_counts):
     # Extract tickers for each region/asset class combination
     for region in ['USA', 'EU', 'APAC/EM']:
         for asset_class in ['Equity', 'Corporate Bond', 'ETF']:
-            filtered_data = real_assets_df[
-                (real_assets_df['MARKET_REGION'] == region) & 
-                (real_assets_df['ASSET_CATEGORY'] == asset_class) &
-                (real_assets_df['PRIMARY_TICKER'].notna())
-            ]
-            
             # Get target count for this combination
             target_key = f"{region}_{asset_class}".replace('/', '_').replace(' ', '_')
             target_count = target_counts.get(target_key, 100)  # Default to 100
             
             # Sample tickers up to target count
-            sampled_tickers = filtered_data['PRIMARY_TICKER'].head(target_count).tolist()
+            if index is not None:
+                sampled_tickers = index.tickers(region, asset_class, limit=target_count)
+            else:
+                sampled_tickers = groups.get((region, asset_class), [])[:target_count]
             organized_tickers[region][asset_class] = sampled_tickers
             
             print(f"📊 {region} {asset_class}: {len(sampled_tickers)} real tickers")
     
     return organized_tickers
-
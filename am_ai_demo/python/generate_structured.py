@@ -11,29 +11,48 @@ This module generates:
 
 from snowflake.snowpark import Session
 from typing import List
-import random
 from datetime import datetime, timedelta, date
 import config
+from build_scale import time_builder
+from build_seed import seeded_random, get_as_of_date_sql, get_as_of_date
 import pandas as pd
-import os
 
-def build_all(session: Session, scenarios: List[str], test_mode: bool = False):
+# Security type mapping for real asset categories
+SECURITY_TYPE_MAP = {
+    'Equity': 'Common Stock',
+    'Corporate Bond': 'Corporate Bond', 
+    'ETF': 'Exchange Traded Fund'
+}
+
+# Maximum ticker length per asset category (bond tickers embed coupon and maturity)
+SECURITY_TICKER_MAX_LENGTH = {
+    'Equity': 15,
+    'Corporate Bond': 50,
+    'ETF': 15
+}
+
+def build_all(session: Session, scenarios: List[str], scale_settings: dict, incremental: bool = False, build_stats: List[dict] = None):
     """
     Build all structured data using the enhanced data model.
     
     Args:
         session: Active Snowpark session
         scenarios: List of scenario names to build data for
-        test_mode: If True, use 10% data volumes for faster testing
+        scale_settings: Build volumes from build_scale.get_scale_settings
+        incremental: If True, keep the existing database instead of recreating it
+        build_stats: Optional list that receives per-builder rows and timings
     """
+    if build_stats is None:
+        build_stats = []
     print("📊 Starting enhanced structured data generation...")
     
     # Step 1: Create database and schemas
-    create_database_structure(session)
+    with time_builder(session, build_stats, 'Database structure'):
+        create_database_structure(session, incremental)
     
     # Step 2: Build foundation tables in dependency order
     print("🏛️  Building foundation tables with enhanced model...")
-    build_foundation_tables(session, test_mode)
+    build_foundation_tables(session, scale_settings, build_stats)
     
     # Step 3: Build scenario-specific structured data
     for scenario in scenarios:
@@ -42,13 +61,27 @@ def build_all(session: Session, scenarios: List[str], test_mode: bool = False):
     
     # Step 4: Validate data quality
     print("🔍 Validating data quality...")
-    validate_data_quality(session)
+    with time_builder(session, build_stats, 'Data quality validation'):
+        validate_data_quality(session)
     
     print("✅ Enhanced structured data generation complete")
 
-def create_database_structure(session: Session):
-    """Create database and schema structure."""
+def create_database_structure(session: Session, incremental: bool = False):
+    """
+    Create database and schema structure.
+    
+    In incremental mode existing objects are kept, so document tables and the
+    Cortex Search services built on them survive the rebuild.
+    """
     try:
+        if incremental:
+            session.sql(f"CREATE DATABASE IF NOT EXISTS {config.DATABASE_NAME}").collect()
+            session.sql(f"CREATE SCHEMA IF NOT EXISTS {config.DATABASE_NAME}.RAW").collect()
+            session.sql(f"CREATE SCHEMA IF NOT EXISTS {config.DATABASE_NAME}.CURATED").collect()
+            session.sql(f"CREATE SCHEMA IF NOT EXISTS {config.DATABASE_NAME}.AI").collect()
+            print(f"✅ Database structure ready (incremental): {config.DATABASE_NAME}")
+            return
+        
         session.sql(f"CREATE OR REPLACE DATABASE {config.DATABASE_NAME}").collect()
         session.sql(f"CREATE OR REPLACE SCHEMA {config.DATABASE_NAME}.RAW").collect()
         session.sql(f"CREATE OR REPLACE SCHEMA {config.DATABASE_NAME}.CURATED").collect()
@@ -58,83 +91,97 @@ def create_database_structure(session: Session):
         print(f"❌ Failed to create database structure: {e}")
         raise
 
-def build_foundation_tables(session: Session, test_mode: bool = False):
-    """Build all foundation tables in dependency order."""
-    random.seed(config.RNG_SEED)
+def build_foundation_tables(session: Session, scale_settings: dict, build_stats: List[dict]):
+    """Build all foundation tables in dependency order, recording rows and timings per builder."""
+    years_of_history = scale_settings['years_of_history']
     
     print("🏢 Building issuer dimension...")
-    build_dim_issuer(session, test_mode)
+    with time_builder(session, build_stats, 'DIM_ISSUER', ['CURATED.DIM_ISSUER']):
+        build_dim_issuer(session)
     
     print("🔗 Building security dimension with direct identifiers...")
-    build_dim_security(session, test_mode)
+    with time_builder(session, build_stats, 'DIM_SECURITY', ['CURATED.DIM_SECURITY']):
+        build_dim_security(session, scale_settings['securities_count'])
     
     print("📈 Building portfolio dimension...")
-    build_dim_portfolio(session)
+    with time_builder(session, build_stats, 'DIM_PORTFOLIO', ['CURATED.DIM_PORTFOLIO']):
+        build_dim_portfolio(session, scale_settings['portfolios'])
     
     print("📊 Building benchmark dimension...")
-    build_dim_benchmark(session)
+    with time_builder(session, build_stats, 'DIM_BENCHMARK', ['CURATED.DIM_BENCHMARK']):
+        build_dim_benchmark(session)
     
     print("💱 Building transaction log...")
-    build_fact_transaction(session, test_mode)
+    with time_builder(session, build_stats, 'FACT_TRANSACTION', ['CURATED.FACT_TRANSACTION']):
+        build_fact_transaction(session)
     
     print("📋 Building ABOR positions...")
-    build_fact_position_daily_abor(session)
+    with time_builder(session, build_stats, 'FACT_POSITION_DAILY_ABOR', ['CURATED.FACT_POSITION_DAILY_ABOR']):
+        build_fact_position_daily_abor(session, years_of_history)
     
     print("📈 Building market data...")
-    build_fact_marketdata_timeseries(session, test_mode)
+    with time_builder(session, build_stats, 'FACT_MARKETDATA_TIMESERIES', ['CURATED.FACT_MARKETDATA_TIMESERIES']):
+        build_fact_marketdata_timeseries(session, years_of_history)
+    
+    print("🧭 Building shared equity universe x calendar frame...")
+    # Temporary scratch table, so it is timed but its rows are not counted as build output
+    with time_builder(session, build_stats, 'Equity frame (temporary)'):
+        build_equity_universe_calendar(session, years_of_history)
     
     print("💰 Building fundamentals and estimates...")
-    build_fundamentals_and_estimates(session)
+    with time_builder(session, build_stats, 'FACT_FUNDAMENTALS + FACT_ESTIMATES', ['CURATED.FACT_FUNDAMENTALS', 'CURATED.FACT_ESTIMATES']):
+        build_fundamentals_and_estimates(session)
     
     print("🌱 Building ESG scores...")
-    build_esg_scores(session)
+    with time_builder(session, build_stats, 'FACT_ESG_SCORES', ['CURATED.FACT_ESG_SCORES']):
+        build_esg_scores(session)
     
     print("📏 Building factor exposures...")
-    build_factor_exposures(session)
+    with time_builder(session, build_stats, 'FACT_FACTOR_EXPOSURES', ['CURATED.FACT_FACTOR_EXPOSURES']):
+        build_factor_exposures(session)
     
     print("🎯 Building benchmark holdings...")
-    build_benchmark_holdings(session)
+    with time_builder(session, build_stats, 'FACT_BENCHMARK_HOLDINGS', ['CURATED.FACT_BENCHMARK_HOLDINGS']):
+        build_benchmark_holdings(session)
+    
+    print("🧮 Building holdings rollups...")
+    with time_builder(session, build_stats, 'Holdings rollups', ['CURATED.POSITION_LATEST', 'CURATED.PORTFOLIO_SECTOR_EXPOSURE',
+                                                                 'CURATED.PORTFOLIO_COUNTRY_EXPOSURE', 'CURATED.PORTFOLIO_CONCENTRATION']):
+        build_position_rollups(session)
 
 
 
-def check_temp_real_assets_exists(session: Session) -> bool:
-    """Check if TEMP_REAL_ASSETS table exists in the session."""
-    try:
-        session.sql("SELECT 1 FROM TEMP_REAL_ASSETS LIMIT 1").collect()
-        return True
-    except Exception:
-        return False
-
-def build_dim_issuer(session: Session, test_mode: bool = False):
+def build_dim_issuer(session: Session):
     """Build issuer dimension exclusively from real asset data."""
     
     # Real assets required - no synthetic fallback
     if not config.USE_REAL_ASSETS_CSV:
         raise Exception("Real assets CSV required - set USE_REAL_ASSETS_CSV = True in config.py")
     
-    if not os.path.exists(config.REAL_ASSETS_CSV_PATH):
-        raise Exception(f"Real assets CSV not found at {config.REAL_ASSETS_CSV_PATH} - run 'python main.py --extract-real-assets' first")
+    from extract_real_assets import real_assets_available
+    if not real_assets_available():
+        raise Exception(f"Real assets not found at {config.REAL_ASSETS_PARQUET_PATH} - run 'python main.py --extract-real-assets' first")
     
     print("✅ Building issuer dimension from 100% real asset data")
     build_dim_issuer_from_real_data(session)
 
 def build_dim_issuer_from_real_data(session: Session):
-    """Build issuer dimension from real asset data using efficient Snowpark operations."""
+    """Build issuer dimension from real asset data with a single set-based query."""
     
-    # Load real assets from CSV (required - no fallback)
+    # Load real assets extract (required - no fallback)
     try:
-        from extract_real_assets import load_real_assets_from_csv
-        real_assets_df_pandas = load_real_assets_from_csv()
+        from extract_real_assets import load_real_assets
+        real_assets_df_pandas = load_real_assets()
         
         if real_assets_df_pandas is None:
-            raise Exception("Real assets CSV not found - required for real-only mode")
+            raise Exception("Real assets not found - required for real-only mode")
     except Exception as e:
         print(f"❌ Error loading real assets: {e}")
         print("   To fix: Run 'python main.py --extract-real-assets' first")
         raise
     
     # Upload to temporary table for efficient processing (will be reused by other functions)
-    real_assets_df = session.write_pandas(
+    session.write_pandas(
         real_assets_df_pandas,
         table_name="TEMP_REAL_ASSETS",
         quote_identifiers=False,
@@ -143,179 +190,154 @@ def build_dim_issuer_from_real_data(session: Session):
     )
     print("✅ Created TEMP_REAL_ASSETS table for reuse by other functions")
     
-    from snowflake.snowpark.functions import (
-        col, lit, ifnull, row_number, abs as abs_func, hash as hash_func,
-        regexp_replace, substr, trim, to_varchar, concat
-    )
-    from snowflake.snowpark import Window
+    # Plain SQL (rather than Snowpark DataFrame functions) so the local backend can run it too
+    session.sql(f"""
+        -- Derive one issuer per distinct legal name from the real assets
+        CREATE OR REPLACE TABLE {config.DATABASE_NAME}.CURATED.DIM_ISSUER AS
+        WITH issuer_names AS (
+            SELECT DISTINCT
+                IFNULL(ISSUER_NAME, SECURITY_NAME) as LegalName,
+                IFNULL(COUNTRY_OF_DOMICILE, 'US') as CountryOfIncorporation,
+                IFNULL(INDUSTRY_SECTOR, 'Diversified') as INDUSTRY_SECTOR
+            FROM TEMP_REAL_ASSETS
+        )
+        SELECT 
+            ROW_NUMBER() OVER (ORDER BY LegalName) as IssuerID,
+            CAST(NULL AS INTEGER) as UltimateParentIssuerID,
+            SUBSTR(TRIM(LegalName), 1, 255) as LegalName,  -- Ensure it fits column
+            SUBSTR('LEI00000' || CAST(ABS(HASH(LegalName)) % 1000000 AS VARCHAR), 1, 20) as LEI,  -- Generate LEI with proper format
+            CountryOfIncorporation,
+            INDUSTRY_SECTOR as GICS_Sector  -- Keep same column name for compatibility
+        FROM issuer_names
+        WHERE LegalName IS NOT NULL AND LegalName != 'Unknown'
+    """).collect()
     
-    # Create issuers DataFrame using optimized Snowpark operations
-    issuers_df = (real_assets_df.select(
-        ifnull(col("ISSUER_NAME"), col("SECURITY_NAME")).alias("LegalName"),
-        ifnull(col("COUNTRY_OF_DOMICILE"), lit("US")).alias("CountryOfIncorporation"),
-        ifnull(col("INDUSTRY_SECTOR"), lit('Diversified')).alias("INDUSTRY_SECTOR")
-    )
-    .filter((col("LegalName").isNotNull()) & (col("LegalName") != lit("Unknown")))
-    .distinct()
-    .select(
-        # Add required columns for the DIM_ISSUER table
-        row_number().over(Window.order_by("LegalName")).alias("IssuerID"),
-        lit(None).alias("UltimateParentIssuerID"),
-        substr(trim(col("LegalName")), 1, 255).alias("LegalName"),  # Ensure it fits column
-        regexp_replace(
-            concat(lit("LEI"), to_varchar(abs_func(hash_func(col("LegalName"))) % lit(1000000))),
-            r'(\d+)', r'00000\1'
-        ).substr(1, 20).alias("LEI"),  # Generate LEI with proper format
-        col("CountryOfIncorporation"),
-        col("INDUSTRY_SECTOR").alias("GICS_Sector")  # Keep same column name for compatibility
-    ))
-    
-    # Save to database
-    issuers_df.write.mode("overwrite").save_as_table(f"{config.DATABASE_NAME}.CURATED.DIM_ISSUER")
-    
-    issuer_count = issuers_df.count()
-    print(f"✅ Created {issuer_count} issuers from real asset data using Snowpark operations")
+    issuer_count = session.sql(f"SELECT COUNT(*) FROM {config.DATABASE_NAME}.CURATED.DIM_ISSUER").collect()[0][0]
+    print(f"✅ Created {issuer_count} issuers from real asset data")
 
 
 
-def build_dim_security(session: Session, test_mode: bool = False):
+def build_dim_security(session: Session, securities_count: dict):
     """Build securities with immutable SecurityID and direct TICKER/FIGI columns."""
     
-    # Use test mode counts if specified
-    securities_count = config.TEST_SECURITIES_COUNT if test_mode else config.SECURITIES_COUNT
-    
     # Real assets only mode - no synthetic fallback
     if not config.USE_REAL_ASSETS_CSV:
         raise Exception("Real assets CSV required - set USE_REAL_ASSETS_CSV = True in config.py")
     
-    if not os.path.exists(config.REAL_ASSETS_CSV_PATH):
-        raise Exception(f"Real assets CSV not found at {config.REAL_ASSETS_CSV_PATH} - run 'python main.py --extract-real-assets' first")
+    from extract_real_assets import real_assets_available
+    if not real_assets_available():
+        raise Exception(f"Real assets not found at {config.REAL_ASSETS_PARQUET_PATH} - run 'python main.py --extract-real-assets' first")
     
     print("✅ Using real asset data for securities (100% authentic mode)")
     build_dim_security_from_real_data(session, securities_count)
 
 def build_dim_security_from_real_data(session: Session, securities_count: dict):
-    """Build securities using real asset data only - no synthetic fallback."""
+    """Build securities using real asset data only - no synthetic fallback.
     
-    # Check if TEMP_REAL_ASSETS table already exists (created by build_dim_issuer)
-    if check_temp_real_assets_exists(session):
-        print("✅ Reusing existing TEMP_REAL_ASSETS table (optimization)")
-        # Load real assets from existing temp table
-        real_assets_df = session.table("TEMP_REAL_ASSETS").to_pandas()
-    else:
-        print("📥 Loading real assets from CSV (TEMP_REAL_ASSETS not found)")
-        # Load real assets from CSV
-        try:
-            from extract_real_assets import load_real_assets_from_csv
-            real_assets_df = load_real_assets_from_csv()
-            
-            if real_assets_df is None:
-                raise Exception("Real assets CSV not found - required for real-only mode")
-        except Exception as e:
-            print(f"❌ Error loading real assets: {e}")
-            print("   To fix: Run 'python main.py --extract-real-assets' first")
-            raise
+    Uses a columnar pipeline: vectorized filtering per asset category, issuer
+    resolution as a merge against DIM_ISSUER and a single write_pandas load.
+    """
+    
+    # Load only the asset categories used for securities from the shared
+    # memory-mapped cache (already opened by build_dim_issuer in this process)
+    try:
+        from extract_real_assets import load_real_assets
+        real_assets_df = load_real_assets(asset_categories=list(SECURITY_TYPE_MAP.keys()))
+        
+        if real_assets_df is None:
+            raise Exception("Real assets not found - required for real-only mode")
+    except Exception as e:
+        print(f"❌ Error loading real assets: {e}")
+        print("   To fix: Run 'python main.py --extract-real-assets' first")
+        raise
     
     # Get existing issuers for mapping (optimized single query)
-    issuers = session.sql(f"SELECT IssuerID, LegalName FROM {config.DATABASE_NAME}.CURATED.DIM_ISSUER").collect()
-    issuer_map = {row['LEGALNAME']: row['ISSUERID'] for row in issuers}
+    issuers_df = session.table(f"{config.DATABASE_NAME}.CURATED.DIM_ISSUER").select("IssuerID", "LegalName").to_pandas()
+    issuers_df = (issuers_df.rename(columns={'ISSUERID': 'IssuerID', 'LEGALNAME': 'IssuerLegalName'})
+                  .sort_values('IssuerID')
+                  .drop_duplicates(subset=['IssuerLegalName'], keep='last'))  # One IssuerID per name
     
-    # Process each asset category efficiently
-    all_security_data = []
-    security_id = 1
+    # Vectorized filtering per asset category (no per-row Python work)
+    has_ticker = real_assets_df['PRIMARY_TICKER'].notna()
+    has_figi = real_assets_df['TOP_LEVEL_OPENFIGI_ID'].notna()
+    ticker_length = real_assets_df['PRIMARY_TICKER'].astype('string').str.len()
     
+    category_frames = []
     for asset_category, max_count in [('Equity', securities_count['equities']), 
                                      ('Corporate Bond', securities_count['bonds']), 
                                      ('ETF', securities_count['etfs'])]:
         
-        # Filter all available assets of this category (no limits)
-        if asset_category == 'Corporate Bond':
-            # Corporate bonds have complex tickers with coupons, dates, etc.
-            category_assets = (real_assets_df[
-                (real_assets_df['ASSET_CATEGORY'] == asset_category) &
-                (real_assets_df['PRIMARY_TICKER'].notna()) &
-                (real_assets_df['PRIMARY_TICKER'].str.len() <= 50) &  # More generous for bonds
-                (real_assets_df['TOP_LEVEL_OPENFIGI_ID'].notna())  # Ensure FIGI available
-            ].drop_duplicates(subset=['PRIMARY_TICKER'], keep='first')
-             .head(max_count))  # Apply reasonable limit to prevent excessive data
-        else:
-            # Equity and ETF filtering - prioritize clean tickers but allow more flexibility
-            category_assets = (real_assets_df[
-                (real_assets_df['ASSET_CATEGORY'] == asset_category) &
-                (real_assets_df['PRIMARY_TICKER'].notna()) &
-                (real_assets_df['PRIMARY_TICKER'].str.len() <= 15) &  # More flexible length
-                (real_assets_df['TOP_LEVEL_OPENFIGI_ID'].notna())     # Ensure FIGI available
-            ].drop_duplicates(subset=['PRIMARY_TICKER'], keep='first')
-             .head(max_count))  # Apply reasonable limit to prevent excessive data
-        
-        available_count = len(category_assets)
-        print(f"  📊 Using {available_count} real {asset_category} securities (max: {max_count})")
-        
-        # Batch process securities for this category
-        for _, asset in category_assets.iterrows():
-            # Issuer lookup with fallback
-            issuer_name = asset.get('ISSUER_NAME') or asset.get('SECURITY_NAME', 'Unknown')
-            issuer_id = issuer_map.get(issuer_name, 1)  # Default to first issuer
-            
-            # Security type mapping
-            security_type_map = {
-                'Equity': 'Common Stock',
-                'Corporate Bond': 'Corporate Bond', 
-                'ETF': 'Exchange Traded Fund'
-            }
-            
-            # Country handling - use COUNTRY_OF_DOMICILE directly
-            country = asset.get('COUNTRY_OF_DOMICILE', 'US')
-            if pd.isna(country) or not isinstance(country, str):
-                country = 'US'
-            
-            all_security_data.append({
-                'SecurityID': security_id,
-                'IssuerID': issuer_id,
-                'Ticker': asset['PRIMARY_TICKER'],  # Direct ticker column
-                'FIGI': asset.get('TOP_LEVEL_OPENFIGI_ID', f"BBG{abs(hash(asset['PRIMARY_TICKER'])) % 1000000:06d}"),  # Direct FIGI column
-                'Description': str(asset.get('SECURITY_NAME', asset['PRIMARY_TICKER']))[:255],
-                'AssetClass': asset_category,
-                'SecurityType': security_type_map.get(asset_category, 'Other'),
-                'CountryOfRisk': country,
-                'IssueDate': datetime(2010, 1, 1).date(),
-                'MaturityDate': datetime(2030, 1, 1).date() if asset_category == 'Corporate Bond' else None,
-                'CouponRate': 5.0 if asset_category == 'Corporate Bond' else None,
-                'RecordStartDate': datetime.now(),
-                'RecordEndDate': None,
-                'IsActive': True
-            })
-            
-            security_id += 1
-    
-    # Save to database using Snowpark DataFrames
-    if all_security_data:
-        securities_df = session.create_dataframe(all_security_data)
-        securities_df.write.mode("overwrite").save_as_table(f"{config.DATABASE_NAME}.CURATED.DIM_SECURITY")
-        
-        print(f"✅ Created {len(all_security_data)} securities from real asset data (100% authentic) with direct TICKER and FIGI columns")
-        
-        # Report actual counts achieved
-        actual_counts = {}
-        for sec in all_security_data:
-            asset_class = sec['AssetClass']
-            actual_counts[asset_class] = actual_counts.get(asset_class, 0) + 1
+        # Corporate bonds have complex tickers with coupons, dates, etc.
+        max_ticker_length = SECURITY_TICKER_MAX_LENGTH.get(asset_category, 15)
+        category_assets = (real_assets_df[
+            (real_assets_df['ASSET_CATEGORY'] == asset_category) &
+            has_ticker &
+            (ticker_length <= max_ticker_length) &
+            has_figi  # Ensure FIGI available
+        ].drop_duplicates(subset=['PRIMARY_TICKER'], keep='first')
+         .head(max_count))  # Apply reasonable limit to prevent excessive data
         
-        print("📊 Real asset utilization by category:")
-        for asset_type, max_target in securities_count.items():
-            asset_category = {'equities': 'Equity', 'bonds': 'Corporate Bond', 'etfs': 'ETF'}[asset_type]
-            actual = actual_counts.get(asset_category, 0)
-            print(f"  {asset_category}: {actual:,} securities (target: {max_target:,})")
+        print(f"  📊 Using {len(category_assets)} real {asset_category} securities (max: {max_count})")
+        category_frames.append(category_assets)
     
-    else:
+    assets = pd.concat(category_frames, ignore_index=True)
+    if assets.empty:
         raise Exception("No real securities found - check data filtering criteria")
+    
+    # Issuer resolution as a merge, using the same LegalName derivation as DIM_ISSUER
+    assets['IssuerLegalName'] = (assets['ISSUER_NAME']
+                                 .fillna(assets['SECURITY_NAME'])
+                                 .astype('string')
+                                 .str.strip()
+                                 .str.slice(0, 255))
+    assets = assets.merge(issuers_df, on='IssuerLegalName', how='left')
+    
+    is_bond = assets['ASSET_CATEGORY'] == 'Corporate Bond'
+    securities_df = pd.DataFrame({
+        'SecurityID': pd.RangeIndex(1, len(assets) + 1),
+        'IssuerID': assets['IssuerID'].fillna(1).astype('int64'),  # Default to first issuer
+        'Ticker': assets['PRIMARY_TICKER'],  # Direct ticker column
+        'FIGI': assets['TOP_LEVEL_OPENFIGI_ID'],  # Direct FIGI column
+        'Description': assets['SECURITY_NAME'].fillna(assets['PRIMARY_TICKER']).astype('string').str.slice(0, 255),
+        'AssetClass': assets['ASSET_CATEGORY'],
+        'SecurityType': assets['ASSET_CATEGORY'].map(SECURITY_TYPE_MAP).fillna('Other'),
+        'CountryOfRisk': assets['COUNTRY_OF_DOMICILE'].fillna('US'),  # Use COUNTRY_OF_DOMICILE directly
+        'IssueDate': date(2010, 1, 1),
+        'MaturityDate': pd.Series(date(2030, 1, 1), index=assets.index).where(is_bond, None),
+        'CouponRate': pd.Series(5.0, index=assets.index).where(is_bond),
+        'RecordStartDate': pd.Timestamp(get_as_of_date()),  # Build as-of date, not wall-clock time
+        'RecordEndDate': pd.Series(pd.NaT, index=assets.index, dtype='datetime64[ns]'),
+        'IsActive': True
+    })
+    
+    # Save to database with a single staged Parquet load
+    session.write_pandas(
+        securities_df,
+        table_name="DIM_SECURITY",
+        database=config.DATABASE_NAME,
+        schema="CURATED",
+        quote_identifiers=False,
+        auto_create_table=True,
+        overwrite=True,
+        use_logical_type=True  # Keep pandas timestamps as TIMESTAMP columns
+    )
+    
+    print(f"✅ Created {len(securities_df)} securities from real asset data (100% authentic) with direct TICKER and FIGI columns")
+    
+    # Report actual counts achieved
+    actual_counts = securities_df['AssetClass'].value_counts()
+    print("📊 Real asset utilization by category:")
+    for asset_type, max_target in securities_count.items():
+        asset_category = {'equities': 'Equity', 'bonds': 'Corporate Bond', 'etfs': 'ETF'}[asset_type]
+        actual = int(actual_counts.get(asset_category, 0))
+        print(f"  {asset_category}: {actual:,} securities (target: {max_target:,})")
 
 
-def build_dim_portfolio(session: Session):
-    """Build portfolio dimension from configuration."""
+def build_dim_portfolio(session: Session, portfolios: List[dict]):
+    """Build portfolio dimension from the (scaled) portfolio lineup."""
     
     portfolio_data = []
-    for i, portfolio in enumerate(config.PORTFOLIO_LINEUP):
+    for i, portfolio in enumerate(portfolios):
         portfolio_data.append({
             'PortfolioID': i + 1,
             'PortfolioCode': f"SAM_{i+1:02d}",
@@ -346,9 +368,16 @@ def build_dim_benchmark(session: Session):
     
     print(f"✅ Created {len(benchmark_data)} benchmarks")
 
-def build_fact_transaction(session: Session, test_mode: bool = False):
+def build_fact_transaction(session: Session):
     """Generate synthetic transaction history."""
     
+    as_of_date = get_as_of_date_sql()
+    
+    # Random draws are a function of RNG_SEED and the row's keys, so builds are reproducible
+    gen = {draw: seeded_random('FACT_TRANSACTION', draw, 'sh.PortfolioID', 'sh.SecurityID', 'td.trade_date')
+           for draw in ['quantity', 'price', 'commission', 'keep']}
+    holding_order = seeded_random('FACT_TRANSACTION', 'holding_order', 'p.PortfolioID', 's.SecurityID')
+    
     # Generate transactions for the last 12 months that build up to current positions
     print("💱 Generating synthetic transaction history...")
     
@@ -383,7 +412,7 @@ def build_fact_transaction(session: Session, test_mode: bool = False):
                 s.SecurityID,
                 s.priority,
                 -- Random ordering within priority groups for portfolio diversification
-                ROW_NUMBER() OVER (PARTITION BY p.PortfolioID ORDER BY s.priority, RANDOM()) as rn
+                ROW_NUMBER() OVER (PARTITION BY p.PortfolioID ORDER BY s.priority, {holding_order}) as rn
             FROM {config.DATABASE_NAME}.CURATED.DIM_PORTFOLIO p
             CROSS JOIN major_us_securities s
         ),
@@ -398,7 +427,7 @@ def build_fact_transaction(session: Session, test_mode: bool = False):
             -- Step 4: Generate weekly transaction dates over the past 12 months
             -- Creates realistic trading frequency (weekly purchases building positions)
             SELECT 
-                DATEADD(day, seq4() * 7, DATEADD(month, -{config.SYNTHETIC_TRANSACTION_MONTHS}, CURRENT_DATE())) as trade_date
+                DATEADD(day, seq4() * 7, DATEADD(month, -{config.SYNTHETIC_TRANSACTION_MONTHS}, {as_of_date})) as trade_date
             FROM TABLE(GENERATOR(rowcount => {config.SYNTHETIC_TRANSACTION_MONTHS * 4}))  -- ~48 weeks of transactions
             WHERE DAYOFWEEK(trade_date) BETWEEN 2 AND 6  -- Business days only (Monday=2 to Friday=6)
         )
@@ -417,13 +446,13 @@ def build_fact_transaction(session: Session, test_mode: bool = False):
             'BUY' as TransactionType,  -- Simplified: mostly buys to build positions over time
             DATEADD(day, 2, td.trade_date) as SettleDate,  -- Standard T+2 settlement cycle
             -- Realistic transaction amounts (100-10,000 shares)
-            UNIFORM(100, 10000, RANDOM()) as Quantity,
+            UNIFORM(100, 10000, {gen['quantity']}) as Quantity,
             -- Realistic stock prices ($50-$500 range)
-            UNIFORM(50, 500, RANDOM()) as Price,
+            UNIFORM(50, 500, {gen['price']}) as Price,
             -- Gross amount calculated elsewhere (NULL for now)
             NULL as GrossAmount_Local,
             -- Realistic commission costs ($5-$50)
-            UNIFORM(5, 50, RANDOM()) as Commission_Local,
+            UNIFORM(5, 50, {gen['commission']}) as Commission_Local,
             -- Standard currency and system identifiers
             'USD' as Currency,
             'ABOR' as SourceSystem,  -- Accounting Book of Record
@@ -431,14 +460,16 @@ def build_fact_transaction(session: Session, test_mode: bool = False):
             CONCAT('TXN_', ROW_NUMBER() OVER (ORDER BY sh.PortfolioID, sh.SecurityID, td.trade_date)) as SourceTransactionID
         FROM selected_holdings sh
         CROSS JOIN transaction_dates td
-        WHERE UNIFORM(0, 1, RANDOM()) < 0.1  -- Only 10% of combinations create transactions
+        WHERE UNIFORM(0, 1, {gen['keep']}) < 0.1  -- Only 10% of combinations create transactions
     """).collect()
     
     print("✅ Created transaction history")
 
-def build_fact_position_daily_abor(session: Session):
+def build_fact_position_daily_abor(session: Session, years_of_history: int):
     """Build ABOR positions from transaction log."""
     
+    as_of_date = get_as_of_date_sql()
+    
     print("📋 Building ABOR positions from transactions...")
     
     session.sql(f"""
@@ -446,10 +477,10 @@ def build_fact_position_daily_abor(session: Session):
         -- This creates monthly position snapshots by aggregating transaction data
         CREATE OR REPLACE TABLE {config.DATABASE_NAME}.CURATED.FACT_POSITION_DAILY_ABOR AS
         WITH monthly_dates AS (
-            -- Step 1: Generate month-end dates for position snapshots over 5 years of history
+            -- Step 1: Generate month-end dates for position snapshots over the scaled years of history
             -- Uses LAST_DAY to ensure consistent month-end reporting dates
-            SELECT LAST_DAY(DATEADD(month, seq4(), DATEADD(year, -{config.YEARS_OF_HISTORY}, CURRENT_DATE()))) as position_date
-            FROM TABLE(GENERATOR(rowcount => {12 * config.YEARS_OF_HISTORY}))  -- 60 month-end dates
+            SELECT LAST_DAY(DATEADD(month, seq4(), DATEADD(year, -{years_of_history}, {as_of_date}))) as position_date
+            FROM TABLE(GENERATOR(rowcount => {12 * years_of_history}))  -- 60 month-end dates at full scale
         ),
         transaction_balances AS (
             -- Step 2: Calculate net position quantities and average cost basis from transactions
@@ -505,24 +536,30 @@ def build_fact_position_daily_abor(session: Session):
     
     print("✅ Created ABOR positions")
 
-def build_fact_marketdata_timeseries(session: Session, test_mode: bool = False):
+def build_fact_marketdata_timeseries(session: Session, years_of_history: int):
     """Build synthetic market data for all securities."""
     
     print("📝 Generating synthetic market data for all securities")
-    build_marketdata_synthetic(session)
+    build_marketdata_synthetic(session, years_of_history)
 
-def build_marketdata_synthetic(session: Session):
+def build_marketdata_synthetic(session: Session, years_of_history: int):
     """Build synthetic market data."""
     
+    as_of_date = get_as_of_date_sql()
+    
+    # One seeded draw stream per price field, keyed by security and date
+    gen = {draw: seeded_random('FACT_MARKETDATA_TIMESERIES', draw, 'SecurityID', 'PriceDate')
+           for draw in ['open_base', 'open_move', 'high_base', 'high_move', 'low_base', 'low_move', 'close', 'volume']}
+    
     session.sql(f"""
-        -- Generate synthetic market data (OHLCV) for all securities over 5 years
+        -- Generate synthetic market data (OHLCV) for all securities over the scaled years of history
         -- Creates realistic price movements and trading volumes for demo purposes
         CREATE OR REPLACE TABLE {config.DATABASE_NAME}.CURATED.FACT_MARKETDATA_TIMESERIES AS
         WITH business_dates AS (
-            -- Step 1: Generate business days (Monday-Friday) over 5 years of history
+            -- Step 1: Generate business days (Monday-Friday) over the scaled years of history
             -- Excludes weekends to match real market trading calendar
-            SELECT DATEADD(day, seq4(), DATEADD(year, -{config.YEARS_OF_HISTORY}, CURRENT_DATE())) as price_date
-            FROM TABLE(GENERATOR(rowcount => {365 * config.YEARS_OF_HISTORY}))  -- ~1,825 days total
+            SELECT DATEADD(day, seq4(), DATEADD(year, -{years_of_history}, {as_of_date})) as price_date
+            FROM TABLE(GENERATOR(rowcount => {365 * years_of_history}))  -- ~1,825 days at full scale
             WHERE DAYOFWEEK(price_date) BETWEEN 2 AND 6  -- Monday=2 to Friday=6 only
         ),
         securities_dates AS (
@@ -541,37 +578,37 @@ def build_marketdata_synthetic(session: Session):
             SecurityID,
             -- Opening prices with asset-class-specific ranges and daily volatility
             CASE 
-                WHEN AssetClass = 'Equity' THEN UNIFORM(50, 850, RANDOM())        -- Equity: $50-$850
-                WHEN AssetClass = 'Corporate Bond' THEN UNIFORM(90, 110, RANDOM()) -- Bonds: $90-$110 (near par)
-                ELSE UNIFORM(50, 450, RANDOM())                                   -- ETFs/Other: $50-$450
-            END * (1 + (UNIFORM(-0.02, 0.02, RANDOM()))) as Price_Open,  -- ±2% daily variation
+                WHEN AssetClass = 'Equity' THEN UNIFORM(50, 850, {gen['open_base']})        -- Equity: $50-$850
+                WHEN AssetClass = 'Corporate Bond' THEN UNIFORM(90, 110, {gen['open_base']}) -- Bonds: $90-$110 (near par)
+                ELSE UNIFORM(50, 450, {gen['open_base']})                                   -- ETFs/Other: $50-$450
+            END * (1 + (UNIFORM(-0.02, 0.02, {gen['open_move']}))) as Price_Open,  -- ±2% daily variation
             
             -- High prices (always above base price)
             CASE 
-                WHEN AssetClass = 'Equity' THEN UNIFORM(50, 850, RANDOM())
-                WHEN AssetClass = 'Corporate Bond' THEN UNIFORM(90, 110, RANDOM())
-                ELSE UNIFORM(50, 450, RANDOM())
-            END * (1 + UNIFORM(0, 0.03, RANDOM())) as Price_High,  -- 0-3% above base
+                WHEN AssetClass = 'Equity' THEN UNIFORM(50, 850, {gen['high_base']})
+                WHEN AssetClass = 'Corporate Bond' THEN UNIFORM(90, 110, {gen['high_base']})
+                ELSE UNIFORM(50, 450, {gen['high_base']})
+            END * (1 + UNIFORM(0, 0.03, {gen['high_move']})) as Price_High,  -- 0-3% above base
             
             -- Low prices (always below base price)
             CASE 
-                WHEN AssetClass = 'Equity' THEN UNIFORM(50, 850, RANDOM())
-                WHEN AssetClass = 'Corporate Bond' THEN UNIFORM(90, 110, RANDOM())
-                ELSE UNIFORM(50, 450, RANDOM())
-            END * (1 - UNIFORM(0, 0.03, RANDOM())) as Price_Low,   -- 0-3% below base
+                WHEN AssetClass = 'Equity' THEN UNIFORM(50, 850, {gen['low_base']})
+                WHEN AssetClass = 'Corporate Bond' THEN UNIFORM(90, 110, {gen['low_base']})
+                ELSE UNIFORM(50, 450, {gen['low_base']})
+            END * (1 - UNIFORM(0, 0.03, {gen['low_move']})) as Price_Low,   -- 0-3% below base
             
             -- Closing prices (base price without additional variation)
             CASE 
-                WHEN AssetClass = 'Equity' THEN UNIFORM(50, 850, RANDOM())
-                WHEN AssetClass = 'Corporate Bond' THEN UNIFORM(90, 110, RANDOM())
-                ELSE UNIFORM(50, 450, RANDOM())
+                WHEN AssetClass = 'Equity' THEN UNIFORM(50, 850, {gen['close']})
+                WHEN AssetClass = 'Corporate Bond' THEN UNIFORM(90, 110, {gen['close']})
+                ELSE UNIFORM(50, 450, {gen['close']})
             END as Price_Close,
             
             -- Trading volumes with asset-class-appropriate ranges
             CASE 
-                WHEN AssetClass = 'Equity' THEN UNIFORM(100000, 10000000, RANDOM())::int      -- High equity volumes
-                WHEN AssetClass = 'Corporate Bond' THEN UNIFORM(10000, 1000000, RANDOM())::int -- Lower bond volumes
-                ELSE UNIFORM(50000, 5000000, RANDOM())::int                                   -- Moderate ETF volumes
+                WHEN AssetClass = 'Equity' THEN UNIFORM(100000, 10000000, {gen['volume']})::int      -- High equity volumes
+                WHEN AssetClass = 'Corporate Bond' THEN UNIFORM(10000, 1000000, {gen['volume']})::int -- Lower bond volumes
+                ELSE UNIFORM(50000, 5000000, {gen['volume']})::int                                   -- Moderate ETF volumes
             END as Volume,
             
             -- Total return factor (simplified to 1.0 for now - could include dividends/interest)
@@ -582,58 +619,109 @@ def build_marketdata_synthetic(session: Session):
     print("✅ Created synthetic market data")
 
 # Placeholder functions for remaining tables (to be implemented)
-def build_fundamentals_and_estimates(session: Session):
-    """Build fundamentals and estimates tables with SecurityID linkage."""
+def build_equity_universe_calendar(session: Session, years_of_history: int):
+    """
+    Build the shared equity universe x calendar attribute frame.
+    
+    The security/issuer join, the monthly date spine and per-security latent draws are
+    computed once per build into a temporary table consumed by the fundamentals, ESG,
+    factor and benchmark builders. Sharing the draws keeps related attributes correlated
+    (e.g. large companies have high revenue, negative size loading and large index weights).
+    Consumers add their own per-date noise (seeded by security and date) on top of the
+    latent draws, so the metrics still move over time.
+    """
+    
+    as_of_date = get_as_of_date_sql()
+    
+    # Latent draws are a function of RNG_SEED and the security, so they are stable across builds
+    gen = {draw: seeded_random('EQUITY_UNIVERSE_CALENDAR', draw, 's.SecurityID')
+           for draw in ['size', 'quality', 'value']}
     
-    # Build fundamentals table with realistic financial data
     session.sql(f"""
-        -- Generate synthetic fundamental data (revenue, earnings, ratios) for equity securities
-        -- Creates quarterly financial metrics with sector-appropriate ranges for 5 years
-        CREATE OR REPLACE TABLE {config.DATABASE_NAME}.CURATED.FACT_FUNDAMENTALS AS
+        -- Materialise the equity universe crossed with the monthly calendar for the analytics builders
+        CREATE OR REPLACE TEMPORARY TABLE {config.DATABASE_NAME}.CURATED.EQUITY_UNIVERSE_CALENDAR AS
         WITH equity_securities AS (
+            -- Step 1: Equity universe with issuer attributes and per-security latent draws (0-1)
             SELECT 
-                s.SecurityID as SECURITY_ID,
+                s.SecurityID,
                 s.Ticker,
-                i.GICS_Sector
+                s.IssuerID,
+                i.GICS_Sector,
+                i.CountryOfIncorporation,
+                UNIFORM(0::FLOAT, 1::FLOAT, {gen['size']}) as SIZE_DRAW,     -- Market cap: revenue, size factor, index weight
+                UNIFORM(0::FLOAT, 1::FLOAT, {gen['quality']}) as QUALITY_DRAW,  -- Profitability: net margin, quality factor, governance
+                UNIFORM(0::FLOAT, 1::FLOAT, {gen['value']}) as VALUE_DRAW     -- Valuation: value factor, P/E
             FROM {config.DATABASE_NAME}.CURATED.DIM_SECURITY s
             JOIN {config.DATABASE_NAME}.CURATED.DIM_ISSUER i ON s.IssuerID = i.IssuerID
             WHERE s.AssetClass = 'Equity'
         ),
-        quarters AS (
+        calendar AS (
+            -- Step 2: Monthly date spine over the scaled years of history (quarterly builders use every third month)
             SELECT 
-                DATEADD(quarter, seq4(), DATEADD(year, -{config.YEARS_OF_HISTORY}, CURRENT_DATE())) as REPORTING_DATE,
-                'Q' || QUARTER(DATEADD(quarter, seq4(), DATEADD(year, -{config.YEARS_OF_HISTORY}, CURRENT_DATE()))) || 
-                ' ' || YEAR(DATEADD(quarter, seq4(), DATEADD(year, -{config.YEARS_OF_HISTORY}, CURRENT_DATE()))) as FISCAL_QUARTER
-            FROM TABLE(GENERATOR(rowcount => {4 * config.YEARS_OF_HISTORY}))
-        ),
-        base_metrics AS (
+                seq4() as MONTH_NUM,
+                DATEADD(month, seq4(), DATEADD(year, -{years_of_history}, {as_of_date})) as CALENDAR_DATE
+            FROM TABLE(GENERATOR(rowcount => {12 * years_of_history}))
+        )
+        -- Step 3: One row per equity and month
+        SELECT 
+            es.*,
+            c.MONTH_NUM,
+            c.CALENDAR_DATE,
+            LAST_DAY(c.CALENDAR_DATE) as MONTH_END_DATE,
+            MOD(c.MONTH_NUM, 3) = 0 as IS_QUARTER
+        FROM equity_securities es
+        CROSS JOIN calendar c
+    """).collect()
+    
+    print("✅ Created shared equity universe x calendar frame")
+
+def build_fundamentals_and_estimates(session: Session):
+    """Build fundamentals and estimates tables with SecurityID linkage."""
+    
+    # Seeded by security and quarter (see build_seed.py)
+    quarter_gen = {draw: seeded_random('FACT_FUNDAMENTALS', draw, 'f.SecurityID', 'f.CALENDAR_DATE')
+                   for draw in ['revenue', 'net_margin']}
+    metric_gen = {draw: seeded_random('FACT_FUNDAMENTALS', draw, 'SECURITY_ID', 'REPORTING_DATE')
+                  for draw in ['shares_outstanding', 'revenue_growth', 'trailing_pe']}
+    estimate_gen = {draw: seeded_random('FACT_ESTIMATES', draw, 'SECURITY_ID', 'ESTIMATE_DATE', 'METRIC_NAME')
+                    for draw in ['estimate', 'guidance_low', 'guidance_high']}
+    
+    # Build fundamentals table with realistic financial data
+    session.sql(f"""
+        -- Generate synthetic fundamental data (revenue, earnings, ratios) for equity securities
+        -- Creates quarterly financial metrics with sector-appropriate ranges from the shared equity frame
+        CREATE OR REPLACE TABLE {config.DATABASE_NAME}.CURATED.FACT_FUNDAMENTALS AS
+        WITH base_metrics AS (
             SELECT 
-                es.SECURITY_ID,
-                q.REPORTING_DATE,
-                q.FISCAL_QUARTER,
-                -- Base financial metrics scaled by sector
-                CASE 
-                    WHEN es.GICS_SECTOR = 'Information Technology' THEN UNIFORM(1000000000, 100000000000, RANDOM())
-                    WHEN es.GICS_SECTOR = 'Health Care' THEN UNIFORM(5000000000, 50000000000, RANDOM())
-                    ELSE UNIFORM(500000000, 20000000000, RANDOM())
-                END as BASE_REVENUE,
+                f.SecurityID as SECURITY_ID,
+                f.CALENDAR_DATE as REPORTING_DATE,
+                'Q' || QUARTER(f.CALENDAR_DATE) || ' ' || YEAR(f.CALENDAR_DATE) as FISCAL_QUARTER,
+                f.VALUE_DRAW,
+                -- Base financial metrics scaled by sector and company size (+/-5% quarterly variation, whole dollars)
+                ROUND(CASE 
+                    WHEN f.GICS_Sector = 'Information Technology' THEN 1000000000 + 99000000000 * f.SIZE_DRAW
+                    WHEN f.GICS_Sector = 'Health Care' THEN 5000000000 + 45000000000 * f.SIZE_DRAW
+                    ELSE 500000000 + 19500000000 * f.SIZE_DRAW
+                END * UNIFORM(0.95, 1.05, {quarter_gen['revenue']})) as BASE_REVENUE,
+                -- Net margin follows company quality (+/-2 points quarterly variation)
                 CASE 
-                    WHEN es.GICS_SECTOR = 'Information Technology' THEN UNIFORM(0.15, 0.35, RANDOM())
-                    WHEN es.GICS_SECTOR = 'Health Care' THEN UNIFORM(0.20, 0.40, RANDOM())
-                    ELSE UNIFORM(0.05, 0.25, RANDOM())
-                END as NET_MARGIN
-            FROM equity_securities es
-            CROSS JOIN quarters q
+                    WHEN f.GICS_Sector = 'Information Technology' THEN 0.15 + 0.20 * f.QUALITY_DRAW
+                    WHEN f.GICS_Sector = 'Health Care' THEN 0.20 + 0.20 * f.QUALITY_DRAW
+                    ELSE 0.05 + 0.20 * f.QUALITY_DRAW
+                END + UNIFORM(-0.02, 0.02, {quarter_gen['net_margin']}) as NET_MARGIN
+            FROM {config.DATABASE_NAME}.CURATED.EQUITY_UNIVERSE_CALENDAR f
+            WHERE f.IS_QUARTER
         )
         SELECT SECURITY_ID, REPORTING_DATE, FISCAL_QUARTER, 'Total Revenue' as METRIC_NAME, BASE_REVENUE as METRIC_VALUE, 'USD' as CURRENCY FROM base_metrics
         UNION ALL
         SELECT SECURITY_ID, REPORTING_DATE, FISCAL_QUARTER, 'Net Income' as METRIC_NAME, BASE_REVENUE * NET_MARGIN as METRIC_VALUE, 'USD' as CURRENCY FROM base_metrics
         UNION ALL  
-        SELECT SECURITY_ID, REPORTING_DATE, FISCAL_QUARTER, 'EPS' as METRIC_NAME, (BASE_REVENUE * NET_MARGIN) / UNIFORM(1000000000, 10000000000, RANDOM()) as METRIC_VALUE, 'USD' as CURRENCY FROM base_metrics
+        SELECT SECURITY_ID, REPORTING_DATE, FISCAL_QUARTER, 'EPS' as METRIC_NAME, (BASE_REVENUE * NET_MARGIN) / UNIFORM(1000000000, 10000000000, {metric_gen['shares_outstanding']}) as METRIC_VALUE, 'USD' as CURRENCY FROM base_metrics
         UNION ALL
-        SELECT SECURITY_ID, REPORTING_DATE, FISCAL_QUARTER, 'Trailing P/E' as METRIC_NAME, UNIFORM(10, 40, RANDOM()) as METRIC_VALUE, 'USD' as CURRENCY FROM base_metrics
+        -- Value stocks trade on lower multiples (whole multiples from 10x to 40x, moving +/-3x per quarter)
+        SELECT SECURITY_ID, REPORTING_DATE, FISCAL_QUARTER, 'Trailing P/E' as METRIC_NAME, LEAST(40, GREATEST(10, ROUND(40 - 30 * VALUE_DRAW) + UNIFORM(-3, 3, {metric_gen['trailing_pe']}))) as METRIC_VALUE, 'USD' as CURRENCY FROM base_metrics
         UNION ALL
-        SELECT SECURITY_ID, REPORTING_DATE, FISCAL_QUARTER, 'Revenue Growth' as METRIC_NAME, UNIFORM(-0.1, 0.3, RANDOM()) as METRIC_VALUE, 'USD' as CURRENCY FROM base_metrics
+        SELECT SECURITY_ID, REPORTING_DATE, FISCAL_QUARTER, 'Revenue Growth' as METRIC_NAME, UNIFORM(-0.1, 0.3, {metric_gen['revenue_growth']}) as METRIC_VALUE, 'USD' as CURRENCY FROM base_metrics
     """).collect()
     
     # Build estimates table with guidance
@@ -649,6 +737,7 @@ def build_fundamentals_and_estimates(session: Session):
                     WHEN QUARTER(f.REPORTING_DATE) = 4 THEN 'Q1 ' || (YEAR(f.REPORTING_DATE) + 1)
                     ELSE 'Q' || (QUARTER(f.REPORTING_DATE) + 1) || ' ' || YEAR(f.REPORTING_DATE)
                 END as FISCAL_PERIOD,
+                f.METRIC_NAME,
                 f.METRIC_VALUE
             FROM {config.DATABASE_NAME}.CURATED.FACT_FUNDAMENTALS f
             WHERE f.METRIC_NAME IN ('Total Revenue', 'EPS')
@@ -658,9 +747,9 @@ def build_fundamentals_and_estimates(session: Session):
             ESTIMATE_DATE,
             FISCAL_PERIOD,
             CASE WHEN METRIC_VALUE > 1000000 THEN 'Revenue Estimate' ELSE 'EPS Estimate' END as METRIC_NAME,
-            METRIC_VALUE * (1 + UNIFORM(-0.1, 0.1, RANDOM())) as ESTIMATE_VALUE,
-            METRIC_VALUE * (1 + UNIFORM(-0.15, -0.05, RANDOM())) as GUIDANCE_LOW,
-            METRIC_VALUE * (1 + UNIFORM(0.05, 0.15, RANDOM())) as GUIDANCE_HIGH,
+            METRIC_VALUE * (1 + UNIFORM(-0.1, 0.1, {estimate_gen['estimate']})) as ESTIMATE_VALUE,
+            METRIC_VALUE * (1 + UNIFORM(-0.15, -0.05, {estimate_gen['guidance_low']})) as GUIDANCE_LOW,
+            METRIC_VALUE * (1 + UNIFORM(0.05, 0.15, {estimate_gen['guidance_high']})) as GUIDANCE_HIGH,
             'USD' as CURRENCY
         FROM estimate_base
     """).collect()
@@ -670,48 +759,39 @@ def build_fundamentals_and_estimates(session: Session):
 def build_esg_scores(session: Session):
     """Build ESG scores with SecurityID linkage using efficient SQL generation."""
     
+    # Seeded by security and quarter
+    gen = {draw: seeded_random('FACT_ESG_SCORES', draw, 'es.SecurityID', 'es.CALENDAR_DATE')
+           for draw in ['environmental', 'social', 'governance']}
+    
     session.sql(f"""
         -- Generate synthetic ESG scores with sector-specific characteristics and regional variations
         -- Creates Environmental, Social, Governance scores (0-100) with realistic distributions
         CREATE OR REPLACE TABLE {config.DATABASE_NAME}.CURATED.FACT_ESG_SCORES AS
-        WITH equity_securities AS (
-            SELECT 
-                s.SecurityID,
-                s.Ticker,
-                i.GICS_Sector,
-                i.CountryOfIncorporation
-            FROM {config.DATABASE_NAME}.CURATED.DIM_SECURITY s
-            JOIN {config.DATABASE_NAME}.CURATED.DIM_ISSUER i ON s.IssuerID = i.IssuerID
-            WHERE s.AssetClass = 'Equity'
-        ),
-        scoring_dates AS (
-            SELECT DATEADD(quarter, seq4(), DATEADD(year, -{config.YEARS_OF_HISTORY}, CURRENT_DATE())) as SCORE_DATE
-            FROM TABLE(GENERATOR(rowcount => {4 * config.YEARS_OF_HISTORY}))
-        ),
-        base_scores AS (
+        WITH base_scores AS (
             SELECT 
                 es.SecurityID,
-                sd.SCORE_DATE,
+                es.CALENDAR_DATE as SCORE_DATE,
                 -- Environmental score (sector-specific)
                 CASE 
-                    WHEN es.GICS_Sector = 'Utilities' THEN UNIFORM(20, 60, RANDOM())
-                    WHEN es.GICS_Sector = 'Energy' THEN UNIFORM(15, 50, RANDOM())
-                    WHEN es.GICS_Sector = 'Information Technology' THEN UNIFORM(60, 95, RANDOM())
-                    ELSE UNIFORM(40, 80, RANDOM())
+                    WHEN es.GICS_Sector = 'Utilities' THEN UNIFORM(20, 60, {gen['environmental']})
+                    WHEN es.GICS_Sector = 'Energy' THEN UNIFORM(15, 50, {gen['environmental']})
+                    WHEN es.GICS_Sector = 'Information Technology' THEN UNIFORM(60, 95, {gen['environmental']})
+                    ELSE UNIFORM(40, 80, {gen['environmental']})
                 END as E_SCORE,
                 -- Social score (region-specific bias)
                 CASE 
-                    WHEN es.CountryOfIncorporation IN ('US', 'CA') THEN UNIFORM(50, 85, RANDOM())
-                    WHEN es.CountryOfIncorporation IN ('DE', 'FR', 'SE', 'DK') THEN UNIFORM(60, 90, RANDOM())
-                    ELSE UNIFORM(45, 75, RANDOM())
+                    WHEN es.CountryOfIncorporation IN ('US', 'CA') THEN UNIFORM(50, 85, {gen['social']})
+                    WHEN es.CountryOfIncorporation IN ('DE', 'FR', 'SE', 'DK') THEN UNIFORM(60, 90, {gen['social']})
+                    ELSE UNIFORM(45, 75, {gen['social']})
                 END as S_SCORE,
-                -- Governance score (generally high for developed markets)
+                -- Governance score (generally high for developed markets, follows company quality, +/-5 per quarter)
                 CASE 
-                    WHEN es.CountryOfIncorporation IN ('US', 'CA', 'GB', 'DE', 'FR', 'SE', 'DK') THEN UNIFORM(65, 95, RANDOM())
-                    ELSE UNIFORM(40, 70, RANDOM())
+                    WHEN es.CountryOfIncorporation IN ('US', 'CA', 'GB', 'DE', 'FR', 'SE', 'DK') 
+                        THEN LEAST(95, GREATEST(65, ROUND(65 + 30 * es.QUALITY_DRAW) + UNIFORM(-5, 5, {gen['governance']})))
+                    ELSE LEAST(70, GREATEST(40, ROUND(40 + 30 * es.QUALITY_DRAW) + UNIFORM(-5, 5, {gen['governance']})))
                 END as G_SCORE
-            FROM equity_securities es
-            CROSS JOIN scoring_dates sd
+            FROM {config.DATABASE_NAME}.CURATED.EQUITY_UNIVERSE_CALENDAR es
+            WHERE es.IS_QUARTER
         )
         SELECT 
             SecurityID,
@@ -748,59 +828,48 @@ def build_esg_scores(session: Session):
 def build_factor_exposures(session: Session):
     """Build factor exposures with SecurityID linkage using efficient SQL generation."""
     
+    # Seeded by security and month
+    gen = {draw: seeded_random('FACT_FACTOR_EXPOSURES', draw, 'es.SecurityID', 'es.CALENDAR_DATE')
+           for draw in ['market_beta', 'size', 'value', 'momentum', 'quality', 'volatility']}
+    
     session.sql(f"""
         -- Generate synthetic factor exposures (Value, Growth, Quality, etc.) for equity securities
         -- Creates factor loadings with sector-specific characteristics and realistic correlations
         CREATE OR REPLACE TABLE {config.DATABASE_NAME}.CURATED.FACT_FACTOR_EXPOSURES AS
-        WITH equity_securities AS (
-            SELECT 
-                s.SecurityID,
-                s.Ticker,
-                i.GICS_Sector,
-                i.CountryOfIncorporation
-            FROM {config.DATABASE_NAME}.CURATED.DIM_SECURITY s
-            JOIN {config.DATABASE_NAME}.CURATED.DIM_ISSUER i ON s.IssuerID = i.IssuerID
-            WHERE s.AssetClass = 'Equity'
-        ),
-        monthly_dates AS (
-            SELECT DATEADD(month, seq4(), DATEADD(year, -{config.YEARS_OF_HISTORY}, CURRENT_DATE())) as EXPOSURE_DATE
-            FROM TABLE(GENERATOR(rowcount => {12 * config.YEARS_OF_HISTORY}))
-        ),
-        base_exposures AS (
+        WITH base_exposures AS (
             SELECT 
                 es.SecurityID,
-                md.EXPOSURE_DATE,
+                es.CALENDAR_DATE as EXPOSURE_DATE,
                 -- Market beta (sector-specific)
                 CASE 
-                    WHEN es.GICS_Sector = 'Utilities' THEN UNIFORM(0.4, 0.8, RANDOM())
-                    WHEN es.GICS_Sector = 'Information Technology' THEN UNIFORM(0.9, 1.4, RANDOM())
-                    WHEN es.GICS_Sector = 'Health Care' THEN UNIFORM(0.6, 1.1, RANDOM())
-                    ELSE UNIFORM(0.7, 1.2, RANDOM())
+                    WHEN es.GICS_Sector = 'Utilities' THEN UNIFORM(0.4, 0.8, {gen['market_beta']})
+                    WHEN es.GICS_Sector = 'Information Technology' THEN UNIFORM(0.9, 1.4, {gen['market_beta']})
+                    WHEN es.GICS_Sector = 'Health Care' THEN UNIFORM(0.6, 1.1, {gen['market_beta']})
+                    ELSE UNIFORM(0.7, 1.2, {gen['market_beta']})
                 END as MARKET_BETA,
-                -- Size factor (small vs large cap)
-                UNIFORM(-0.5, 0.8, RANDOM()) as SIZE_FACTOR,
-                -- Value factor (sector-specific)
+                -- Size factor (small vs large cap: large companies load negatively, +/-0.1 monthly drift)
+                0.8 - 1.3 * es.SIZE_DRAW + UNIFORM(-0.1, 0.1, {gen['size']}) as SIZE_FACTOR,
+                -- Value factor (sector-specific, follows company valuation, +/-0.1 monthly drift)
                 CASE 
-                    WHEN es.GICS_Sector = 'Information Technology' THEN UNIFORM(-0.3, 0.2, RANDOM())
-                    WHEN es.GICS_Sector = 'Energy' THEN UNIFORM(0.1, 0.6, RANDOM())
-                    ELSE UNIFORM(-0.2, 0.4, RANDOM())
-                END as VALUE_FACTOR,
+                    WHEN es.GICS_Sector = 'Information Technology' THEN -0.3 + 0.5 * es.VALUE_DRAW
+                    WHEN es.GICS_Sector = 'Energy' THEN 0.1 + 0.5 * es.VALUE_DRAW
+                    ELSE -0.2 + 0.6 * es.VALUE_DRAW
+                END + UNIFORM(-0.1, 0.1, {gen['value']}) as VALUE_FACTOR,
                 -- Momentum factor
-                UNIFORM(-0.4, 0.4, RANDOM()) as MOMENTUM_FACTOR,
-                -- Quality factor
+                UNIFORM(-0.4, 0.4, {gen['momentum']}) as MOMENTUM_FACTOR,
+                -- Quality factor (follows company quality, +/-0.1 monthly drift)
                 CASE 
-                    WHEN es.GICS_Sector = 'Information Technology' THEN UNIFORM(0.2, 0.7, RANDOM())
-                    WHEN es.GICS_Sector = 'Health Care' THEN UNIFORM(0.1, 0.5, RANDOM())
-                    ELSE UNIFORM(-0.2, 0.3, RANDOM())
-                END as QUALITY_FACTOR,
+                    WHEN es.GICS_Sector = 'Information Technology' THEN 0.2 + 0.5 * es.QUALITY_DRAW
+                    WHEN es.GICS_Sector = 'Health Care' THEN 0.1 + 0.4 * es.QUALITY_DRAW
+                    ELSE -0.2 + 0.5 * es.QUALITY_DRAW
+                END + UNIFORM(-0.1, 0.1, {gen['quality']}) as QUALITY_FACTOR,
                 -- Volatility factor
                 CASE 
-                    WHEN es.GICS_Sector = 'Utilities' THEN UNIFORM(-0.3, 0.1, RANDOM())
-                    WHEN es.GICS_Sector = 'Information Technology' THEN UNIFORM(-0.1, 0.4, RANDOM())
-                    ELSE UNIFORM(-0.2, 0.2, RANDOM())
+                    WHEN es.GICS_Sector = 'Utilities' THEN UNIFORM(-0.3, 0.1, {gen['volatility']})
+                    WHEN es.GICS_Sector = 'Information Technology' THEN UNIFORM(-0.1, 0.4, {gen['volatility']})
+                    ELSE UNIFORM(-0.2, 0.2, {gen['volatility']})
                 END as VOLATILITY_FACTOR
-            FROM equity_securities es
-            CROSS JOIN monthly_dates md
+            FROM {config.DATABASE_NAME}.CURATED.EQUITY_UNIVERSE_CALENDAR es
         )
         SELECT SecurityID, EXPOSURE_DATE, 'Market' as FACTOR_NAME, MARKET_BETA as EXPOSURE_VALUE, 0.95 as R_SQUARED FROM base_exposures
         UNION ALL
@@ -820,27 +889,16 @@ def build_factor_exposures(session: Session):
 def build_benchmark_holdings(session: Session):
     """Build benchmark holdings with SecurityID linkage using efficient SQL generation."""
     
+    # Seeded by benchmark, security and month
+    weight_gen = seeded_random('FACT_BENCHMARK_HOLDINGS', 'weight', 'BenchmarkID', 'SecurityID', 'HOLDING_DATE')
+    
     session.sql(f"""
         -- Generate synthetic benchmark holdings for major indices (S&P 500, MSCI ACWI, Nasdaq 100)
         -- Creates realistic index compositions with market-cap weighted allocations
         CREATE OR REPLACE TABLE {config.DATABASE_NAME}.CURATED.FACT_BENCHMARK_HOLDINGS AS
-        WITH equity_securities AS (
-            SELECT 
-                s.SecurityID,
-                s.Ticker,
-                i.GICS_Sector,
-                i.CountryOfIncorporation
-            FROM {config.DATABASE_NAME}.CURATED.DIM_SECURITY s
-            JOIN {config.DATABASE_NAME}.CURATED.DIM_ISSUER i ON s.IssuerID = i.IssuerID
-            WHERE s.AssetClass = 'Equity'
-        ),
-        benchmarks AS (
+        WITH benchmarks AS (
             SELECT BenchmarkID, BenchmarkName FROM {config.DATABASE_NAME}.CURATED.DIM_BENCHMARK
         ),
-        monthly_dates AS (
-            SELECT LAST_DAY(DATEADD(month, seq4(), DATEADD(year, -{config.YEARS_OF_HISTORY}, CURRENT_DATE()))) as HOLDING_DATE
-            FROM TABLE(GENERATOR(rowcount => {12 * config.YEARS_OF_HISTORY}))
-        ),
         benchmark_universe AS (
             SELECT 
                 b.BenchmarkID,
@@ -849,28 +907,36 @@ def build_benchmark_holdings(session: Session):
                 es.TICKER,
                 es.GICS_Sector,
                 es.CountryOfIncorporation,
-                md.HOLDING_DATE,
-                -- Weight logic based on benchmark type
+                es.MONTH_END_DATE as HOLDING_DATE,
+                -- Weight logic based on benchmark type, scaled by company size (market-cap weighting)
                 CASE 
-                    WHEN b.BenchmarkName = 'S&P 500' AND es.CountryOfIncorporation = 'US' THEN UNIFORM(0.001, 0.07, RANDOM())
+                    WHEN b.BenchmarkName = 'S&P 500' AND es.CountryOfIncorporation = 'US' THEN 0.001 + 0.069 * es.SIZE_DRAW
                     WHEN b.BenchmarkName = 'MSCI ACWI' THEN 
                         CASE 
-                            WHEN es.CountryOfIncorporation = 'US' THEN UNIFORM(0.001, 0.05, RANDOM())
-                            ELSE UNIFORM(0.0001, 0.01, RANDOM())
+                            WHEN es.CountryOfIncorporation = 'US' THEN 0.001 + 0.049 * es.SIZE_DRAW
+                            ELSE 0.0001 + 0.0099 * es.SIZE_DRAW
                         END
-                    WHEN b.BenchmarkName = 'Nasdaq 100' AND es.GICS_Sector = 'Information Technology' THEN UNIFORM(0.005, 0.12, RANDOM())
+                    WHEN b.BenchmarkName = 'Nasdaq 100' AND es.GICS_Sector = 'Information Technology' THEN 0.005 + 0.115 * es.SIZE_DRAW
                     ELSE NULL
-                END as RAW_WEIGHT,
-                ROW_NUMBER() OVER (PARTITION BY b.BenchmarkID, md.HOLDING_DATE ORDER BY RANDOM()) as rn
+                END as BASE_WEIGHT
             FROM benchmarks b
-            CROSS JOIN equity_securities es
-            CROSS JOIN monthly_dates md
+            CROSS JOIN {config.DATABASE_NAME}.CURATED.EQUITY_UNIVERSE_CALENDAR es
         ),
-        filtered_holdings AS (
-            SELECT *
+        ranked_universe AS (
+            -- Largest eligible companies are the index constituents, stable across dates
+            SELECT 
+                *,
+                ROW_NUMBER() OVER (PARTITION BY BenchmarkID, HOLDING_DATE ORDER BY BASE_WEIGHT DESC, SecurityID) as rn
             FROM benchmark_universe
-            WHERE RAW_WEIGHT IS NOT NULL
-            AND (
+            WHERE BASE_WEIGHT IS NOT NULL
+        ),
+        filtered_holdings AS (
+            -- Monthly +/-10% weight drift around the size-based weight
+            SELECT 
+                *,
+                BASE_WEIGHT * UNIFORM(0.9, 1.1, {weight_gen}) as RAW_WEIGHT
+            FROM ranked_universe
+            WHERE (
                 (BenchmarkName = 'S&P 500' AND rn <= 500) OR
                 (BenchmarkName = 'MSCI ACWI' AND rn <= 800) OR
                 (BenchmarkName = 'Nasdaq 100' AND rn <= 100)
@@ -894,6 +960,96 @@ def build_benchmark_holdings(session: Session):
     
     print("✅ Created benchmark holdings with realistic index compositions")
 
+def build_position_rollups(session: Session):
+    """
+    Build dynamic tables that pre-aggregate holdings for the SAM agent's hot queries.
+    
+    Latest positions, sector/country exposures and issuer concentration flags are
+    maintained by Snowflake from FACT_POSITION_DAILY_ABOR, DIM_SECURITY and DIM_ISSUER
+    within ROLLUP_TARGET_LAG, so SAM_ANALYST_VIEW can answer from small tables
+    instead of joining the full position history at query time.
+    """
+    
+    curated = f"{config.DATABASE_NAME}.CURATED"
+    concentration = config.COMPLIANCE_RULES['concentration']
+    
+    # Window functions need Snowflake to pick the refresh mode; the GROUP BY rollups over the fact table refresh incrementally.
+    # PORTFOLIO_CONCENTRATION reads POSITION_LATEST, and an incremental dynamic table can't sit downstream of a
+    # full-refresh one, so it is AUTO too (incremental whenever POSITION_LATEST is)
+    session.sql(f"""
+        -- Latest positions per portfolio with security and issuer attributes denormalised
+        CREATE OR REPLACE DYNAMIC TABLE {curated}.POSITION_LATEST
+            TARGET_LAG = '{config.ROLLUP_TARGET_LAG}'
+            WAREHOUSE = {config.EXECUTION_WAREHOUSE}
+            REFRESH_MODE = AUTO
+        AS
+        SELECT 
+            p.HoldingDate,
+            p.PortfolioID,
+            p.SecurityID,
+            s.IssuerID,
+            s.Ticker,
+            s.Description,
+            s.AssetClass,
+            i.LegalName,
+            i.GICS_Sector,
+            i.CountryOfIncorporation,
+            p.Quantity,
+            p.MarketValue_Base,
+            p.PortfolioWeight
+        FROM {curated}.FACT_POSITION_DAILY_ABOR p
+        JOIN {curated}.DIM_SECURITY s ON p.SecurityID = s.SecurityID
+        JOIN {curated}.DIM_ISSUER i ON s.IssuerID = i.IssuerID
+        QUALIFY p.HoldingDate = MAX(p.HoldingDate) OVER (PARTITION BY p.PortfolioID)
+    """).collect()
+    
+    for rollup_name, exposure_column in [('PORTFOLIO_SECTOR_EXPOSURE', 'GICS_Sector'),
+                                         ('PORTFOLIO_COUNTRY_EXPOSURE', 'CountryOfIncorporation')]:
+        session.sql(f"""
+            -- {exposure_column} exposure per portfolio and holding date
+            CREATE OR REPLACE DYNAMIC TABLE {curated}.{rollup_name}
+                TARGET_LAG = '{config.ROLLUP_TARGET_LAG}'
+                WAREHOUSE = {config.EXECUTION_WAREHOUSE}
+                REFRESH_MODE = INCREMENTAL
+            AS
+            SELECT 
+                p.HoldingDate,
+                p.PortfolioID,
+                i.{exposure_column},
+                SUM(p.MarketValue_Base) as MarketValue_Base,
+                SUM(p.PortfolioWeight) as PortfolioWeight,
+                COUNT(*) as HoldingCount
+            FROM {curated}.FACT_POSITION_DAILY_ABOR p
+            JOIN {curated}.DIM_SECURITY s ON p.SecurityID = s.SecurityID
+            JOIN {curated}.DIM_ISSUER i ON s.IssuerID = i.IssuerID
+            GROUP BY p.HoldingDate, p.PortfolioID, i.{exposure_column}
+        """).collect()
+    
+    session.sql(f"""
+        -- Issuer concentration on the latest holding date, flagged against COMPLIANCE_RULES
+        CREATE OR REPLACE DYNAMIC TABLE {curated}.PORTFOLIO_CONCENTRATION
+            TARGET_LAG = '{config.ROLLUP_TARGET_LAG}'
+            WAREHOUSE = {config.EXECUTION_WAREHOUSE}
+            REFRESH_MODE = AUTO
+        AS
+        SELECT 
+            HoldingDate,
+            PortfolioID,
+            IssuerID,
+            LegalName,
+            SUM(MarketValue_Base) as MarketValue_Base,
+            SUM(PortfolioWeight) as IssuerWeight,
+            CASE 
+                WHEN SUM(PortfolioWeight) > {concentration['max_single_issuer']} THEN 'BREACH'
+                WHEN SUM(PortfolioWeight) > {concentration['warning_threshold']} THEN 'WARNING'
+                ELSE 'OK'
+            END as ConcentrationStatus
+        FROM {curated}.POSITION_LATEST
+        GROUP BY HoldingDate, PortfolioID, IssuerID, LegalName
+    """).collect()
+    
+    print("✅ Created holdings rollups: POSITION_LATEST, PORTFOLIO_SECTOR_EXPOSURE, PORTFOLIO_COUNTRY_EXPOSURE, PORTFOLIO_CONCENTRATION")
+
 def build_scenario_data(session: Session, scenario: str):
     """Build scenario-specific data."""
     print(f"⏭️  Scenario data for {scenario} - placeholder")
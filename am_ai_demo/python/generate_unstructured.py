@@ -13,160 +13,62 @@ This module generates realistic unstructured documents including:
 from snowflake.snowpark import Session
 from snowflake.snowpark.functions import col, lit, call_function
 from typing import List
-import uuid
-import random
-from datetime import datetime, timedelta
+import time
 import config
+from build_scale import time_builder, record_builder
+from build_profile import get_statement_params
+from build_seed import seeded_random, get_as_of_date_sql
+from build_cache import create_cache_table
 
-def build_all(session: Session, document_types: List[str], test_mode: bool = False):
+def build_all(session: Session, document_types: List[str], scale_settings: dict, incremental: bool = False, build_stats: List[dict] = None):
     """
     Build all unstructured data for the specified document types.
     
     Args:
         session: Active Snowpark session
         document_types: List of document types to generate
-        test_mode: If True, use reduced document counts for faster testing
+        scale_settings: Build volumes from build_scale.get_scale_settings
+        incremental: If True, apply changes to existing RAW tables and corpus views
+            instead of replacing them (keeps Cortex Search services refreshing incrementally)
+        build_stats: Optional list that receives per-builder rows and timings
     """
+    if build_stats is None:
+        build_stats = []
+    
     print("📝 Starting unstructured data generation...")
     
     # Step 1: Generate prompts for each document type
     print("🎯 Generating content prompts...")
-    if test_mode:
-        print("🧪 Test mode: Using reduced document counts for faster generation")
-    generate_prompts(session, document_types, test_mode)
+    with time_builder(session, build_stats, 'GENERATION_PROMPTS', ['RAW.GENERATION_PROMPTS']):
+        generate_prompts(session, document_types, scale_settings)
     
     # Step 2: Generate content using Cortex Complete
     print("🤖 Generating content with LLM...")
-    generate_content(session, document_types)
+    generate_content(session, document_types, incremental, build_stats)
     
-    # Step 3: Normalize to corpus tables
-    print("📚 Creating normalized corpus tables...")
-    create_corpus_tables(session, document_types)
+    # Step 3: Expose normalized corpus views over the RAW tables
+    print("📚 Creating normalized corpus views...")
+    with time_builder(session, build_stats, 'Corpus views'):
+        create_corpus_tables(session, document_types, incremental)
     
     print("✅ Unstructured data generation complete")
 
-def generate_prompts(session: Session, document_types: List[str], test_mode: bool = False):
-    """Generate detailed prompts for each document type and store in RAW.GENERATION_PROMPTS."""
-    
-    # Create prompts table with SecurityID and IssuerID support
-    session.sql(f"""
-        CREATE OR REPLACE TABLE {config.DATABASE_NAME}.RAW.GENERATION_PROMPTS (
-            PROMPT_ID VARCHAR PRIMARY KEY,
-            DOCUMENT_TYPE VARCHAR NOT NULL,
-            SecurityID BIGINT,                            -- New: immutable SecurityID
-            IssuerID BIGINT,                              -- New: issuer linkage
-            TICKER VARCHAR,
-            COMPANY_NAME VARCHAR,
-            GICS_SECTOR VARCHAR,
-            PROMPT_TEXT TEXT NOT NULL,
-            MODEL_NAME VARCHAR DEFAULT '{config.MODEL_NAME}',
-            CREATED_TIMESTAMP TIMESTAMP DEFAULT CURRENT_TIMESTAMP()
-        )
-    """).collect()
-    
-    # Get securities data for context using new SecurityID model
-    # Prioritize real tickers (non-pattern tickers) for better demo quality
-    securities = session.sql(f"""
-        SELECT 
-            ds.SecurityID,
-            ds.Ticker,
-            ds.Description as COMPANY_NAME,
-            di.GICS_Sector,
-            ds.AssetClass,
-            di.CountryOfIncorporation as COUNTRY_OF_DOMICILE,
-            di.IssuerID,
-            di.LegalName as ISSUER_NAME
-        FROM {config.DATABASE_NAME}.CURATED.DIM_SECURITY ds
-        JOIN {config.DATABASE_NAME}.CURATED.DIM_ISSUER di ON ds.IssuerID = di.IssuerID
-        WHERE ds.AssetClass = 'Equity'
-        ORDER BY 
-            -- Prioritize major US stocks that are in portfolios and demo scenarios
-            CASE 
-                WHEN ds.Ticker IN ('AAPL', 'CMC', 'RBBN', 'MSFT', 'NVDA', 'GOOGL', 'AMZN', 'TSLA', 'META', 'NFLX', 'CRM', 'ORCL') THEN 1
-                WHEN ds.Ticker RLIKE '^[A-Z]{{1,5}}$' AND LENGTH(ds.Ticker) <= 5 THEN 2  -- Other real US tickers
-                WHEN ds.Ticker RLIKE '^(EQ|CB|ETF)[0-9]+$' THEN 4  -- Synthetic tickers (shouldn't exist anymore)
-                ELSE 3  -- Other real tickers
-            END,
-            -- Then order alphabetically within each group
-            ds.Ticker
-    """).collect()
-    
-    prompt_data = []
-    
-    # Use test mode counts if specified
-    doc_counts = config.TEST_UNSTRUCTURED_COUNTS if test_mode else config.UNSTRUCTURED_COUNTS
-    coverage_multiplier = 0.1 if test_mode else 1.0  # Reduce coverage in test mode
-    
-    for doc_type in document_types:
-        print(f"📝 Generating prompts for: {doc_type}")
-        
-        if doc_type == 'broker_research':
-            # Generate broker research prompts for equities
-            coverage_count = int(400 * coverage_multiplier)  # Reduce coverage in test mode
-            for security in securities[:coverage_count]:
-                for report_num in range(doc_counts['broker_research']):
-                    prompt_data.append(generate_broker_research_prompt(security, report_num))
-        
-        elif doc_type == 'earnings_transcripts':
-            # Generate earnings transcript prompts
-            coverage_count = int(400 * coverage_multiplier)
-            for security in securities[:coverage_count]:
-                for transcript_num in range(doc_counts['earnings_transcripts']):
-                    transcript_type = 'Summary' if transcript_num == 0 else 'Q&A'
-                    prompt_data.append(generate_earnings_transcript_prompt(security, transcript_type))
-        
-        elif doc_type == 'press_releases':
-            # Generate press release prompts
-            coverage_count = int(800 * coverage_multiplier)
-            for security in securities[:coverage_count]:
-                prompt_data.append(generate_press_release_prompt(security))
-        
-        elif doc_type == 'ngo_reports':
-            # Generate NGO report prompts (issuer level)
-            coverage_count = int(250 * coverage_multiplier)
-            for security in securities[:coverage_count]:
-                for report_num in range(doc_counts['ngo_reports']):
-                    prompt_data.append(generate_ngo_report_prompt(security, report_num))
-        
-        elif doc_type == 'engagement_notes':
-            # Generate engagement note prompts
-            coverage_count = int(150 * coverage_multiplier)
-            for security in securities[:coverage_count]:
-                prompt_data.append(generate_engagement_note_prompt(security))
-        
-        elif doc_type in ['policy_docs', 'sales_templates', 'philosophy_docs']:
-            # Generate global document prompts (not security-specific)
-            count = doc_counts[doc_type]
-            for doc_num in range(count):
-                prompt_data.append(generate_global_document_prompt(doc_type, doc_num))
-    
-    # Save all prompts
-    if prompt_data:
-        prompts_df = session.create_dataframe(prompt_data)
-        prompts_df.write.mode("overwrite").save_as_table(f"{config.DATABASE_NAME}.RAW.GENERATION_PROMPTS")
-        print(f"✅ Generated {len(prompt_data)} content prompts")
+# =============================================================================
+# Prompt templates
+# Placeholders in {BRACES} are rendered in-warehouse (see PROMPT_PLACEHOLDERS).
+# =============================================================================
 
-def generate_broker_research_prompt(security: dict, report_num: int) -> dict:
-    """Generate broker research report prompt."""
-    
-    ratings = ['Strong Buy', 'Buy', 'Hold', 'Sell', 'Strong Sell']
-    rating_weights = [0.10, 0.25, 0.45, 0.15, 0.05]  # Realistic distribution
-    rating = random.choices(ratings, weights=rating_weights)[0]
-    
-    broker_names = ['Goldman Sachs', 'Morgan Stanley', 'J.P. Morgan', 'Bank of America', 'Barclays', 'UBS']
-    broker = random.choice(broker_names)
-    
-    prompt_text = f"""You are a senior equity research analyst at {broker}. Write a comprehensive research report for {security['COMPANY_NAME']} ({security['TICKER']}) with a {rating} rating.
+BROKER_RESEARCH_TEMPLATE = """You are a senior equity research analyst at {BROKER}. Write a comprehensive research report for {COMPANY_NAME} ({TICKER}) with a {RATING} rating.
 
 Structure your report as follows:
 
-# {security['COMPANY_NAME']} ({security['TICKER']}) - {rating}
+# {COMPANY_NAME} ({TICKER}) - {RATING}
 
 ## Executive Summary
-Write 2-3 sentences summarising your investment thesis and rating rationale for this {security['GICS_SECTOR']} company.
+Write 2-3 sentences summarising your investment thesis and rating rationale for this {GICS_SECTOR} company.
 
 ## Investment Highlights
-- **Strong Market Position**: Describe competitive advantages in the {security['GICS_SECTOR']} sector
+- **Strong Market Position**: Describe competitive advantages in the {GICS_SECTOR} sector
 - **Growth Drivers**: Identify 2-3 key revenue and earnings growth catalysts
 - **Financial Strength**: Highlight balance sheet and profitability metrics
 
@@ -181,38 +83,15 @@ Write 2-3 sentences summarising your investment thesis and rating rationale for
 - Include brief valuation methodology
 
 ## Recommendation
-Conclude with {rating} recommendation and key rationale.
+Conclude with {RATING} recommendation and key rationale.
 
 Use professional, confident tone. Include specific financial metrics and industry context. Write 700-1200 words in UK English."""
-    
-    return {
-        'PROMPT_ID': str(uuid.uuid4()),
-        'DOCUMENT_TYPE': 'Broker Research Report',
-        'SecurityID': security['SECURITYID'],
-        'IssuerID': security['ISSUERID'],
-        'TICKER': security['TICKER'],
-        'COMPANY_NAME': security['COMPANY_NAME'],
-        'GICS_SECTOR': security['GICS_SECTOR'],
-        'PROMPT_TEXT': prompt_text
-    }
-
-def generate_earnings_transcript_prompt(security: dict, transcript_type: str) -> dict:
-    """Generate earnings transcript prompt."""
-    
-    # Generate a more realistic quarter distribution
-    # For demo purposes, we'll generate transcripts for the last 4 quarters
-    current_date = datetime.now()
-    quarters_back = random.randint(0, 3)
-    quarter_date = current_date - timedelta(days=90 * quarters_back)
-    quarter = f'Q{((quarter_date.month - 1) // 3) + 1}'
-    year = quarter_date.year
-    
-    if transcript_type == 'Summary':
-        prompt_text = f"""You are summarising an earnings call transcript for {security['COMPANY_NAME']} ({security['TICKER']}) {quarter} {year} earnings call.
+
+EARNINGS_SUMMARY_TEMPLATE = """You are summarising an earnings call transcript for {COMPANY_NAME} ({TICKER}) {QUARTER} {YEAR} earnings call.
 
 Create a comprehensive earnings call summary:
 
-# {security['COMPANY_NAME']} {quarter} {year} Earnings Call Summary
+# {COMPANY_NAME} {QUARTER} {YEAR} Earnings Call Summary
 
 ## Key Financial Results
 - Revenue: $[realistic revenue for this sector]B (vs estimate $[estimate]B)
@@ -223,7 +102,7 @@ Create a comprehensive earnings call summary:
 Include 3-4 key quotes from CEO/CFO covering:
 - Business performance and market conditions
 - Strategic initiatives and investments
-- Sector-specific trends in {security['GICS_SECTOR']}
+- Sector-specific trends in {GICS_SECTOR}
 
 ## Q&A Key Points
 Summarise 2-3 important analyst questions and management responses covering:
@@ -232,20 +111,20 @@ Summarise 2-3 important analyst questions and management responses covering:
 - Capital allocation priorities
 
 ## Outlook
-Management's forward-looking statements and strategic priorities for the {security['GICS_SECTOR']} sector.
+Management's forward-looking statements and strategic priorities for the {GICS_SECTOR} sector.
 
 Write 6,000-10,000 words in UK English with realistic financial metrics and industry-specific commentary."""
-    else:  # Q&A
-        prompt_text = f"""You are creating Q&A excerpts from {security['COMPANY_NAME']} ({security['TICKER']}) {quarter} {year} earnings call.
+
+EARNINGS_QA_TEMPLATE = """You are creating Q&A excerpts from {COMPANY_NAME} ({TICKER}) {QUARTER} {YEAR} earnings call.
 
 Create realistic analyst Q&A excerpts:
 
-# {security['COMPANY_NAME']} {quarter} {year} Earnings Call - Q&A Excerpts
+# {COMPANY_NAME} {QUARTER} {YEAR} Earnings Call - Q&A Excerpts
 
 ## Analyst Questions and Management Responses
 
 Create 8-10 realistic Q&A exchanges covering:
-- Revenue growth outlook in {security['GICS_SECTOR']}
+- Revenue growth outlook in {GICS_SECTOR}
 - Margin expansion opportunities
 - Capital expenditure plans
 - Market share dynamics
@@ -256,31 +135,14 @@ Format each exchange as:
 **[CEO/CFO Name]**: [Detailed response with specific metrics and forward guidance]
 
 Write 2,500-4,000 words in UK English. Include realistic financial figures and sector-specific insights."""
-    
-    return {
-        'PROMPT_ID': str(uuid.uuid4()),
-        'DOCUMENT_TYPE': f'Earnings Transcript {transcript_type}',
-        'SecurityID': security['SECURITYID'],
-        'IssuerID': security['ISSUERID'],
-        'TICKER': security['TICKER'],
-        'COMPANY_NAME': security['COMPANY_NAME'],
-        'GICS_SECTOR': security['GICS_SECTOR'],
-        'PROMPT_TEXT': prompt_text
-    }
 
-def generate_press_release_prompt(security: dict) -> dict:
-    """Generate press release prompt."""
-    
-    release_types = ['Earnings', 'Product', 'Corporate', 'ESG']
-    release_type = random.choice(release_types)
-    
-    prompt_text = f"""You are writing a corporate press release for {security['COMPANY_NAME']} ({security['TICKER']}).
+PRESS_RELEASE_TEMPLATE = """You are writing a corporate press release for {COMPANY_NAME} ({TICKER}).
 
-Create a {release_type} press release:
+Create a {RELEASE_TYPE} press release:
 
-# {security['COMPANY_NAME']} [Headline Related to {release_type}]
+# {COMPANY_NAME} [Headline Related to {RELEASE_TYPE}]
 
-**[City, Date]** - {security['COMPANY_NAME']} ({security['TICKER']}), a leading {security['GICS_SECTOR']} company, today announced [key development].
+**[City, Date]** - {COMPANY_NAME} ({TICKER}), a leading {GICS_SECTOR} company, today announced [key development].
 
 ## Key Points
 - [Primary announcement with specific details]
@@ -290,101 +152,56 @@ Create a {release_type} press release:
 ## Management Commentary
 Include 1-2 quotes from CEO or relevant executive providing context and forward-looking statements.
 
-## About {security['COMPANY_NAME']}
-Brief company description highlighting position in {security['GICS_SECTOR']} sector.
+## About {COMPANY_NAME}
+Brief company description highlighting position in {GICS_SECTOR} sector.
 
 ## Forward-Looking Statements
 Standard disclaimer about forward-looking statements.
 
 Write 250-400 words in UK English with professional corporate tone. Include specific metrics where appropriate."""
-    
-    return {
-        'PROMPT_ID': str(uuid.uuid4()),
-        'DOCUMENT_TYPE': 'Press Release',
-        'SecurityID': security['SECURITYID'],
-        'IssuerID': security['ISSUERID'],
-        'TICKER': security['TICKER'],
-        'COMPANY_NAME': security['COMPANY_NAME'],
-        'GICS_SECTOR': security['GICS_SECTOR'],
-        'PROMPT_TEXT': prompt_text
-    }
 
-def generate_ngo_report_prompt(security: dict, report_num: int) -> dict:
-    """Generate NGO report prompt."""
-    
-    ngo_names = ['Global Labour Watch', 'Environmental Defence Fund', 'Corporate Accountability International', 
-                 'Oxfam', 'Human Rights Watch', 'Greenpeace', 'Transparency International']
-    ngo_name = random.choice(ngo_names)
-    
-    categories = ['Environmental', 'Social', 'Governance']
-    category = random.choice(categories)
-    
-    severity_levels = ['High', 'Medium', 'Low']
-    severity_weights = [0.1, 0.3, 0.6]  # Most reports are low-medium severity
-    severity = random.choices(severity_levels, weights=severity_weights)[0]
-    
-    # Select appropriate keywords based on category and severity
-    keywords = random.choice(config.ESG_CONTROVERSY_KEYWORDS[category.lower()][severity.lower()])
-    
-    prompt_text = f"""You are writing an NGO report from {ngo_name} about {category.lower()} issues at {security['COMPANY_NAME']}.
+NGO_REPORT_TEMPLATE = """You are writing an NGO report from {NGO_NAME} about {CATEGORY_LOWER} issues at {COMPANY_NAME}.
 
-Create a {severity.lower()}-severity NGO report:
+Create a {SEVERITY_LOWER}-severity NGO report:
 
-# {ngo_name} Report: {category} Concerns at {security['COMPANY_NAME']}
+# {NGO_NAME} Report: {CATEGORY} Concerns at {COMPANY_NAME}
 
-**Organisation**: {ngo_name}  
+**Organisation**: {NGO_NAME}  
 **Publication Date**: [Recent date]  
-**Companies Affected**: {security['COMPANY_NAME']} ({security['TICKER']})
+**Companies Affected**: {COMPANY_NAME} ({TICKER})
 
 ## Executive Summary
-Provide overview of the {category.lower()} investigation findings related to {keywords}.
+Provide overview of the {CATEGORY_LOWER} investigation findings related to {KEYWORD}.
 
 ## Key Findings
-- **{category} Issues**: Describe specific allegations or concerns related to {keywords}
+- **{CATEGORY} Issues**: Describe specific allegations or concerns related to {KEYWORD}
 - **Evidence**: Detail supporting documentation or investigation methods
 - **Company Response**: Include any official company statements or responses
 
 ## Recommendations
-List {ngo_name}'s recommended actions for the company and investors.
+List {NGO_NAME}'s recommended actions for the company and investors.
 
 ## Severity Assessment
-**Level**: {severity}  
-**Rationale**: Explain why this {severity.lower()} severity level was assigned based on {keywords}.
+**Level**: {SEVERITY}  
+**Rationale**: Explain why this {SEVERITY_LOWER} severity level was assigned based on {KEYWORD}.
 
-Write 400-800 words in UK English. Use factual, investigative tone appropriate for {severity.lower()} severity issues in the {security['GICS_SECTOR']} sector."""
-    
-    return {
-        'PROMPT_ID': str(uuid.uuid4()),
-        'DOCUMENT_TYPE': 'NGO Report',
-        'SecurityID': None,  # Issuer-level document
-        'IssuerID': security['ISSUERID'],
-        'TICKER': security['TICKER'],
-        'COMPANY_NAME': security['COMPANY_NAME'],
-        'GICS_SECTOR': security['GICS_SECTOR'],
-        'PROMPT_TEXT': prompt_text
-    }
+Write 400-800 words in UK English. Use factual, investigative tone appropriate for {SEVERITY_LOWER} severity issues in the {GICS_SECTOR} sector."""
 
-def generate_engagement_note_prompt(security: dict) -> dict:
-    """Generate ESG engagement note prompt."""
-    
-    meeting_types = ['Management Meeting', 'Shareholder Call', 'Site Visit']
-    meeting_type = random.choice(meeting_types)
-    
-    prompt_text = f"""You are an ESG analyst at Snowcrest Asset Management writing an engagement log after a {meeting_type.lower()} with {security['COMPANY_NAME']}.
+ENGAGEMENT_NOTE_TEMPLATE = """You are an ESG analyst at Snowcrest Asset Management writing an engagement log after a {MEETING_TYPE_LOWER} with {COMPANY_NAME}.
 
 Create an engagement note:
 
-# ESG Engagement Log: {security['COMPANY_NAME']} {meeting_type}
+# ESG Engagement Log: {COMPANY_NAME} {MEETING_TYPE}
 
 **Date**: [Recent date]  
-**Meeting Type**: {meeting_type}  
-**Participants**: SAM ESG Team, {security['COMPANY_NAME']} [relevant executives]
+**Meeting Type**: {MEETING_TYPE}  
+**Participants**: SAM ESG Team, {COMPANY_NAME} [relevant executives]
 
 ## Meeting Overview
 Brief summary of the engagement purpose and key topics discussed.
 
 ## ESG Topics Discussed
-- **Environmental**: [Specific environmental initiatives or concerns in {security['GICS_SECTOR']} context]
+- **Environmental**: [Specific environmental initiatives or concerns in {GICS_SECTOR} context]
 - **Social**: [Workforce, community, or supply chain topics]
 - **Governance**: [Board composition, executive compensation, or transparency issues]
 
@@ -400,25 +217,8 @@ List 2-3 specific commitments or actions management agreed to undertake.
 Brief evaluation of management's ESG commitment and progress.
 
 Write 150-300 words in UK English with professional, objective tone."""
-    
-    return {
-        'PROMPT_ID': str(uuid.uuid4()),
-        'DOCUMENT_TYPE': 'ESG Engagement Log',
-        'SecurityID': None,  # Issuer-level document
-        'IssuerID': security['ISSUERID'],
-        'TICKER': security['TICKER'],
-        'COMPANY_NAME': security['COMPANY_NAME'],
-        'GICS_SECTOR': security['GICS_SECTOR'],
-        'PROMPT_TEXT': prompt_text
-    }
-
-def generate_global_document_prompt(doc_type: str, doc_num: int) -> dict:
-    """Generate prompts for global documents (policy, sales, philosophy)."""
-    
-    if doc_type == 'policy_docs':
-        if doc_num == 0:
-            title = "Sustainable Investment Policy"
-            prompt_text = """You are writing Snowcrest Asset Management's Sustainable Investment Policy.
+
+SUSTAINABLE_INVESTMENT_POLICY_TEMPLATE = """You are writing Snowcrest Asset Management's Sustainable Investment Policy.
 
 Create a comprehensive ESG investment policy:
 
@@ -444,9 +244,7 @@ Our commitment to integrating environmental, social, and governance (ESG) factor
 
 Write 800-1500 words in UK English with formal, policy-appropriate tone."""
 
-        elif doc_num == 1:
-            title = "Investment Management Agreement Template"
-            prompt_text = """You are writing an Investment Management Agreement (IMA) template for Snowcrest Asset Management.
+INVESTMENT_MANAGEMENT_AGREEMENT_TEMPLATE = """You are writing an Investment Management Agreement (IMA) template for Snowcrest Asset Management.
 
 Create a sample IMA with key investment constraints:
 
@@ -474,9 +272,7 @@ Portfolio objectives and performance benchmarks.
 
 Write 800-1500 words in UK English with legal, professional tone."""
 
-        else:
-            title = "Compliance Manual"
-            prompt_text = """You are writing Snowcrest Asset Management's Compliance Manual.
+COMPLIANCE_MANUAL_TEMPLATE = """You are writing Snowcrest Asset Management's Compliance Manual.
 
 Create a compliance procedures manual:
 
@@ -506,11 +302,8 @@ Compliance framework for investment management operations.
 - Quarterly ESG compliance reviews
 
 Write 800-1500 words in UK English with authoritative, procedural tone."""
-    
-    elif doc_type == 'sales_templates':
-        if doc_num == 0:
-            title = "Monthly Client Report Template"
-            prompt_text = """You are creating a monthly client report template for Snowcrest Asset Management.
+
+MONTHLY_CLIENT_REPORT_TEMPLATE = """You are creating a monthly client report template for Snowcrest Asset Management.
 
 Create a professional monthly report template:
 
@@ -548,9 +341,7 @@ Standard disclaimers: "This report is for informational purposes only and does n
 
 Write 800-1500 words in UK English with professional, client-appropriate tone."""
 
-        else:
-            title = "Quarterly Client Letter Template"
-            prompt_text = """You are creating a quarterly client letter template for Snowcrest Asset Management.
+QUARTERLY_CLIENT_LETTER_TEMPLATE = """You are creating a quarterly client letter template for Snowcrest Asset Management.
 
 Create an extended quarterly letter template:
 
@@ -598,11 +389,8 @@ Detailed quarterly performance analysis including:
 [Template for closing remarks, appreciation, and next steps]
 
 Write 800-1500 words in UK English with personal, relationship-building tone."""
-    
-    else:  # philosophy_docs
-        if doc_num == 0:
-            title = "ESG Investment Philosophy"
-            prompt_text = """You are writing Snowcrest Asset Management's ESG Investment Philosophy.
+
+ESG_PHILOSOPHY_TEMPLATE = """You are writing Snowcrest Asset Management's ESG Investment Philosophy.
 
 Create our ESG investment philosophy document:
 
@@ -633,9 +421,7 @@ Our belief that environmental, social, and governance factors are financially ma
 
 Write 800-1500 words in UK English with philosophical, thought-leadership tone."""
 
-        elif doc_num == 1:
-            title = "Risk Management Philosophy"
-            prompt_text = """You are writing Snowcrest Asset Management's Risk Management Philosophy.
+RISK_MANAGEMENT_PHILOSOPHY_TEMPLATE = """You are writing Snowcrest Asset Management's Risk Management Philosophy.
 
 Create our risk management philosophy:
 
@@ -669,9 +455,7 @@ Our comprehensive approach to identifying, measuring, and managing investment ri
 
 Write 800-1500 words in UK English with authoritative, technical tone."""
 
-        else:
-            title = "Brand Messaging Guidelines"
-            prompt_text = """You are writing Snowcrest Asset Management's Brand Messaging Guidelines.
+BRAND_MESSAGING_TEMPLATE = """You are writing Snowcrest Asset Management's Brand Messaging Guidelines.
 
 Create brand messaging guidelines:
 
@@ -706,84 +490,499 @@ Snowcrest Asset Management as a forward-thinking, technology-enhanced, ESG-focus
 Professional yet approachable, confident but not arrogant, innovative while maintaining institutional credibility.
 
 Write 800-1500 words in UK English with marketing-appropriate, professional tone."""
+
+# Templates per document type: (DOCUMENT_TYPE label, first report number, template).
+# Each template covers report numbers up to the next template's first number;
+# the last one covers all remaining documents for the entity.
+PROMPT_TEMPLATES = {
+    'broker_research': [('Broker Research Report', 0, BROKER_RESEARCH_TEMPLATE)],
+    'earnings_transcripts': [
+        ('Earnings Transcript Summary', 0, EARNINGS_SUMMARY_TEMPLATE),
+        ('Earnings Transcript Q&A', 1, EARNINGS_QA_TEMPLATE)
+    ],
+    'press_releases': [('Press Release', 0, PRESS_RELEASE_TEMPLATE)],
+    'ngo_reports': [('NGO Report', 0, NGO_REPORT_TEMPLATE)],
+    'engagement_notes': [('ESG Engagement Log', 0, ENGAGEMENT_NOTE_TEMPLATE)],
+    'policy_docs': [
+        ('Policy Docs', 0, SUSTAINABLE_INVESTMENT_POLICY_TEMPLATE),
+        ('Policy Docs', 1, INVESTMENT_MANAGEMENT_AGREEMENT_TEMPLATE),
+        ('Policy Docs', 2, COMPLIANCE_MANUAL_TEMPLATE)
+    ],
+    'sales_templates': [
+        ('Sales Templates', 0, MONTHLY_CLIENT_REPORT_TEMPLATE),
+        ('Sales Templates', 1, QUARTERLY_CLIENT_LETTER_TEMPLATE)
+    ],
+    'philosophy_docs': [
+        ('Philosophy Docs', 0, ESG_PHILOSOPHY_TEMPLATE),
+        ('Philosophy Docs', 1, RISK_MANAGEMENT_PHILOSOPHY_TEMPLATE),
+        ('Philosophy Docs', 2, BRAND_MESSAGING_TEMPLATE)
+    ]
+}
+
+# Weighted option sets drawn per prompt: {OPTION_SET: [(value, weight), ...]}
+PROMPT_OPTION_SETS = {
+    'RATING': [('Strong Buy', 0.10), ('Buy', 0.25), ('Hold', 0.45), ('Sell', 0.15), ('Strong Sell', 0.05)],
+    'BROKER': [(name, 1) for name in ['Goldman Sachs', 'Morgan Stanley', 'J.P. Morgan', 'Bank of America', 'Barclays', 'UBS']],
+    'RELEASE_TYPE': [(name, 1) for name in ['Earnings', 'Product', 'Corporate', 'ESG']],
+    'NGO_NAME': [(name, 1) for name in ['Global Labour Watch', 'Environmental Defence Fund', 'Corporate Accountability International',
+                                        'Oxfam', 'Human Rights Watch', 'Greenpeace', 'Transparency International']],
+    'CATEGORY': [(name, 1) for name in ['Environmental', 'Social', 'Governance']],
+    'SEVERITY': [('High', 0.1), ('Medium', 0.3), ('Low', 0.6)],  # Most reports are low-medium severity
+    'MEETING_TYPE': [(name, 1) for name in ['Management Meeting', 'Shareholder Call', 'Site Visit']]
+}
+
+# Option sets whose choices depend on other drawn options: {OPTION_SET: (key option sets)}
+PROMPT_DEPENDENT_OPTION_SETS = {
+    'KEYWORD': ('CATEGORY', 'SEVERITY')  # Keywords from config.ESG_CONTROVERSY_KEYWORDS
+}
+
+# Placeholder -> SQL expression over the drawn prompt inputs
+PROMPT_PLACEHOLDERS = {
+    'COMPANY_NAME': 'COMPANY_NAME',
+    'TICKER': 'TICKER',
+    'GICS_SECTOR': 'GICS_SECTOR',
+    'RATING': 'RATING',
+    'BROKER': 'BROKER',
+    'QUARTER': "'Q' || QUARTER(QUARTER_DATE)",
+    'YEAR': 'YEAR(QUARTER_DATE)::varchar',
+    'RELEASE_TYPE': 'RELEASE_TYPE',
+    'NGO_NAME': 'NGO_NAME',
+    'CATEGORY_LOWER': 'LOWER(CATEGORY)',
+    'CATEGORY': 'CATEGORY',
+    'SEVERITY_LOWER': 'LOWER(SEVERITY)',
+    'SEVERITY': 'SEVERITY',
+    'KEYWORD': 'KEYWORD',
+    'MEETING_TYPE_LOWER': 'LOWER(MEETING_TYPE)',
+    'MEETING_TYPE': 'MEETING_TYPE'
+}
+
+def generate_prompts(session: Session, document_types: List[str], scale_settings: dict):
+    """
+    Generate detailed prompts for each document type and store in RAW.GENERATION_PROMPTS.
+    
+    Prompt templates and their option sets are seeded into RAW.PROMPT_TEMPLATES and
+    RAW.PROMPT_TEMPLATE_OPTIONS, then every prompt is rendered in-warehouse with a
+    single INSERT ... SELECT joining templates with the covered securities.
+    """
+    
+    # Create prompts table with SecurityID and IssuerID support
+    session.sql(f"""
+        CREATE OR REPLACE TABLE {config.DATABASE_NAME}.RAW.GENERATION_PROMPTS (
+            PROMPT_ID VARCHAR PRIMARY KEY,
+            DOCUMENT_TYPE VARCHAR NOT NULL,
+            SecurityID BIGINT,                            -- New: immutable SecurityID
+            IssuerID BIGINT,                              -- New: issuer linkage
+            TICKER VARCHAR,
+            COMPANY_NAME VARCHAR,
+            GICS_SECTOR VARCHAR,
+            PROMPT_TEXT TEXT NOT NULL,
+            MODEL_NAME VARCHAR DEFAULT '{config.MODEL_NAME}',
+            CREATED_TIMESTAMP TIMESTAMP DEFAULT CURRENT_TIMESTAMP()
+        )
+    """).collect()
+    
+    # Documents per security and securities covered both follow the build scale
+    doc_counts = scale_settings['unstructured_counts']
+    coverage_multiplier = scale_settings['scale']
+    
+    max_report_num = seed_prompt_templates(session, document_types, doc_counts, coverage_multiplier)
+    if max_report_num is None:
+        print("⚠️  No prompt templates for requested document types")
+        return
+    
+    option_sets = list(PROMPT_OPTION_SETS.keys())
+    # Draws are seeded by template, security and report number, so a build renders the same
+    # prompts (and hits the same completion cache entries) every time for a given RNG_SEED
+    prompt_keys = ('t.TEMPLATE_ID', 't.SecurityID', 't.REPORT_NUM')
+    draw_columns = ",\n                ".join(
+        f"UNIFORM(0, 999999, {seeded_random('GENERATION_PROMPTS', name, *prompt_keys)}) / 1000000 as R_{name}"
+        for name in option_sets + list(PROMPT_DEPENDENT_OPTION_SETS.keys())
+    )
+    option_columns = ",\n                ".join(
+        f"o_{name}.OPTION_VALUE as {name}" for name in option_sets + list(PROMPT_DEPENDENT_OPTION_SETS.keys())
+    )
+    option_joins = "\n            ".join(
+        f"LEFT JOIN options o_{name} ON o_{name}.OPTION_SET = '{name}' "
+        f"AND d.R_{name} >= o_{name}.CUM_WEIGHT_LOW AND d.R_{name} < o_{name}.CUM_WEIGHT_HIGH"
+        for name in option_sets
+    )
+    for name, key_sets in PROMPT_DEPENDENT_OPTION_SETS.items():
+        option_key = " || '|' || ".join(f"LOWER(o_{key}.OPTION_VALUE)" for key in key_sets)
+        option_joins += (f"\n            LEFT JOIN options o_{name} ON o_{name}.OPTION_SET = '{name}' "
+                         f"AND o_{name}.OPTION_KEY = {option_key} "
+                         f"AND d.R_{name} >= o_{name}.CUM_WEIGHT_LOW AND d.R_{name} < o_{name}.CUM_WEIGHT_HIGH")
+    
+    result = session.sql(f"""
+        -- Render all prompts in-warehouse: templates x covered securities x report numbers
+        INSERT INTO {config.DATABASE_NAME}.RAW.GENERATION_PROMPTS
+            (PROMPT_ID, DOCUMENT_TYPE, SecurityID, IssuerID, TICKER, COMPANY_NAME, GICS_SECTOR, PROMPT_TEXT)
+        WITH securities AS (
+            -- Step 1: Rank equities for coverage, prioritising major US stocks in portfolios and demo scenarios
+            SELECT 
+                ds.SecurityID,
+                di.IssuerID,
+                ds.Ticker as TICKER,
+                ds.Description as COMPANY_NAME,
+                di.GICS_Sector as GICS_SECTOR,
+                ROW_NUMBER() OVER (ORDER BY 
+                    CASE 
+                        WHEN ds.Ticker IN ('AAPL', 'CMC', 'RBBN', 'MSFT', 'NVDA', 'GOOGL', 'AMZN', 'TSLA', 'META', 'NFLX', 'CRM', 'ORCL') THEN 1
+                        WHEN ds.Ticker RLIKE '^[A-Z]{{1,5}}$' AND LENGTH(ds.Ticker) <= 5 THEN 2  -- Other real US tickers
+                        WHEN ds.Ticker RLIKE '^(EQ|CB|ETF)[0-9]+$' THEN 4  -- Synthetic tickers (shouldn't exist anymore)
+                        ELSE 3  -- Other real tickers
+                    END,
+                    ds.Ticker  -- Then order alphabetically within each group
+                ) as COVERAGE_RANK
+            FROM {config.DATABASE_NAME}.CURATED.DIM_SECURITY ds
+            JOIN {config.DATABASE_NAME}.CURATED.DIM_ISSUER di ON ds.IssuerID = di.IssuerID
+            WHERE ds.AssetClass = 'Equity'
+        ),
+        report_numbers AS (
+            SELECT seq4() as REPORT_NUM
+            FROM TABLE(GENERATOR(rowcount => {max_report_num + 1}))
+        ),
+        options AS (
+            SELECT * FROM {config.DATABASE_NAME}.RAW.PROMPT_TEMPLATE_OPTIONS
+        ),
+        targets AS (
+            -- Step 2: Security and issuer level templates for each covered security and report number
+            SELECT 
+                t.DOCUMENT_TYPE, t.LINKAGE_LEVEL, t.TEMPLATE_TEXT, t.TEMPLATE_ID,
+                s.SecurityID, s.IssuerID, s.TICKER, s.COMPANY_NAME, s.GICS_SECTOR, rn.REPORT_NUM
+            FROM {config.DATABASE_NAME}.RAW.PROMPT_TEMPLATES t
+            JOIN securities s ON s.COVERAGE_RANK <= t.COVERAGE_COUNT
+            JOIN report_numbers rn ON rn.REPORT_NUM BETWEEN t.FIRST_REPORT_NUM AND t.LAST_REPORT_NUM
+            WHERE t.LINKAGE_LEVEL IN ('security', 'issuer')
+            UNION ALL
+            -- Global documents are not security-specific
+            SELECT 
+                t.DOCUMENT_TYPE, t.LINKAGE_LEVEL, t.TEMPLATE_TEXT, t.TEMPLATE_ID,
+                NULL::BIGINT, NULL::BIGINT, NULL::VARCHAR, NULL::VARCHAR, NULL::VARCHAR, rn.REPORT_NUM
+            FROM {config.DATABASE_NAME}.RAW.PROMPT_TEMPLATES t
+            JOIN report_numbers rn ON rn.REPORT_NUM BETWEEN t.FIRST_REPORT_NUM AND t.LAST_REPORT_NUM
+            WHERE t.LINKAGE_LEVEL = 'global'
+        ),
+        draws AS (
+            -- Step 3: One random draw per option set per prompt, plus a quarter within the last year
+            SELECT 
+                t.*,
+                {draw_columns},
+                DATEADD(day, -90 * UNIFORM(0, 3, {seeded_random('GENERATION_PROMPTS', 'quarter', *prompt_keys)}), {get_as_of_date_sql()}) as QUARTER_DATE
+            FROM targets t
+        ),
+        prompt_inputs AS (
+            -- Step 4: Resolve draws to weighted option values
+            SELECT 
+                d.*,
+                {option_columns}
+            FROM draws d
+            {option_joins}
+        )
+        -- Step 5: Render templates
+        SELECT 
+            TO_VARCHAR({seeded_random('GENERATION_PROMPTS', 'prompt_id', 'TEMPLATE_ID', 'SecurityID', 'REPORT_NUM')}) as PROMPT_ID,
+            DOCUMENT_TYPE,
+            CASE WHEN LINKAGE_LEVEL = 'security' THEN SecurityID END as SecurityID,  -- Issuer-level documents have no SecurityID
+            IssuerID,
+            TICKER,
+            COMPANY_NAME,
+            GICS_SECTOR,
+            {build_prompt_render_expression('TEMPLATE_TEXT')} as PROMPT_TEXT
+        FROM prompt_inputs
+    """).collect()
+    
+    print(f"✅ Generated {result[0][0]} content prompts")
+
+def seed_prompt_templates(session: Session, document_types: List[str], doc_counts: dict, coverage_multiplier: float):
+    """
+    Load prompt templates and option sets for the requested document types.
+    
+    Returns:
+        int: Highest report number across templates, or None if no templates apply
+    """
     
-    return {
-        'PROMPT_ID': str(uuid.uuid4()),
-        'DOCUMENT_TYPE': doc_type.replace('_', ' ').title(),
-        'SecurityID': None,  # Global document
-        'IssuerID': None,    # Global document
-        'TICKER': None,
-        'COMPANY_NAME': None,
-        'GICS_SECTOR': None,
-        'PROMPT_TEXT': prompt_text
-    }
-
-def generate_content(session: Session, document_types: List[str]):
-    """Generate content using Cortex Complete function."""
-    
-    # Process each document type separately for better control
+    template_data = []
     for doc_type in document_types:
-        print(f"🤖 Generating {doc_type} content with {config.MODEL_NAME}...")
+        print(f"📝 Preparing prompt templates for: {doc_type}")
+        templates = PROMPT_TEMPLATES.get(doc_type, [])
+        linkage_level = config.DOCUMENT_TYPES[doc_type]['linkage_level']
+        coverage = config.UNSTRUCTURED_COVERAGE.get(doc_type)
+        doc_count = doc_counts[doc_type]
         
-        try:
-            # Map document types to their filter patterns
-            if doc_type == 'broker_research':
-                doc_filter = "DOCUMENT_TYPE = 'Broker Research Report'"
-            elif doc_type == 'earnings_transcripts':
-                doc_filter = "DOCUMENT_TYPE LIKE 'Earnings Transcript%'"
-            elif doc_type == 'press_releases':
-                doc_filter = "DOCUMENT_TYPE = 'Press Release'"
-            elif doc_type == 'ngo_reports':
-                doc_filter = "DOCUMENT_TYPE = 'NGO Report'"
-            elif doc_type == 'engagement_notes':
-                doc_filter = "DOCUMENT_TYPE = 'ESG Engagement Log'"
-            else:
-                doc_filter = f"DOCUMENT_TYPE = '{doc_type.replace('_', ' ').title()}'"
+        for i, (document_type, first_report_num, template_text) in enumerate(templates):
+            last_report_num = templates[i + 1][1] - 1 if i + 1 < len(templates) else doc_count - 1
+            last_report_num = min(last_report_num, doc_count - 1)
+            if first_report_num > last_report_num:
+                continue
             
-            # Generate content using Cortex Complete with batch processing
-            session.sql(f"""
-                CREATE OR REPLACE TABLE {config.DATABASE_NAME}.RAW.{config.DOCUMENT_TYPES[doc_type]['table_name']}_TEMP AS
-                SELECT 
-                    PROMPT_ID,
-                    DOCUMENT_TYPE,
-                    SecurityID,
-                    IssuerID,
-                    TICKER,
-                    COMPANY_NAME,
-                    GICS_SECTOR,
-                    SNOWFLAKE.CORTEX.COMPLETE('{config.MODEL_NAME}', PROMPT_TEXT) as GENERATED_CONTENT,
-                    CURRENT_TIMESTAMP() as GENERATED_TIMESTAMP
-                FROM {config.DATABASE_NAME}.RAW.GENERATION_PROMPTS
-                WHERE {doc_filter}
-            """).collect()
+            template_data.append({
+                'TEMPLATE_ID': f"{doc_type}_{i}",
+                'DOC_TYPE': doc_type,
+                'DOCUMENT_TYPE': document_type,
+                'LINKAGE_LEVEL': linkage_level,
+                'COVERAGE_COUNT': int(coverage * coverage_multiplier) if coverage is not None else None,
+                'FIRST_REPORT_NUM': first_report_num,
+                'LAST_REPORT_NUM': last_report_num,
+                'TEMPLATE_TEXT': template_text
+            })
+    
+    if not template_data:
+        return None
+    
+    templates_df = session.create_dataframe(template_data)
+    templates_df.write.mode("overwrite").save_as_table(f"{config.DATABASE_NAME}.RAW.PROMPT_TEMPLATES")
+    
+    # Option sets as cumulative weight ranges so a single uniform draw selects a value
+    option_groups = {(name, None): options for name, options in PROMPT_OPTION_SETS.items()}
+    for category, severities in config.ESG_CONTROVERSY_KEYWORDS.items():
+        for severity, keywords in severities.items():
+            option_groups[('KEYWORD', f"{category}|{severity}")] = [(keyword, 1) for keyword in keywords]
+    
+    option_data = []
+    for (option_set, option_key), options in option_groups.items():
+        total_weight = sum(weight for _, weight in options)
+        cumulative = 0.0
+        for i, (value, weight) in enumerate(options):
+            low = cumulative
+            cumulative += weight / total_weight
+            option_data.append({
+                'OPTION_SET': option_set,
+                'OPTION_KEY': option_key,
+                'OPTION_VALUE': value,
+                'CUM_WEIGHT_LOW': low,
+                'CUM_WEIGHT_HIGH': 1.0 if i == len(options) - 1 else cumulative
+            })
+    
+    options_df = session.create_dataframe(option_data)
+    options_df.write.mode("overwrite").save_as_table(f"{config.DATABASE_NAME}.RAW.PROMPT_TEMPLATE_OPTIONS")
+    
+    print(f"✅ Loaded {len(template_data)} prompt templates and {len(option_data)} template options")
+    return max(row['LAST_REPORT_NUM'] for row in template_data)
+
+def build_prompt_render_expression(template_column: str) -> str:
+    """Build the nested REPLACE expression that renders {PLACEHOLDER} tokens in SQL."""
+    expression = template_column
+    for placeholder, sql_expression in PROMPT_PLACEHOLDERS.items():
+        expression = f"REPLACE({expression}, '{{{placeholder}}}', COALESCE({sql_expression}, ''))"
+    return expression
+
+def get_document_type_filter(doc_type: str) -> str:
+    """Map a document type to its GENERATION_PROMPTS filter."""
+    if doc_type == 'broker_research':
+        return "DOCUMENT_TYPE = 'Broker Research Report'"
+    elif doc_type == 'earnings_transcripts':
+        return "DOCUMENT_TYPE LIKE 'Earnings Transcript%'"
+    elif doc_type == 'press_releases':
+        return "DOCUMENT_TYPE = 'Press Release'"
+    elif doc_type == 'ngo_reports':
+        return "DOCUMENT_TYPE = 'NGO Report'"
+    elif doc_type == 'engagement_notes':
+        return "DOCUMENT_TYPE = 'ESG Engagement Log'"
+    else:
+        return f"DOCUMENT_TYPE = '{doc_type.replace('_', ' ').title()}'"
+
+def get_keyed_prompts_sql(doc_type: str) -> str:
+    """
+    Prompts for a document type with their completion cache key.
+    
+    The key hashes the prompt text plus its occurrence number, so repeated
+    identical prompts (e.g. several compliance manuals) still get distinct documents.
+    """
+    return f"""
+        SELECT 
+            p.*,
+            SHA2(p.PROMPT_TEXT || '#' || ROW_NUMBER() OVER (PARTITION BY p.PROMPT_TEXT ORDER BY p.PROMPT_ID), 256) as PROMPT_HASH
+        FROM {config.DATABASE_NAME}.RAW.GENERATION_PROMPTS p
+        WHERE {get_document_type_filter(doc_type)}
+    """
+
+def create_completion_cache(session: Session):
+    """Create the persistent completion cache (kept outside SAM_DEMO so it survives rebuilds)."""
+    create_cache_table(session, f"""
+        CREATE TABLE IF NOT EXISTS {config.COMPLETION_CACHE_TABLE} (
+            PROMPT_HASH VARCHAR NOT NULL,
+            MODEL_NAME VARCHAR NOT NULL,
+            GENERATED_CONTENT TEXT NOT NULL,
+            GENERATED_TIMESTAMP TIMESTAMP DEFAULT CURRENT_TIMESTAMP()
+        )
+    """)
+
+def generate_content(session: Session, document_types: List[str], incremental: bool = False, build_stats: List[dict] = None):
+    """
+    Generate content using Cortex Complete function.
+    
+    The completion INSERT of each document type is submitted as an async query
+    (collect_nowait) on the one session, up to GENERATION_CONCURRENCY at a time.
+    Completions are stored in a persistent cache keyed by prompt hash and
+    MODEL_NAME, so reruns only generate prompts that are missing or previously failed.
+    """
+    
+    create_completion_cache(session)
+    
+    # Per-type seconds cover only that type's own queries, since the types overlap in time
+    seconds = {}
+    missing = {}
+    for doc_type in document_types:
+        try:
+            count_start = time.perf_counter()
+            missing[doc_type] = count_missing_completions(session, doc_type)
+            cached = session.sql(f"SELECT COUNT(*) FROM ({get_keyed_prompts_sql(doc_type)})").collect(
+                statement_params=get_document_type_statement_params(doc_type))[0][0] - missing[doc_type]
+            seconds[doc_type] = time.perf_counter() - count_start
+            print(f"🤖 Generating {doc_type} content with {config.MODEL_NAME}: {missing[doc_type]} to generate, {cached} cached")
+        except Exception as e:
+            print(f"❌ Failed to generate {doc_type} content: {e}")
+    
+    for attempt in range(1, config.COMPLETION_MAX_ATTEMPTS + 1):
+        pending = [doc_type for doc_type, count in missing.items() if count]
+        if not pending:
+            break
+        
+        if attempt > 1:
+            backoff = config.COMPLETION_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 2)
+            print(f"🔁 Retrying {sum(missing[doc_type] for doc_type in pending)} failed prompts across "
+                  f"{len(pending)} document types in {backoff}s (attempt {attempt}/{config.COMPLETION_MAX_ATTEMPTS})")
+            time.sleep(backoff)
+        
+        # Async jobs on the one session run concurrently in the warehouse without sharing it across threads
+        concurrency = max(1, config.GENERATION_CONCURRENCY)
+        for wave_start in range(0, len(pending), concurrency):
+            jobs = {}
+            for doc_type in pending[wave_start:wave_start + concurrency]:
+                submitted = time.perf_counter()
+                try:
+                    jobs[doc_type] = (submitted, session.sql(get_completion_insert_sql(doc_type)).collect_nowait(
+                        statement_params=get_document_type_statement_params(doc_type)))
+                except Exception as e:
+                    jobs[doc_type] = (submitted, e)
             
-            # Transform to final RAW table with proper schema
-            create_raw_table(session, doc_type)
+            # Poll so each type is timed from its own submission to its own completion
+            while jobs:
+                for doc_type, (submitted, job) in list(jobs.items()):
+                    if not isinstance(job, Exception) and not job.is_done():
+                        continue
+                    del jobs[doc_type]
+                    try:
+                        if isinstance(job, Exception):
+                            raise job
+                        job.result()
+                        missing[doc_type] = count_missing_completions(session, doc_type)
+                        seconds[doc_type] += time.perf_counter() - submitted
+                    except Exception as e:
+                        print(f"❌ Failed to generate {doc_type} content: {e}")
+                        del missing[doc_type]
+                        # Continue with other document types
+                if jobs:
+                    time.sleep(config.COMPLETION_POLL_INTERVAL_SECONDS)
+    
+    for doc_type in document_types:
+        if doc_type not in missing:
+            continue
+        try:
+            # Write the RAW table straight from prompts + cache (no intermediate _TEMP copy)
+            raw_start = time.perf_counter()
+            create_raw_table(session, doc_type, incremental, get_document_type_statement_params(doc_type))
+            seconds[doc_type] += time.perf_counter() - raw_start
             
-            print(f"✅ Generated {doc_type} content successfully")
+            if build_stats is not None:
+                record_builder(session, build_stats, config.DOCUMENT_TYPES[doc_type]['table_name'], seconds[doc_type],
+                               [f"RAW.{config.DOCUMENT_TYPES[doc_type]['table_name']}"])
             
+            if missing[doc_type]:
+                print(f"⚠️  Generated {doc_type} content with {missing[doc_type]} prompts still missing (rerun to retry them)")
+            else:
+                print(f"✅ Generated {doc_type} content successfully")
         except Exception as e:
             print(f"❌ Failed to generate {doc_type} content: {e}")
             # Continue with other document types
 
-def create_raw_table(session: Session, doc_type: str):
-    """Create properly structured RAW table from generated content."""
+def get_document_type_statement_params(doc_type: str) -> dict:
+    """Query tag for one document type's statements (tagged per statement, since their jobs overlap)."""
+    return get_statement_params(config.DOCUMENT_TYPES[doc_type]['table_name'])
+
+def get_missing_completions_sql(doc_type: str) -> str:
+    """Prompts for a document type that have no cached completion for MODEL_NAME."""
+    return f"""
+        SELECT p.PROMPT_HASH, p.PROMPT_TEXT
+        FROM ({get_keyed_prompts_sql(doc_type)}) p
+        LEFT JOIN {config.COMPLETION_CACHE_TABLE} c 
+            ON c.PROMPT_HASH = p.PROMPT_HASH AND c.MODEL_NAME = '{config.MODEL_NAME}'
+        WHERE c.PROMPT_HASH IS NULL
+    """
+
+def count_missing_completions(session: Session, doc_type: str) -> int:
+    """Number of prompts for a document type still without a completion."""
+    return session.sql(f"SELECT COUNT(*) FROM ({get_missing_completions_sql(doc_type)})").collect(
+        statement_params=get_document_type_statement_params(doc_type))[0][0]
+
+def get_completion_insert_sql(doc_type: str) -> str:
+    """Complete a document type's missing prompts into the completion cache."""
+    # TRY_COMPLETE returns NULL for failed rows instead of failing the whole statement
+    return f"""
+        INSERT INTO {config.COMPLETION_CACHE_TABLE} (PROMPT_HASH, MODEL_NAME, GENERATED_CONTENT)
+        SELECT PROMPT_HASH, '{config.MODEL_NAME}', GENERATED_CONTENT
+        FROM (
+            SELECT 
+                PROMPT_HASH,
+                SNOWFLAKE.CORTEX.TRY_COMPLETE('{config.MODEL_NAME}', PROMPT_TEXT) as GENERATED_CONTENT
+            FROM ({get_missing_completions_sql(doc_type)})
+        )
+        WHERE GENERATED_CONTENT IS NOT NULL
+    """
+
+def get_generated_content_sql(doc_type: str) -> str:
+    """Prompts for a document type joined with their cached completions."""
+    return f"""
+        SELECT 
+            p.PROMPT_ID,
+            p.PROMPT_HASH,
+            p.DOCUMENT_TYPE,
+            p.SecurityID,
+            p.IssuerID,
+            p.TICKER,
+            p.COMPANY_NAME,
+            p.GICS_SECTOR,
+            c.GENERATED_CONTENT,
+            c.GENERATED_TIMESTAMP
+        FROM ({get_keyed_prompts_sql(doc_type)}) p
+        JOIN {config.COMPLETION_CACHE_TABLE} c 
+            ON c.PROMPT_HASH = p.PROMPT_HASH AND c.MODEL_NAME = '{config.MODEL_NAME}'
+    """
+
+def create_raw_table(session: Session, doc_type: str, incremental: bool = False, statement_params: dict = None):
+    """
+    Create properly structured RAW table from generated content.
+    
+    This is the only materialisation of the document text in SAM_DEMO: it is
+    written once from prompts joined with the completion cache, and the
+    CURATED corpus is a view over it.
+    
+    DOCUMENT_ID is the prompt hash, so a document keeps its ID across builds.
+    In incremental mode the table is not replaced: documents that are no longer
+    generated are deleted and only new DOCUMENT_IDs are inserted, which lets
+    Cortex Search refresh incrementally from the change stream.
+    """
     
     table_name = f"{config.DATABASE_NAME}.RAW.{config.DOCUMENT_TYPES[doc_type]['table_name']}"
-    temp_table = f"{table_name}_TEMP"
+    source = f"({get_generated_content_sql(doc_type)})"
+    
+    # Metadata draws are seeded by DOCUMENT_ID, so a document keeps its metadata across builds
+    as_of_date = get_as_of_date_sql()
+    gen = {draw: seeded_random(config.DOCUMENT_TYPES[doc_type]['table_name'], draw, 'PROMPT_HASH')
+           for draw in ['publish_date', 'analyst', 'price_target', 'release_type', 'ngo_name',
+                        'report_category', 'severity', 'meeting_type']}
     
     if doc_type == 'broker_research':
-        session.sql(f"""
-            CREATE OR REPLACE TABLE {table_name} AS
+        select_sql = f"""
             SELECT 
-                PROMPT_ID as DOCUMENT_ID,
+                PROMPT_HASH as DOCUMENT_ID,
                 SecurityID,
                 IssuerID,
                 TICKER || ' Research Report - ' || SUBSTR(GENERATED_CONTENT, 1, 50) as DOCUMENT_TITLE,
                 'Broker Research Report' as DOCUMENT_TYPE,
-                CURRENT_DATE() - UNIFORM(1, 90, RANDOM())::int as PUBLISH_DATE,
+                {as_of_date} - UNIFORM(1, 90, {gen['publish_date']})::int as PUBLISH_DATE,
                 SPLIT_PART(GENERATED_CONTENT, 'analyst at ', 2) as BROKER_NAME,
-                'Analyst_' || UNIFORM(1, 100, RANDOM())::int as ANALYST_NAME,
+                'Analyst_' || UNIFORM(1, 100, {gen['analyst']})::int as ANALYST_NAME,
                 CASE 
                     WHEN GENERATED_CONTENT LIKE '%Strong Buy%' THEN 'Strong Buy'
                     WHEN GENERATED_CONTENT LIKE '%Buy%' THEN 'Buy'
@@ -791,21 +990,20 @@ def create_raw_table(session: Session, doc_type: str):
                     WHEN GENERATED_CONTENT LIKE '%Strong Sell%' THEN 'Strong Sell'
                     ELSE 'Hold'
                 END as RATING,
-                UNIFORM(50, 500, RANDOM()) as PRICE_TARGET,
+                UNIFORM(50, 500, {gen['price_target']}) as PRICE_TARGET,
                 GENERATED_CONTENT as RAW_MARKDOWN,
                 'en' as LANGUAGE
-            FROM {temp_table}
-        """).collect()
+            FROM {source}
+        """
         
     elif doc_type == 'earnings_transcripts':
-        session.sql(f"""
-            CREATE OR REPLACE TABLE {table_name} AS
+        select_sql = f"""
             WITH numbered_transcripts AS (
                 -- First, number the transcripts
                 SELECT 
                     *,
                     ROW_NUMBER() OVER (PARTITION BY SecurityID ORDER BY PROMPT_ID) as transcript_num
-                FROM {temp_table}
+                FROM {source}
             ),
             quarter_assignments AS (
                 -- Assign quarters based on transcript number
@@ -813,15 +1011,15 @@ def create_raw_table(session: Session, doc_type: str):
                     nt.*,
                     -- Each company gets transcripts for last 4 quarters
                     CASE MOD(nt.transcript_num - 1, 4)
-                        WHEN 0 THEN DATEADD(quarter, -3, DATE_TRUNC('quarter', CURRENT_DATE()))
-                        WHEN 1 THEN DATEADD(quarter, -2, DATE_TRUNC('quarter', CURRENT_DATE()))
-                        WHEN 2 THEN DATEADD(quarter, -1, DATE_TRUNC('quarter', CURRENT_DATE()))
-                        WHEN 3 THEN DATE_TRUNC('quarter', CURRENT_DATE())
+                        WHEN 0 THEN DATEADD(quarter, -3, DATE_TRUNC('quarter', {as_of_date}))
+                        WHEN 1 THEN DATEADD(quarter, -2, DATE_TRUNC('quarter', {as_of_date}))
+                        WHEN 2 THEN DATEADD(quarter, -1, DATE_TRUNC('quarter', {as_of_date}))
+                        WHEN 3 THEN DATE_TRUNC('quarter', {as_of_date})
                     END as quarter_start
                 FROM numbered_transcripts nt
             )
             SELECT 
-                PROMPT_ID as DOCUMENT_ID,
+                PROMPT_HASH as DOCUMENT_ID,
                 SecurityID,
                 IssuerID,
                 TICKER || ' Earnings Call - ' || SUBSTR(GENERATED_CONTENT, 1, 50) as DOCUMENT_TITLE,
@@ -830,7 +1028,7 @@ def create_raw_table(session: Session, doc_type: str):
                     ELSE 'Earnings Q&A Excerpts'
                 END as DOCUMENT_TYPE,
                 -- Publish date is 2-4 weeks after quarter end
-                DATEADD(day, UNIFORM(14, 28, RANDOM())::int, LAST_DAY(quarter_start, 'quarter')) as PUBLISH_DATE,
+                DATEADD(day, UNIFORM(14, 28, {gen['publish_date']})::int, LAST_DAY(quarter_start, 'quarter')) as PUBLISH_DATE,
                 -- Fiscal quarter matches the actual quarter of the earnings
                 'Q' || QUARTER(quarter_start) || ' ' || YEAR(quarter_start) as FISCAL_QUARTER,
                 CASE 
@@ -840,89 +1038,123 @@ def create_raw_table(session: Session, doc_type: str):
                 GENERATED_CONTENT as RAW_MARKDOWN,
                 'en' as LANGUAGE
             FROM quarter_assignments
-        """).collect()
+        """
     
     elif doc_type == 'press_releases':
-        session.sql(f"""
-            CREATE OR REPLACE TABLE {table_name} AS
+        select_sql = f"""
             SELECT 
-                PROMPT_ID as DOCUMENT_ID,
+                PROMPT_HASH as DOCUMENT_ID,
                 SecurityID,
                 IssuerID,
                 TICKER || ' Press Release - ' || SUBSTR(GENERATED_CONTENT, 1, 50) as DOCUMENT_TITLE,
                 'Press Release' as DOCUMENT_TYPE,
-                CURRENT_DATE() - UNIFORM(1, 60, RANDOM())::int as PUBLISH_DATE,
-                ARRAY_CONSTRUCT('Earnings', 'Product', 'Corporate', 'ESG')[UNIFORM(0, 3, RANDOM())::int] as RELEASE_TYPE,
+                {as_of_date} - UNIFORM(1, 60, {gen['publish_date']})::int as PUBLISH_DATE,
+                ARRAY_CONSTRUCT('Earnings', 'Product', 'Corporate', 'ESG')[UNIFORM(0, 3, {gen['release_type']})::int] as RELEASE_TYPE,
                 GENERATED_CONTENT as RAW_MARKDOWN,
                 'en' as LANGUAGE
-            FROM {temp_table}
-        """).collect()
+            FROM {source}
+        """
     
     elif doc_type == 'ngo_reports':
-        session.sql(f"""
-            CREATE OR REPLACE TABLE {table_name} AS
+        select_sql = f"""
             SELECT 
-                PROMPT_ID as DOCUMENT_ID,
+                PROMPT_HASH as DOCUMENT_ID,
                 NULL as SecurityID,  -- Issuer-level document
                 IssuerID,
                 SUBSTR(GENERATED_CONTENT, 1, 100) as DOCUMENT_TITLE,
                 'NGO Report' as DOCUMENT_TYPE,
-                CURRENT_DATE() - UNIFORM(1, 180, RANDOM())::int as PUBLISH_DATE,
-                ARRAY_CONSTRUCT('Global Labour Watch', 'Environmental Defence Fund', 'Human Rights Watch')[UNIFORM(0, 2, RANDOM())::int] as NGO_NAME,
-                ARRAY_CONSTRUCT('Environmental', 'Social', 'Governance')[UNIFORM(0, 2, RANDOM())::int] as REPORT_CATEGORY,
-                ARRAY_CONSTRUCT('High', 'Medium', 'Low')[UNIFORM(0, 2, RANDOM())::int] as SEVERITY_LEVEL,
+                {as_of_date} - UNIFORM(1, 180, {gen['publish_date']})::int as PUBLISH_DATE,
+                ARRAY_CONSTRUCT('Global Labour Watch', 'Environmental Defence Fund', 'Human Rights Watch')[UNIFORM(0, 2, {gen['ngo_name']})::int] as NGO_NAME,
+                ARRAY_CONSTRUCT('Environmental', 'Social', 'Governance')[UNIFORM(0, 2, {gen['report_category']})::int] as REPORT_CATEGORY,
+                ARRAY_CONSTRUCT('High', 'Medium', 'Low')[UNIFORM(0, 2, {gen['severity']})::int] as SEVERITY_LEVEL,
                 GENERATED_CONTENT as RAW_MARKDOWN,
                 'en' as LANGUAGE
-            FROM {temp_table}
-        """).collect()
+            FROM {source}
+        """
     
     elif doc_type == 'engagement_notes':
-        session.sql(f"""
-            CREATE OR REPLACE TABLE {table_name} AS
+        select_sql = f"""
             SELECT 
-                PROMPT_ID as DOCUMENT_ID,
+                PROMPT_HASH as DOCUMENT_ID,
                 NULL as SecurityID,  -- Issuer-level document
                 IssuerID,
                 TICKER || ' ESG Engagement - ' || SUBSTR(GENERATED_CONTENT, 1, 50) as DOCUMENT_TITLE,
                 'ESG Engagement Log' as DOCUMENT_TYPE,
-                CURRENT_DATE() - UNIFORM(1, 365, RANDOM())::int as PUBLISH_DATE,
-                ARRAY_CONSTRUCT('Management Meeting', 'Shareholder Call', 'Site Visit')[UNIFORM(0, 2, RANDOM())::int] as MEETING_TYPE,
+                {as_of_date} - UNIFORM(1, 365, {gen['publish_date']})::int as PUBLISH_DATE,
+                ARRAY_CONSTRUCT('Management Meeting', 'Shareholder Call', 'Site Visit')[UNIFORM(0, 2, {gen['meeting_type']})::int] as MEETING_TYPE,
                 'SAM ESG Team, Company Management' as PARTICIPANTS,
                 GENERATED_CONTENT as RAW_MARKDOWN,
                 'en' as LANGUAGE
-            FROM {temp_table}
-        """).collect()
+            FROM {source}
+        """
     
     else:  # policy_docs, sales_templates, philosophy_docs
-        session.sql(f"""
-            CREATE OR REPLACE TABLE {table_name} AS
+        select_sql = f"""
             SELECT 
-                PROMPT_ID as DOCUMENT_ID,
+                PROMPT_HASH as DOCUMENT_ID,
                 NULL as SecurityID,  -- Global document
                 NULL as IssuerID,    -- Global document
                 SUBSTR(GENERATED_CONTENT, 1, 100) as DOCUMENT_TITLE,
                 '{doc_type.replace('_', ' ').title()}' as DOCUMENT_TYPE,
-                CURRENT_DATE() - UNIFORM(30, 365, RANDOM())::int as PUBLISH_DATE,
+                {as_of_date} - UNIFORM(30, 365, {gen['publish_date']})::int as PUBLISH_DATE,
                 GENERATED_CONTENT as RAW_MARKDOWN,
                 'en' as LANGUAGE
-            FROM {temp_table}
-        """).collect()
+            FROM {source}
+        """
     
-    # Clean up temp table
-    session.sql(f"DROP TABLE IF EXISTS {temp_table}").collect()
+    if not incremental:
+        session.sql(f"CREATE OR REPLACE TABLE {table_name} AS {select_sql}").collect(statement_params=statement_params)
+        # Corpus views and Cortex Search track changes on this base table
+        session.sql(f"ALTER TABLE {table_name} SET CHANGE_TRACKING = TRUE").collect(statement_params=statement_params)
+        return
+    
+    # Incremental: keep the existing table (and its change tracking) and apply a delta
+    session.sql(f"""
+        CREATE TABLE IF NOT EXISTS {table_name} CHANGE_TRACKING = TRUE AS
+        SELECT * FROM ({select_sql}) WHERE 1 = 0
+    """).collect(statement_params=statement_params)
+    
+    deleted = session.sql(f"""
+        DELETE FROM {table_name}
+        WHERE DOCUMENT_ID NOT IN (SELECT PROMPT_HASH FROM {source})
+    """).collect(statement_params=statement_params)[0][0]
+    
+    inserted = session.sql(f"""
+        INSERT INTO {table_name}
+        SELECT s.*
+        FROM ({select_sql}) s
+        WHERE NOT EXISTS (
+            SELECT 1 FROM {table_name} t WHERE t.DOCUMENT_ID = s.DOCUMENT_ID
+        )
+    """).collect(statement_params=statement_params)[0][0]
+    
+    print(f"🔄 Updated {table_name} incrementally: {inserted} inserted, {deleted} deleted")
 
-def create_corpus_tables(session: Session, document_types: List[str]):
-    """Create normalized corpus tables for Cortex Search indexing."""
+def create_corpus_tables(session: Session, document_types: List[str], incremental: bool = False):
+    """
+    Create normalized corpus views over the RAW tables for Cortex Search indexing.
+    
+    In incremental mode existing views are left in place, so the search
+    services built on them are not invalidated.
+    
+    Builds from before the corpora became views have a table of the same
+    name, which CREATE VIEW cannot replace. Such tables are dropped first,
+    together with their search service so that it is recreated on the view.
+    """
+    
+    drop_legacy_corpus_tables(session, document_types)
     
     for doc_type in document_types:
-        print(f"📚 Creating {doc_type} corpus table...")
+        print(f"📚 Creating {doc_type} corpus view...")
         
         raw_table = f"{config.DATABASE_NAME}.RAW.{config.DOCUMENT_TYPES[doc_type]['table_name']}"
         corpus_table = f"{config.DATABASE_NAME}.CURATED.{config.DOCUMENT_TYPES[doc_type]['corpus_name']}"
         
-        # Create standardized corpus table with SecurityID and IssuerID
+        # Standardized corpus shape with SecurityID and IssuerID (no copy of the document text)
         session.sql(f"""
-            CREATE OR REPLACE TABLE {corpus_table} AS
+            {'CREATE VIEW IF NOT EXISTS' if incremental else 'CREATE OR REPLACE VIEW'} {corpus_table}
+                CHANGE_TRACKING = TRUE
+            AS
             SELECT 
                 DOCUMENT_ID,
                 DOCUMENT_TITLE,
@@ -935,6 +1167,31 @@ def create_corpus_tables(session: Session, document_types: List[str]):
             FROM {raw_table}
         """).collect()
         
-        print(f"✅ Created corpus table: {corpus_table}")
+        print(f"✅ Created corpus view: {corpus_table}")
+    
+    print("✅ All corpus views created successfully")
+
+def drop_legacy_corpus_tables(session: Session, document_types: List[str]):
+    """Drop corpus tables (and their search services) left by builds that materialised the corpora."""
+    corpus_names = {config.DOCUMENT_TYPES[doc_type]['corpus_name'].upper(): doc_type for doc_type in document_types}
+    if not corpus_names:
+        return
+    
+    try:
+        legacy_tables = session.sql(f"""
+            SELECT TABLE_NAME
+            FROM {config.DATABASE_NAME}.INFORMATION_SCHEMA.TABLES
+            WHERE TABLE_SCHEMA = 'CURATED'
+              AND TABLE_TYPE = 'BASE TABLE'
+              AND TABLE_NAME IN ({', '.join(f"'{name}'" for name in corpus_names)})
+        """).collect()
+    except Exception as e:
+        print(f"⚠️  Could not check for legacy corpus tables: {e}")
+        return
     
-    print("✅ All corpus tables created successfully")
+    for row in legacy_tables:
+        doc_type = corpus_names[row['TABLE_NAME']]
+        service_name = config.DOCUMENT_TYPES[doc_type]['search_service']
+        print(f"🔄 Replacing legacy corpus table {row['TABLE_NAME']} with a view")
+        session.sql(f"DROP CORTEX SEARCH SERVICE IF EXISTS {config.DATABASE_NAME}.AI.{service_name}").collect()
+        session.sql(f"DROP TABLE {config.DATABASE_NAME}.CURATED.{row['TABLE_NAME']}").collect()
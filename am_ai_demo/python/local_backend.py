@@ -0,0 +1,311 @@
+"""
+Local Offline Backend for SAM Demo
+
+This module runs the structured builders without a Snowflake connection:
+- LocalSession implements the subset of the Snowpark Session API the builders use
+  (sql().collect(), table(), write_pandas, create_dataframe) on an embedded DuckDB file
+- A compatibility shim translates the Snowflake SQL the builders emit (GENERATOR,
+  seq4, UNIFORM with RANDOM() or seeded generators, DATEADD, RLIKE, dynamic tables) to DuckDB
+- Built tables are written to Parquet so generation can be profiled and diffed offline
+"""
+
+from typing import List, Dict, Optional
+import os
+import re
+import time
+import config
+from build_scale import time_builder, print_throughput_report
+
+class LocalRow(tuple):
+    """Query result row addressable by position or (case-insensitive) column name, like a Snowpark Row."""
+    
+    def __new__(cls, values, columns):
+        row = super().__new__(cls, values)
+        row._fields = {column.upper(): i for i, column in enumerate(columns)}
+        return row
+    
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return super().__getitem__(self._fields[key.upper()])
+        return super().__getitem__(key)
+    
+    def as_dict(self) -> Dict:
+        return {name: super(LocalRow, self).__getitem__(i) for name, i in self._fields.items()}
+
+class LocalQuery:
+    """Lazily executed statement, mirroring the Snowpark DataFrame returned by session.sql()."""
+    
+    def __init__(self, session: 'LocalSession', query: str):
+        self.session = session
+        self.query = query
+    
+    def collect(self, statement_params: Dict = None) -> List[LocalRow]:
+        return self.session.execute(self.query)
+    
+    def to_pandas(self):
+        translated = translate_sql(self.query)
+        return self.session.connection.execute(translated).df() if translated else None
+
+class LocalTable:
+    """Table reference supporting the select/to_pandas/count calls the builders make."""
+    
+    def __init__(self, session: 'LocalSession', name: str, columns: List[str] = None):
+        self.session = session
+        self.name = name
+        self.columns = columns
+    
+    def select(self, *columns) -> 'LocalTable':
+        return LocalTable(self.session, self.name, list(columns))
+    
+    def to_pandas(self):
+        # Snowflake returns unquoted identifiers in upper case
+        df = self.session.connection.execute(f"SELECT {', '.join(self.columns or ['*'])} FROM {self.name}").df()
+        df.columns = [column.upper() for column in df.columns]
+        return df
+    
+    def count(self) -> int:
+        return self.session.connection.execute(f"SELECT COUNT(*) FROM {self.name}").fetchone()[0]
+
+class LocalDataFrame:
+    """In-memory DataFrame from create_dataframe, supporting .write.mode().save_as_table()."""
+    
+    def __init__(self, session: 'LocalSession', df):
+        self.session = session
+        self.df = df
+        self.write_mode = 'errorifexists'
+    
+    @property
+    def write(self) -> 'LocalDataFrame':
+        return self
+    
+    def mode(self, write_mode: str) -> 'LocalDataFrame':
+        self.write_mode = write_mode
+        return self
+    
+    def save_as_table(self, table_name: str):
+        self.session.write_pandas(self.df, table_name, auto_create_table=True,
+                                  overwrite=self.write_mode == 'overwrite')
+    
+    def count(self) -> int:
+        return len(self.df)
+
+class LocalSession:
+    """
+    Snowpark Session stand-in backed by an embedded DuckDB database.
+    
+    The database file is named after DATABASE_NAME, so the builders' fully qualified
+    DATABASE_NAME.SCHEMA.TABLE names resolve unchanged.
+    """
+    
+    def __init__(self, database_path: str = None):
+        try:
+            import duckdb
+        except ImportError:
+            raise Exception("The local backend requires DuckDB - install it with 'pip install duckdb'")
+        
+        database_path = database_path or config.LOCAL_DATABASE_PATH
+        os.makedirs(os.path.dirname(database_path), exist_ok=True)
+        self.connection = duckdb.connect(database_path)
+        self.query_tag = None  # Accepted for time_builder; there is no query history locally
+        self.temporary_tables = set()  # Created as regular tables (see translate_sql), so excluded from export and dropped on close
+    
+    def sql(self, query: str, params: List = None) -> LocalQuery:
+        return LocalQuery(self, query)
+    
+    def execute(self, query: str) -> List[LocalRow]:
+        """Translate and run a Snowflake statement, returning its rows."""
+        temporary_match = re.search(r'\bTEMPORARY\s+TABLE\s+(\S+)', query, re.IGNORECASE)
+        if temporary_match:
+            self.temporary_tables.add(temporary_match.group(1).upper())
+        translated = translate_sql(query)
+        if translated is None:
+            return []
+        cursor = self.connection.execute(translated)
+        if cursor.description is None:
+            return []
+        columns = [column[0] for column in cursor.description]
+        return [LocalRow(values, columns) for values in cursor.fetchall()]
+    
+    def table(self, name: str) -> LocalTable:
+        return LocalTable(self, name)
+    
+    def create_dataframe(self, data) -> LocalDataFrame:
+        import pandas as pd
+        return LocalDataFrame(self, pd.DataFrame(data))
+    
+    def write_pandas(self, df, table_name: str, database: str = None, schema: str = None,
+                     auto_create_table: bool = False, overwrite: bool = False, table_type: str = '',
+                     **kwargs) -> LocalTable:
+        """Load a pandas DataFrame into a table (keyword arguments match Session.write_pandas)."""
+        full_name = '.'.join(part for part in [database, schema, table_name] if part)
+        self.connection.register('_write_pandas_df', df)
+        try:
+            if auto_create_table or overwrite:
+                temporary = 'TEMP ' if table_type in ('temp', 'temporary') else ''
+                self.connection.execute(f"CREATE OR REPLACE {temporary}TABLE {full_name} AS SELECT * FROM _write_pandas_df")
+            else:
+                self.connection.execute(f"INSERT INTO {full_name} SELECT * FROM _write_pandas_df")
+        finally:
+            self.connection.unregister('_write_pandas_df')
+        return self.table(full_name)
+    
+    def get_current_database(self) -> str:
+        return config.DATABASE_NAME
+    
+    def use_database(self, database: str):
+        pass
+    
+    def use_schema(self, schema: str):
+        pass
+    
+    def close(self):
+        for table_name in self.temporary_tables:
+            self.connection.execute(f"DROP TABLE IF EXISTS {table_name}")
+        self.connection.close()
+
+def translate_sql(query: str) -> Optional[str]:
+    """
+    Translate a Snowflake statement to DuckDB.
+    
+    Returns:
+        str: DuckDB statement, or None for statements with no local equivalent (databases)
+    """
+    # Comments mention Snowflake functions, so drop them before rewriting
+    sql = re.sub(r'--[^\n]*', '', query).strip()
+    
+    # Database and schema DDL: the DuckDB file is the database
+    if re.match(r'CREATE\s+(OR\s+REPLACE\s+)?DATABASE\b', sql, re.IGNORECASE):
+        return None
+    schema_match = re.match(r'CREATE\s+OR\s+REPLACE\s+SCHEMA\s+(\S+)', sql, re.IGNORECASE)
+    if schema_match:
+        return f"DROP SCHEMA IF EXISTS {schema_match.group(1)} CASCADE; CREATE SCHEMA {schema_match.group(1)}"
+    
+    # Dynamic tables are materialised once; temporary tables cannot be schema-qualified in DuckDB
+    sql = re.sub(r'DYNAMIC\s+TABLE\s+(\S+)\s+.*?\bAS\b', r'TABLE \1 AS', sql, count=1, flags=re.IGNORECASE | re.DOTALL)
+    sql = re.sub(r'\bTEMPORARY\s+TABLE\b', 'TABLE', sql, flags=re.IGNORECASE)
+    
+    # Row generator: seq4() is the generator's row index
+    sql = re.sub(r'TABLE\s*\(\s*GENERATOR\s*\(\s*ROWCOUNT\s*=>\s*([^)]+)\)\s*\)', r'range(\1)', sql, flags=re.IGNORECASE)
+    sql = re.sub(r'\bSEQ4\s*\(\s*\)', 'range', sql, flags=re.IGNORECASE)
+    
+    sql = translate_functions(sql)
+    sql = re.sub(r'\bCURRENT_DATE\s*\(\s*\)', 'current_date', sql, flags=re.IGNORECASE)
+    sql = re.sub(r"([\w.]+)\s+RLIKE\s+('[^']*')", r'regexp_full_match(\1, \2)', sql, flags=re.IGNORECASE)
+    return sql
+
+def translate_functions(sql: str) -> str:
+    """Rewrite Snowflake functions whose DuckDB equivalents take different arguments."""
+    sql = replace_function_calls(sql, 'UNIFORM', render_uniform)
+    sql = replace_function_calls(sql, 'DATEADD', render_dateadd)
+    return sql
+
+def render_uniform(args: List[str]) -> str:
+    """UNIFORM(min, max, gen): integer bounds draw integers (inclusive), otherwise floats."""
+    low, high, gen = args
+    # A RANDOM() generator draws freshly; any other generator (seeded hashes) maps deterministically to [0, 1)
+    if re.fullmatch(r'RANDOM\(\s*\)', gen, re.IGNORECASE):
+        draw = "random()"
+    else:
+        draw = f"(hash({gen}) / 18446744073709551616.0)"
+    if re.fullmatch(r'-?\d+', low) and re.fullmatch(r'-?\d+', high):
+        return f"CAST(FLOOR({low} + {draw} * ({high} - ({low}) + 1)) AS BIGINT)"
+    return f"({low} + {draw} * (({high}) - ({low})))"
+
+def render_dateadd(args: List[str]) -> str:
+    """DATEADD(part, n, date) on dates returns a date."""
+    part, amount, value = args
+    return f"CAST(({value}) + INTERVAL ({amount}) {part} AS DATE)"
+
+def replace_function_calls(sql: str, name: str, render) -> str:
+    """Replace every NAME(...) call, rendering it from its (recursively translated) arguments."""
+    pattern = re.compile(rf'\b{name}\s*\(', re.IGNORECASE)
+    parts = []
+    position = 0
+    while True:
+        match = pattern.search(sql, position)
+        if not match:
+            parts.append(sql[position:])
+            return ''.join(parts)
+        
+        args, end = split_call_arguments(sql, match.end())
+        parts.append(sql[position:match.start()])
+        parts.append(render([translate_functions(arg) for arg in args]))
+        position = end
+
+def split_call_arguments(sql: str, start: int):
+    """Split the arguments of a call whose opening parenthesis ends at start; returns (args, end)."""
+    args = []
+    depth = 1
+    in_string = False
+    arg_start = start
+    i = start
+    while depth:
+        char = sql[i]
+        if char == "'":
+            in_string = not in_string
+        elif not in_string:
+            if char == '(':
+                depth += 1
+            elif char == ')':
+                depth -= 1
+            elif char == ',' and depth == 1:
+                args.append(sql[arg_start:i].strip())
+                arg_start = i + 1
+        i += 1
+    args.append(sql[arg_start:i - 1].strip())
+    return args, i
+
+def export_parquet(session: LocalSession, output_path: str = None) -> List[str]:
+    """Write every table in the local database (except Snowflake temporary tables) to SCHEMA.TABLE.parquet; returns the file paths."""
+    output_path = output_path or config.LOCAL_PARQUET_PATH
+    os.makedirs(output_path, exist_ok=True)
+    
+    tables = session.connection.execute(f"""
+        SELECT schema_name, table_name FROM duckdb_tables()
+        WHERE database_name = '{config.DATABASE_NAME}' AND NOT temporary
+        ORDER BY schema_name, table_name
+    """).fetchall()
+    
+    paths = []
+    for schema_name, table_name in tables:
+        if f"{config.DATABASE_NAME}.{schema_name}.{table_name}".upper() in session.temporary_tables:
+            continue
+        path = os.path.join(output_path, f"{schema_name}.{table_name}.parquet")
+        session.connection.execute(f"""
+            COPY {config.DATABASE_NAME}.{schema_name}.{table_name} TO '{path}'
+            (FORMAT PARQUET, COMPRESSION {config.REAL_ASSETS_PARQUET_COMPRESSION.upper()})
+        """)
+        paths.append(path)
+    return paths
+
+def build_local(scenarios: List[str], scale_settings: Dict) -> bool:
+    """
+    Build the structured data locally and write it to Parquet.
+    
+    Args:
+        scenarios: Scenarios to build
+        scale_settings: Build volumes from build_scale.get_scale_settings
+    
+    Returns:
+        bool: True if the build succeeded
+    """
+    import generate_structured
+    
+    print(f"💻 Building structured data locally in {config.LOCAL_DATABASE_PATH}...")
+    session = LocalSession()
+    build_stats = []
+    build_start = time.perf_counter()
+    try:
+        generate_structured.build_all(session, scenarios, scale_settings, False, build_stats)
+        with time_builder(session, build_stats, 'Parquet export'):
+            paths = export_parquet(session)
+        print(f"✅ Wrote {len(paths)} Parquet tables to {config.LOCAL_PARQUET_PATH}")
+    except Exception as e:
+        print(f"❌ Local build failed: {e}")
+        return False
+    finally:
+        session.close()
+    
+    print()
+    print_throughput_report(build_stats, time.perf_counter() - build_start)
+    return True
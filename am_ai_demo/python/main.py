@@ -12,11 +12,13 @@ Examples:
     python main.py                                    # Build everything with defaults
     python main.py --scenarios portfolio_copilot     # Build foundation + portfolio scenario
     python main.py --scope data                      # Build only data layer
+    python main.py --scale 4                         # Build 4x the default volumes
     python main.py --connection-name my_demo         # Use specific connection
 """
 
 import argparse
 import sys
+import time
 from typing import List, Optional
 
 # Import configuration
@@ -24,8 +26,12 @@ from config import (
     DEFAULT_CONNECTION_NAME, 
     AVAILABLE_SCENARIOS,
     SCENARIO_DATA_REQUIREMENTS,
-    DATABASE_NAME
+    DATABASE_NAME,
+    TEST_MODE_MULTIPLIER
 )
+import build_scale
+import build_seed
+import build_profile
 
 def parse_arguments() -> argparse.Namespace:
     """Parse command line arguments."""
@@ -58,13 +64,64 @@ def parse_arguments() -> argparse.Namespace:
     parser.add_argument(
         '--extract-real-assets',
         action='store_true',
-        help='Extract real asset data from Snowflake Marketplace and save to CSV (requires marketplace access)'
+        help='Extract real asset data from Snowflake Marketplace to a partitioned Parquet dataset (requires marketplace access)'
+    )
+    
+    parser.add_argument(
+        '--local',
+        action='store_true',
+        help='Build the structured data offline on a local DuckDB database and write Parquet (no Snowflake connection needed)'
     )
     
     parser.add_argument(
         '--test-mode',
         action='store_true',
-        help='Use test mode with 10 percent of data for faster development testing (500 securities vs 5,000)'
+        help=f'Use test mode with 10 percent of data for faster development testing (same as --scale {TEST_MODE_MULTIPLIER})'
+    )
+    
+    parser.add_argument(
+        '--scale',
+        type=float,
+        default=None,
+        help='Scale factor applied to securities, portfolios, years of history and document counts (default: 1.0, e.g. 0.25 or 4)'
+    )
+    
+    parser.add_argument(
+        '--benchmark',
+        action='store_true',
+        help='Benchmark SAM_ANALYST_VIEW after the build and flag regressions against the stored baseline for this data scale'
+    )
+    
+    parser.add_argument(
+        '--update-benchmark-baseline',
+        action='store_true',
+        help='Store this benchmark run as the new baseline (implies --benchmark)'
+    )
+    
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Print a hot-spot report (elapsed time, bytes scanned, spill, estimated credits) per build step from query history'
+    )
+    
+    parser.add_argument(
+        '--snapshot',
+        type=str,
+        metavar='NAME',
+        help='Snapshot the built database as a zero-copy clone with a manifest of row counts and config, then exit'
+    )
+    
+    parser.add_argument(
+        '--restore',
+        type=str,
+        metavar='NAME',
+        help='Restore the database from a snapshot and recreate semantic views and search services, then exit'
+    )
+    
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Update the existing database in place: document tables are merged and existing Cortex Search services are kept so they refresh within TARGET_LAG'
     )
     
     return parser.parse_args()
@@ -166,10 +223,27 @@ def main():
     print(f"📋 Building scenarios: {validated_scenarios}")
     print(f"🎯 Scope: {args.scope}")
     print(f"🔗 Connection: {args.connection_name}")
-    if args.test_mode:
+    if args.scale is not None:
+        scale = args.scale
+    elif args.test_mode:
+        scale = TEST_MODE_MULTIPLIER
         print(f"🧪 Test Mode: Using 10% data volumes for faster development testing")
+    else:
+        scale = 1.0
+    scale_settings = build_scale.get_scale_settings(scale)
+    build_scale.print_scale_settings(scale_settings)
+    print(f"📅 Data as-of date: {build_seed.resolve_as_of_date()}")
+    if args.incremental:
+        print("🔄 Incremental Mode: Keeping existing corpora and search services")
     print()
     
+    # Handle local offline build if requested (structured data only)
+    if args.local:
+        import local_backend
+        if not local_backend.build_local(validated_scenarios, scale_settings):
+            sys.exit(1)
+        return
+    
     # Create Snowpark session
     session = create_snowpark_session(args.connection_name)
     
@@ -177,41 +251,77 @@ def main():
     if args.extract_real_assets:
         print("🌍 Extracting real asset data from Snowflake Marketplace...")
         import extract_real_assets
-        success = extract_real_assets.extract_real_assets_to_csv(session)
+        success = extract_real_assets.extract_real_assets_to_parquet(session)
         if success:
             print("✅ Real asset data extracted successfully")
             print("💡 To use real assets in future builds, set USE_REAL_ASSETS_CSV = True in config.py")
         else:
-            print("❌ Real asset extraction failed - continuing with generated data")
+            print("❌ Real asset extraction failed - any previous extract was left in place")
         print()
         return  # Exit after extraction
     
+    # Handle snapshot / restore if requested (no data is generated)
+    if args.snapshot:
+        import snapshot
+        snapshot.create_snapshot(session, args.snapshot)
+        return
+    
+    if args.restore:
+        import snapshot
+        import build_ai
+        build_config = snapshot.restore_snapshot(session, args.restore)
+        # Clones carry the data but not the Cortex Search services; rebuild AI components for the snapshot's scenarios
+        print("🤖 Recreating AI components against the restored database...")
+        build_ai.build_all(session, build_config['scenarios'], True, True)
+        print(f"🎉 Restored {DATABASE_NAME} from snapshot {args.restore.upper()} (scale {build_config['scale']:g})")
+        return
+    
     # Determine what to build based on scope
     build_data = args.scope in ['all', 'data']
     build_semantic = args.scope in ['all', 'semantic'] 
     build_search = args.scope in ['all', 'search']
     
+    build_stats = []
+    build_start = time.perf_counter()
+    run_id = build_profile.start_build_run(validated_scenarios, scale)
+    
     try:
         # Step 1: Build structured data (foundation + scenario-specific)
         if build_data:
             print("📊 Building structured data...")
             # Import and run structured data generation
             import generate_structured
-            generate_structured.build_all(session, validated_scenarios, args.test_mode)
+            generate_structured.build_all(session, validated_scenarios, scale_settings, args.incremental, build_stats)
             
             print("📝 Building unstructured data...")
             # Import and run unstructured data generation
             import generate_unstructured
             required_doc_types = get_required_document_types(validated_scenarios)
-            generate_unstructured.build_all(session, required_doc_types, args.test_mode)
+            generate_unstructured.build_all(session, required_doc_types, scale_settings, args.incremental, build_stats)
+            
+            # Snapshots take their build config from here rather than from their own flags
+            import snapshot
+            snapshot.write_build_manifest(session, validated_scenarios, scale_settings)
         
         # Step 2: Build AI components
         if build_semantic or build_search:
             print("🤖 Building AI components...")
             import build_ai
-            build_ai.build_all(session, validated_scenarios, build_semantic, build_search)
+            with build_scale.time_builder(session, build_stats, 'AI components'):
+                build_ai.build_all(session, validated_scenarios, build_semantic, build_search, args.incremental)
         
+        # Step 3: Benchmark the semantic view against the baseline for this data scale
+        if args.benchmark or args.update_benchmark_baseline:
+            print("⏱️  Benchmarking semantic view...")
+            import benchmark_ai
+            benchmark_ai.run_semantic_benchmark(session, f"{scale:g}", args.update_benchmark_baseline)
+        
+        print()
+        build_scale.print_throughput_report(build_stats, time.perf_counter() - build_start)
         print()
+        if args.profile:
+            build_profile.print_profile_report(session, run_id)
+            print()
         print("🎉 SAM Demo Environment Build Complete!")
         print(f"📍 Database: {DATABASE_NAME}")
         print(f"🎭 Scenarios: {validated_scenarios}")
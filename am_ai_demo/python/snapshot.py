@@ -0,0 +1,182 @@
+"""
+Snapshot and Restore for SAM Demo
+
+This module provisions demo environments without regenerating data:
+- Records the effective config of each data build in SAM_DEMO (BUILD_MANIFEST_TABLE)
+- Snapshots SAM_DEMO as a zero-copy clone with a manifest of row counts and config
+  (dynamic tables in the snapshot are suspended, so it stays a point-in-time copy)
+- Restores SAM_DEMO from a snapshot clone and checks row counts against the manifest
+"""
+
+from snowflake.snowpark import Session
+from typing import List, Dict
+import json
+import re
+import config
+from build_cache import create_cache_table
+
+def get_snapshot_database(name: str) -> str:
+    """Snapshot database name for a snapshot NAME (letters, digits and underscores only)."""
+    if not re.fullmatch(r'[A-Za-z0-9_]+', name):
+        raise Exception(f"Invalid snapshot name '{name}' - use letters, digits and underscores only")
+    return f"{config.SNAPSHOT_DATABASE_PREFIX}{name.upper()}"
+
+def write_build_manifest(session: Session, scenarios: List[str], scale_settings: Dict):
+    """
+    Record the effective config of a data build inside SAM_DEMO.
+    
+    Snapshots copy it from there, so a snapshot describes how its data was
+    built rather than the flags passed to the --snapshot command.
+    
+    Args:
+        session: Active Snowpark session
+        scenarios: Scenarios the data was built for
+        scale_settings: Build volumes from build_scale.get_scale_settings
+    """
+    build_config = {
+        'scenarios': scenarios,
+        'scale': scale_settings['scale'],
+        'model_name': config.MODEL_NAME,
+        'rng_seed': config.RNG_SEED,
+        'data_as_of_date': config.DATA_AS_OF_DATE,
+        'years_of_history': scale_settings['years_of_history'],
+        'securities_count': scale_settings['securities_count'],
+        'portfolios': len(scale_settings['portfolios']),
+        'unstructured_counts': scale_settings['unstructured_counts'],
+        'unstructured_coverage': config.UNSTRUCTURED_COVERAGE
+    }
+    # Dollar-quoted so JSON escapes are not interpreted as string escapes
+    session.sql(f"""
+        CREATE OR REPLACE TABLE {config.BUILD_MANIFEST_TABLE} AS
+        SELECT 
+            PARSE_JSON($${json.dumps(build_config)}$$) as BUILD_CONFIG,
+            CURRENT_TIMESTAMP() as BUILT_TIMESTAMP
+    """).collect()
+
+def get_build_config(session: Session, database: str) -> Dict:
+    """Effective build config recorded in a database by write_build_manifest."""
+    try:
+        rows = session.sql(f"SELECT BUILD_CONFIG FROM {database}.PUBLIC.BUILD_MANIFEST").collect()
+    except Exception:
+        rows = []
+    if not rows:
+        raise Exception(f"No build manifest in {database} - rebuild the data (--scope data or all) before taking a snapshot")
+    return json.loads(rows[0]['BUILD_CONFIG'])
+
+def create_snapshot(session: Session, name: str) -> Dict:
+    """
+    Snapshot SAM_DEMO as a zero-copy clone and record its manifest.
+    
+    Args:
+        session: Active Snowpark session
+        name: Snapshot name
+    
+    Returns:
+        dict: Row counts per table in the snapshot
+    """
+    snapshot_database = get_snapshot_database(name)
+    print(f"📸 Cloning {config.DATABASE_NAME} to {snapshot_database}...")
+    
+    # Read before cloning so an unbuilt environment fails without leaving a half-made snapshot
+    manifest_config = get_build_config(session, config.DATABASE_NAME)
+    create_manifest_table(session)
+    session.sql(f"CREATE OR REPLACE DATABASE {snapshot_database} CLONE {config.DATABASE_NAME}").collect()
+    
+    # Cloned dynamic tables keep their fully-qualified SAM_DEMO sources and would keep refreshing from them
+    suspended = set_dynamic_tables_state(session, snapshot_database, 'SUSPEND')
+    if suspended:
+        print(f"⏸️  Suspended {suspended} dynamic tables in {snapshot_database}")
+    
+    row_counts = get_row_counts(session, snapshot_database)
+    
+    session.sql(f"""
+        DELETE FROM {config.SNAPSHOT_MANIFEST_TABLE} WHERE SNAPSHOT_NAME = '{name.upper()}'
+    """).collect()
+    # Dollar-quoted so JSON escapes are not interpreted as string escapes
+    session.sql(f"""
+        INSERT INTO {config.SNAPSHOT_MANIFEST_TABLE}
+            (SNAPSHOT_NAME, SNAPSHOT_DATABASE, SOURCE_DATABASE, BUILD_CONFIG, ROW_COUNTS)
+        SELECT
+            '{name.upper()}',
+            '{snapshot_database}',
+            '{config.DATABASE_NAME}',
+            PARSE_JSON($${json.dumps(manifest_config)}$$),
+            PARSE_JSON($${json.dumps(row_counts)}$$)
+    """).collect()
+    
+    print(f"✅ Snapshot {name.upper()} created: {len(row_counts)} tables, {sum(row_counts.values()):,} rows")
+    return row_counts
+
+def restore_snapshot(session: Session, name: str) -> Dict:
+    """
+    Restore SAM_DEMO as a zero-copy clone of a snapshot.
+    
+    Semantic views and Cortex Search services are not taken from the clone;
+    the caller recreates them against the restored database.
+    
+    Returns:
+        dict: The snapshot's build config from the manifest
+    """
+    snapshot_database = get_snapshot_database(name)
+    
+    create_manifest_table(session)
+    manifest = session.sql(f"""
+        SELECT BUILD_CONFIG, ROW_COUNTS, CREATED_TIMESTAMP
+        FROM {config.SNAPSHOT_MANIFEST_TABLE}
+        WHERE SNAPSHOT_NAME = '{name.upper()}'
+    """).collect()
+    if not manifest:
+        raise Exception(f"Snapshot {name.upper()} not found in {config.SNAPSHOT_MANIFEST_TABLE}")
+    
+    build_config = json.loads(manifest[0]['BUILD_CONFIG'])
+    expected_counts = json.loads(manifest[0]['ROW_COUNTS'])
+    print(f"♻️  Restoring {config.DATABASE_NAME} from snapshot {name.upper()} (taken {manifest[0]['CREATED_TIMESTAMP']})...")
+    
+    session.sql(f"CREATE OR REPLACE DATABASE {config.DATABASE_NAME} CLONE {snapshot_database}").collect()
+    session.use_database(config.DATABASE_NAME)
+    
+    # Dynamic tables were suspended in the snapshot; resume them so the restored rollups refresh again
+    set_dynamic_tables_state(session, config.DATABASE_NAME, 'RESUME')
+    
+    # Row counts should match the manifest exactly for a zero-copy clone
+    restored_counts = get_row_counts(session, config.DATABASE_NAME)
+    mismatches = [
+        table for table, count in expected_counts.items()
+        if restored_counts.get(table) != count
+    ]
+    if mismatches:
+        print(f"⚠️  Row counts differ from the manifest for: {', '.join(mismatches)}")
+    else:
+        print(f"✅ Restored {len(restored_counts)} tables, {sum(restored_counts.values()):,} rows (matches manifest)")
+    
+    return build_config
+
+def set_dynamic_tables_state(session: Session, database: str, action: str) -> int:
+    """Run ALTER DYNAMIC TABLE ... SUSPEND or RESUME on every dynamic table in a database; returns the count."""
+    dynamic_tables = session.sql(f"SHOW DYNAMIC TABLES IN DATABASE {database}").collect()
+    for row in dynamic_tables:
+        session.sql(f'ALTER DYNAMIC TABLE {database}.{row["schema_name"]}.{row["name"]} {action}').collect()
+    return len(dynamic_tables)
+
+def get_row_counts(session: Session, database: str) -> Dict[str, int]:
+    """Row counts per table (SCHEMA.TABLE) in a database."""
+    rows = session.sql(f"""
+        SELECT TABLE_SCHEMA || '.' || TABLE_NAME as TABLE_KEY, ROW_COUNT
+        FROM {database}.INFORMATION_SCHEMA.TABLES
+        WHERE TABLE_SCHEMA <> 'INFORMATION_SCHEMA' AND ROW_COUNT IS NOT NULL
+        ORDER BY TABLE_KEY
+    """).collect()
+    return {row['TABLE_KEY']: int(row['ROW_COUNT']) for row in rows}
+
+def create_manifest_table(session: Session):
+    """Create the snapshot manifest table (in the cache database so manifests survive restores)."""
+    create_cache_table(session, f"""
+        CREATE TABLE IF NOT EXISTS {config.SNAPSHOT_MANIFEST_TABLE} (
+            SNAPSHOT_NAME VARCHAR NOT NULL,
+            SNAPSHOT_DATABASE VARCHAR NOT NULL,
+            SOURCE_DATABASE VARCHAR NOT NULL,
+            BUILD_CONFIG VARIANT,
+            ROW_COUNTS VARIANT,
+            CREATED_TIMESTAMP TIMESTAMP DEFAULT CURRENT_TIMESTAMP()
+        )
+    """)